@@ -0,0 +1,109 @@
+"""
+Short-term memory contention benchmark.
+
+Runs ``save_context`` followed by ``load_memory_variables`` from several threads
+at once and reports the combined throughput for each thread count, both with
+every thread sharing one ``NeurotraceMemory`` session and with one session per
+thread. ``--llm-latency`` adds a fixed delay per turn, standing in for the model
+call a server makes between loading and saving memory; that wait releases the
+GIL, so it is where extra threads pay off.
+
+After each shared-session run the memory is checked for consistency: every
+user message must be directly followed by its reply and the running token
+total must match the messages held.
+
+Usage:
+    python -m benchmarks.bench_contention
+    python -m benchmarks.bench_contention --threads 1 2 4 8 16 --turns 2000 --llm-latency 0.002
+"""
+
+import os
+
+# Keep log I/O out of the measurements; set these explicitly to benchmark logging too.
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("LOG_TO_STREAM", "false")
+os.environ.setdefault("LOG_TO_FILE", "false")
+
+import argparse  # noqa: E402
+import sys  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+from typing import List, Tuple  # noqa: E402
+
+from benchmarks.fakes import FakeChatModel  # noqa: E402
+from neurotrace.core.memory import NeurotraceMemory  # noqa: E402
+
+
+def _turns(memory: NeurotraceMemory, worker: int, turns: int, latency: float) -> None:
+    for turn in range(turns):
+        memory.load_memory_variables({"input": f"worker {worker} turn {turn}"})
+        if latency:
+            time.sleep(latency)
+        memory.save_context(
+            {"input": f"worker {worker} asks question {turn}"}, {"output": f"answer {turn} for worker {worker}"}
+        )
+
+
+def _consistent(memory: NeurotraceMemory) -> bool:
+    messages = memory._stm.get_messages()
+    tokens = sum(message.estimated_token_length() for message in messages)
+    # The oldest message may be a reply whose question was evicted.
+    start = 1 if messages and messages[0].role != "human" else 0
+    pairs = zip(messages[start::2], messages[start + 1 :: 2])
+    adjacent = all(q.content.split()[1] == a.content.split()[-1] for q, a in pairs)
+    return adjacent and tokens == memory._stm.total_tokens()
+
+
+def run(threads: int, turns: int, shared: bool, latency: float) -> Tuple[float, bool]:
+    """
+    Run ``turns`` turns on each of ``threads`` threads.
+
+    Returns:
+        Tuple[float, bool]: Turns per second across all threads, and whether the
+            shared memory was consistent afterwards (always True for per-thread sessions).
+    """
+    llm = FakeChatModel()
+    memories = (
+        [NeurotraceMemory(llm, max_tokens=1024)] * threads
+        if shared
+        else [NeurotraceMemory(llm, session_id=f"session-{i}", max_tokens=1024) for i in range(threads)]
+    )
+    workers = [
+        threading.Thread(target=_turns, args=(memories[i], i, turns, latency), name=f"worker-{i}")
+        for i in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return threads * turns / elapsed, not shared or _consistent(memories[0])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="Thread counts to run.")
+    parser.add_argument("--turns", type=int, default=500, help="Turns per thread.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds slept per turn. Defaults to 0.")
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    print(f"{'mode':<10} {'threads':>7} {'turns/s':>10} {'speedup':>8}  consistent")
+    for shared in (True, False):
+        mode = "shared" if shared else "per-thread"
+        single = None
+        for threads in args.threads:
+            throughput, consistent = run(threads, args.turns, shared, args.llm_latency)
+            single = single or throughput
+            print(f"{mode:<10} {threads:>7} {throughput:>10.1f} {throughput / single:>7.2f}x  {consistent}")
+            if not consistent:
+                failures.append(f"{mode} x{threads}")
+
+    if failures:
+        print(f"Inconsistent memory after: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
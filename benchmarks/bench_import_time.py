@@ -0,0 +1,67 @@
+"""
+Import-time benchmark.
+
+Measures, in fresh interpreters, how long it takes to import neurotrace modules
+and to build a MemoryOrchestrator, next to the cost of importing langchain_core
+alone (the floor every neurotrace import pays).
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+TARGETS = {
+    "langchain_core (floor)": (
+        "from langchain_core.chat_history import BaseChatMessageHistory\n"
+        "from langchain_core.memory import BaseMemory\n"
+        "from langchain_core.prompts import PromptTemplate\n"
+        "from langchain_core.tools import Tool\n"
+        "from langchain_core.vectorstores import VectorStore"
+    ),
+    "neurotrace.core.memory": "import neurotrace.core.memory",
+    "neurotrace.core.hippocampus.memory_orchestrator": "import neurotrace.core.hippocampus.memory_orchestrator",
+    "neurotrace.core.tools.memory": "import neurotrace.core.tools.memory",
+    "neurotrace.core.tools.system": "import neurotrace.core.tools.system",
+}
+
+BUILD_ORCHESTRATOR = """
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.vectorstores import InMemoryVectorStore
+from neurotrace.core.hippocampus.memory_orchestrator import MemoryOrchestrator
+t = time.perf_counter()
+MemoryOrchestrator(FakeListChatModel(responses=["ok"]), object(), InMemoryVectorStore(DeterministicFakeEmbedding(size=8)))
+"""
+
+
+def _time_in_subprocess(statement: str, setup_timer: bool = True) -> float:
+    code = (
+        "import time\n"
+        + ("t = time.perf_counter()\n" if setup_timer else "")
+        + statement
+        + "\nprint((time.perf_counter() - t) * 1000)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target")
+    args = parser.parse_args()
+
+    print(f"{'target':<52} {'median ms':>10} {'min ms':>10}")
+    for name, statement in TARGETS.items():
+        samples = [_time_in_subprocess(statement) for _ in range(args.runs)]
+        print(f"{name:<52} {statistics.median(samples):>10.1f} {min(samples):>10.1f}")
+
+    samples = [_time_in_subprocess(BUILD_ORCHESTRATOR, setup_timer=False) for _ in range(args.runs)]
+    print(f"{'MemoryOrchestrator(...) construction':<52} {statistics.median(samples):>10.1f} {min(samples):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Memory stack benchmark.
+
+Times the main memory operations against the deterministic fakes in
+``benchmarks/fakes.py`` and reports latency percentiles and throughput. With
+no network or model in the loop, the numbers are neurotrace's own overhead;
+``--llm-latency`` adds a fixed delay per LLM call to model a remote provider.
+
+Results can be saved as a baseline and later runs compared against it; the
+comparison exits with status 1 if any scenario's median latency regressed by
+more than ``--threshold``. Baselines are machine specific, so record one on the
+machine you compare on.
+
+Usage:
+    python -m benchmarks.bench_memory                      # run and print
+    python -m benchmarks.bench_memory --save-baseline      # record benchmarks/baseline.json
+    python -m benchmarks.bench_memory --compare            # fail on regressions
+    python -m benchmarks.bench_memory --filter search --quick
+"""
+
+import os
+
+# Keep log I/O out of the measurements; set these explicitly to benchmark logging too.
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("LOG_TO_STREAM", "false")
+os.environ.setdefault("LOG_TO_FILE", "false")
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import statistics  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from dataclasses import asdict, dataclass  # noqa: E402
+from datetime import datetime, timezone  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Callable, Dict, List, Optional, Tuple  # noqa: E402
+
+from langchain_core.chat_history import InMemoryChatMessageHistory  # noqa: E402
+
+from benchmarks.fakes import (  # noqa: E402
+    FakeChatModel,
+    fake_vector_store,
+)
+from neurotrace.core.context_builder import ContextBuilder  # noqa: E402
+from neurotrace.core.hippocampus.memory_orchestrator import (  # noqa: E402
+    MemoryOrchestrator,
+)
+from neurotrace.core.hippocampus.stm import ShortTermMemory  # noqa: E402
+from neurotrace.core.ingestion import IngestionPipeline  # noqa: E402
+from neurotrace.core.memory import NeurotraceMemory  # noqa: E402
+from neurotrace.core.query_rewrite import QueryRewriter  # noqa: E402
+from neurotrace.core.ranking import MemoryRanker  # noqa: E402
+from neurotrace.core.schema import Message  # noqa: E402
+from neurotrace.core.stores.in_memory_graph import InMemoryGraphStore  # noqa: E402
+from neurotrace.core.tools.memory import (  # noqa: E402
+    memory_search_tool,
+    save_memory_tool,
+)
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+TOPICS = ["tea", "hiking", "python", "jazz", "berlin", "chess", "cycling", "sushi", "astronomy", "gardening"]
+
+
+def _sentence(i: int) -> str:
+    topic = TOPICS[i % len(TOPICS)]
+    return f"user {i % 97} likes {topic} and mentioned it during conversation number {i}"
+
+
+def _messages(n: int, offset: int = 0) -> List[Message]:
+    return [Message(role="human" if i % 2 == 0 else "ai", content=_sentence(offset + i)) for i in range(n)]
+
+
+def _orchestrator(llm: FakeChatModel, memories: int, graph_search_mode: str = "auto") -> MemoryOrchestrator:
+    orchestrator = MemoryOrchestrator(
+        llm, InMemoryGraphStore(), fake_vector_store(), graph_search_mode=graph_search_mode
+    )
+    if memories:
+        orchestrator.vector_memory_adapter.add_messages(_messages(memories))
+        orchestrator.graph_memory_adapter.add_triplets(
+            [[f"user {i % 97}", "likes", TOPICS[i % len(TOPICS)]] for i in range(memories)]
+        )
+    # The QA chain prints every generated query when verbose.
+    orchestrator.graph_memory_adapter.qa_chain.verbose = False
+    return orchestrator
+
+
+@dataclass
+class Scenario:
+    """One benchmarked operation.
+
+    Args:
+        name (str): Name used in reports and baselines.
+        setup (Callable): Called with the fake LLM; returns the operation to time,
+            which is called with the iteration number.
+        iterations (int): Timed calls. ``--quick`` runs a tenth of them.
+        items (int): Items handled per call, for the items/s column.
+    """
+
+    name: str
+    setup: Callable[[FakeChatModel], Callable[[int], object]]
+    iterations: int
+    items: int = 1
+
+
+@dataclass
+class Result:
+    name: str
+    iterations: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    ops_per_sec: float
+    items_per_sec: float
+
+
+def _save_context(llm: FakeChatModel) -> Callable[[int], object]:
+    memory = NeurotraceMemory(llm, max_tokens=2048, history=InMemoryChatMessageHistory())
+    return lambda i: memory.save_context({"input": _sentence(i)}, {"output": _sentence(i + 1)})
+
+
+def _load_memory_variables(llm: FakeChatModel) -> Callable[[int], object]:
+    memory = NeurotraceMemory(llm, max_tokens=2048)
+    memory.add_messages(_messages(200))
+    return lambda i: memory.load_memory_variables({"input": _sentence(i)})
+
+
+def _load_memory_variables_with_context(llm: FakeChatModel) -> Callable[[int], object]:
+    builder = ContextBuilder(_orchestrator(llm, 1000), token_budget=1024)
+    memory = NeurotraceMemory(llm, max_tokens=2048, context_builder=builder)
+    memory.add_messages(_messages(200))
+    return lambda i: memory.load_memory_variables({"input": _sentence(i)})
+
+
+def _stm_eviction(llm: FakeChatModel) -> Callable[[int], object]:
+    # ~10 tokens per message, so the memory holds 5000 messages and every append evicts one.
+    stm = ShortTermMemory(max_tokens=50_000)
+    stm.set_messages(_messages(5_000))
+    incoming = _messages(10_000, offset=5_000)
+    return lambda i: stm.append(incoming[i % len(incoming)].model_copy())
+
+
+def _stm_snapshot(llm: FakeChatModel) -> Callable[[int], object]:
+    memory = NeurotraceMemory(llm, max_tokens=8192)
+    memory.add_messages(_messages(500))
+    return lambda i: memory.snapshot()
+
+
+def _stm_restore(llm: FakeChatModel) -> Callable[[int], object]:
+    source = NeurotraceMemory(llm, max_tokens=8192)
+    source.add_messages(_messages(500))
+    snapshot = source.snapshot()
+    memory = NeurotraceMemory(llm, max_tokens=8192)
+    return lambda i: memory.restore(snapshot)
+
+
+def _save_memory_tool(llm: FakeChatModel) -> Callable[[int], object]:
+    tool = save_memory_tool(_orchestrator(llm, 0))
+    return lambda i: tool.func(f"{_sentence(i)} -- tags: benchmark")
+
+
+def _memory_search_tool(llm: FakeChatModel) -> Callable[[int], object]:
+    tool = memory_search_tool(_orchestrator(llm, 1000))
+    return lambda i: tool.func(_sentence(i))
+
+
+def _memory_search_tool_summarised(llm: FakeChatModel) -> Callable[[int], object]:
+    tool = memory_search_tool(_orchestrator(llm, 1000), summary_token_budget=None)
+    return lambda i: tool.func(_sentence(i))
+
+
+def _vector_search(ranked: bool) -> Callable[[FakeChatModel], Callable[[int], object]]:
+    def setup(llm: FakeChatModel) -> Callable[[int], object]:
+        adapter = _orchestrator(llm, 1000).vector_memory_adapter
+        adapter.ranker = MemoryRanker() if ranked else None
+        return lambda i: adapter.search(_sentence(i), k=5)
+
+    return setup
+
+
+def _vector_search_rewritten(llm: FakeChatModel) -> Callable[[int], object]:
+    # Queries repeat every 50 iterations, so after warm-up the rewrites come from the cache.
+    adapter = _orchestrator(llm, 1000).vector_memory_adapter
+    adapter.query_rewriter = QueryRewriter(llm, variants=2)
+    return lambda i: adapter.search(_sentence(i % 50), k=5)
+
+
+def _search_graph_memory(graph_search_mode: str) -> Callable[[FakeChatModel], Callable[[int], object]]:
+    def setup(llm: FakeChatModel) -> Callable[[int], object]:
+        orchestrator = _orchestrator(llm, 1000, graph_search_mode=graph_search_mode)
+        return lambda i: orchestrator.search_graph_memory(_sentence(i))
+
+    return setup
+
+
+INGESTION_MESSAGES = 200
+
+
+def _ingestion(llm: FakeChatModel) -> Callable[[int], object]:
+    pipeline = IngestionPipeline(_orchestrator(llm, 0), chunk_size=10, window_size=8)
+    return lambda i: pipeline.run(_messages(INGESTION_MESSAGES, offset=i * INGESTION_MESSAGES))
+
+
+SCENARIOS = [
+    Scenario("save_context", _save_context, 2000, items=2),
+    Scenario("load_memory_variables", _load_memory_variables, 2000),
+    Scenario("load_memory_variables[context_builder]", _load_memory_variables_with_context, 200),
+    Scenario("stm_eviction[5k messages]", _stm_eviction, 2000),
+    Scenario("stm_snapshot[500 messages]", _stm_snapshot, 500, items=500),
+    Scenario("stm_restore[500 messages]", _stm_restore, 500, items=500),
+    Scenario("save_memory_tool", _save_memory_tool, 300),
+    Scenario("memory_search_tool", _memory_search_tool, 200),
+    Scenario("memory_search_tool[summarised]", _memory_search_tool_summarised, 200),
+    Scenario("vector_search", _vector_search(ranked=False), 1000),
+    Scenario("vector_search[ranked]", _vector_search(ranked=True), 1000),
+    Scenario("vector_search[rewritten]", _vector_search_rewritten, 1000),
+    Scenario("search_graph_memory[direct]", _search_graph_memory("direct"), 1000),
+    Scenario("search_graph_memory[chain]", _search_graph_memory("chain"), 200),
+    Scenario("ingestion[200 messages]", _ingestion, 20, items=INGESTION_MESSAGES),
+]
+
+
+def _percentile(sorted_samples: List[float], q: float) -> float:
+    index = min(len(sorted_samples) - 1, max(0, round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def run_scenario(scenario: Scenario, llm: FakeChatModel, quick: bool = False) -> Result:
+    """Time ``scenario`` after a short warm-up and summarise the samples."""
+    operation = scenario.setup(llm)
+    iterations = max(1, scenario.iterations // 10) if quick else scenario.iterations
+    for i in range(min(10, iterations)):
+        operation(-1 - i)
+
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    total = sum(samples)
+    return Result(
+        name=scenario.name,
+        iterations=iterations,
+        mean_ms=statistics.fmean(samples) * 1000,
+        p50_ms=_percentile(samples, 0.50) * 1000,
+        p95_ms=_percentile(samples, 0.95) * 1000,
+        p99_ms=_percentile(samples, 0.99) * 1000,
+        ops_per_sec=iterations / total,
+        items_per_sec=iterations * scenario.items / total,
+    )
+
+
+def compare(results: List[Result], baseline: Dict[str, dict], threshold: float) -> List[Tuple[str, float, float]]:
+    """
+    Find scenarios whose median latency grew by more than ``threshold``.
+
+    Args:
+        results (List[Result]): Current results.
+        baseline (Dict[str, dict]): Baseline results by scenario name.
+        threshold (float): Allowed relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        List[Tuple[str, float, float]]: ``(name, baseline p50, current p50)`` for each regression.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous and result.p50_ms > previous["p50_ms"] * (1 + threshold):
+            regressions.append((result.name, previous["p50_ms"], result.p50_ms))
+    return regressions
+
+
+def _print_results(results: List[Result], baseline: Optional[Dict[str, dict]] = None) -> None:
+    header = f"{'scenario':<42} {'iters':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>10} {'items/s':>10}"
+    if baseline is not None:
+        header += f" {'p50 vs base':>12}"
+    print(header)
+    for r in results:
+        line = (
+            f"{r.name:<42} {r.iterations:>6} {r.mean_ms:>9.3f} {r.p50_ms:>9.3f} {r.p95_ms:>9.3f} {r.p99_ms:>9.3f}"
+            f" {r.ops_per_sec:>10.1f} {r.items_per_sec:>10.1f}"
+        )
+        if baseline is not None:
+            previous = baseline.get(r.name)
+            line += f" {(r.p50_ms / previous['p50_ms'] - 1) * 100:>+11.1f}%" if previous else f" {'new':>12}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run scenarios whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="run a tenth of the iterations")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds each fake LLM call sleeps")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown when comparing")
+    args = parser.parse_args()
+
+    llm = FakeChatModel(latency=args.llm_latency)
+    scenarios = [s for s in SCENARIOS if args.filter in s.name]
+    results = [run_scenario(scenario, llm, quick=args.quick) for scenario in scenarios]
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text())["results"]
+    _print_results(results, baseline)
+
+    if args.save_baseline:
+        stored = json.loads(args.baseline.read_text())["results"] if args.baseline.exists() else {}
+        stored.update({r.name: asdict(r) for r in results})
+        meta = {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "llm_latency": args.llm_latency,
+        }
+        args.baseline.write_text(json.dumps({"meta": meta, "results": stored}, indent=2) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: p50 {before:.3f} ms -> {after:.3f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
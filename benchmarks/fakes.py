@@ -0,0 +1,88 @@
+"""
+Deterministic stand-ins for the services neurotrace talks to.
+
+The benchmarks measure neurotrace's own overhead, so the LLM, embeddings and
+stores here answer instantly (or after a fixed, configurable delay) and always
+return the same output for the same input.
+"""
+
+import json
+import re
+import time
+from typing import Any, List, Optional
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from neurotrace.core.stores.numpy_vector_store import NumpyVectorStore
+
+_WORD = re.compile(r"[a-z]+")
+_MESSAGE_SECTION = re.compile(r"MESSAGE:\n(.*?)\n\nReturn ONLY", re.S)
+_INPUT_SECTION = re.compile(r"Input:\n(.*?)\n\nOutput:", re.S)
+_QUERY_SECTION = re.compile(r"QUERY:\n(.*?)\n\nReturn ONLY", re.S)
+
+SUMMARY_RESPONSE = "The user has discussed their preferences and plans in earlier conversations."
+# Within the Cypher subset InMemoryGraphStore runs, so the QA chain reads the real store.
+CYPHER_RESPONSE = "MATCH (e:Entity) RETURN e.name AS name"
+
+
+def _triplets(text: str) -> List[List[str]]:
+    """Derive up to three stable triplets from the words of ``text``."""
+    words = _WORD.findall(text.lower())
+    return [words[i : i + 3] for i in range(0, min(len(words), 9) - 2, 3)]
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers each neurotrace prompt with a well-formed response.
+
+    Responses are derived from the prompt text: the combined summary prompt gets
+    a ``vector_summary``/``triplets`` JSON object, the triplet extractor a JSON
+    list, Cypher generation a fixed query, query rewriting two variants of the
+    query, and anything else a short summary.
+
+    Args:
+        latency (float, optional): Seconds to sleep per call, to model a remote
+            provider. Defaults to 0.
+    """
+
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "neurotrace-benchmark-fake"
+
+    def respond(self, prompt: str) -> str:
+        if "memory indexing assistant" in prompt:
+            match = _MESSAGE_SECTION.search(prompt)
+            text = match.group(1).strip() if match else prompt
+            return json.dumps({"vector_summary": text[:200], "triplets": _triplets(text)})
+        if "Extract all factual triplets" in prompt:
+            match = _INPUT_SECTION.search(prompt)
+            return json.dumps(_triplets(match.group(1) if match else prompt))
+        if "Generate Cypher statement" in prompt:
+            return CYPHER_RESPONSE
+        if "search query assistant" in prompt:
+            match = _QUERY_SECTION.search(prompt)
+            query = match.group(1).strip() if match else prompt
+            return json.dumps([f"{query} preferences", f"what the user said about {query}"])
+        return SUMMARY_RESPONSE
+
+    def _generate(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any
+    ) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = "\n".join(str(message.content) for message in messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.respond(prompt)))])
+
+
+def fake_embeddings(size: int = 64) -> DeterministicFakeEmbedding:
+    """Embeddings that hash each text to a fixed random vector."""
+    return DeterministicFakeEmbedding(size=size)
+
+
+def fake_vector_store(size: int = 64) -> NumpyVectorStore:
+    """An in-memory ``NumpyVectorStore`` over :func:`fake_embeddings`."""
+    return NumpyVectorStore(fake_embeddings(size))
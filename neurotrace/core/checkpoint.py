@@ -0,0 +1,57 @@
+"""
+Checkpoint Module.
+
+This module stores the progress of long-running jobs, such as ingestion and
+reindexing, so that an interrupted run can resume where it stopped instead of
+starting over. :class:`JsonCheckpoint` keeps the state in a small JSON file.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+
+class JsonCheckpoint:
+    """Small JSON state file for resumable background jobs.
+
+    Writes go to a temporary file that is atomically renamed over the previous
+    checkpoint, so an interrupted job always finds either the old or the new
+    state, never a partial one.
+
+    Args:
+        path (Union[str, Path], optional): Location of the checkpoint file. When None,
+            the checkpoint is disabled: ``load`` returns an empty state and ``save``
+            does nothing. Defaults to None.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else None
+
+    def load(self) -> Dict[str, Any]:
+        """Return the saved state, or an empty dict if there is none."""
+        if self.path is None or not self.path.exists():
+            return {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Atomically replace the saved state.
+
+        Args:
+            state (Dict[str, Any]): JSON-serialisable state.
+        """
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Delete the saved state."""
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
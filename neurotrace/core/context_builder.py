@@ -0,0 +1,193 @@
+"""
+Context Builder Module.
+
+This module assembles the memory context for a prompt under a single token
+budget. The budget is filled by priority: the most recent short-term messages
+first, then the best vector memories, then graph facts. Long-term retrieval runs
+in parallel and can be switched off per source, so relevant long-term context
+reaches the prompt without a separate memory-search tool call.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+from neurotrace.core.schema import Message
+from neurotrace.core.utils import estimate_tokens
+from neurotrace.neurotrace_logging.logger_factory import get_logger
+
+if TYPE_CHECKING:
+    # Only for annotations: importing the orchestrator pulls in the graph stack.
+    from neurotrace.core.hippocampus.memory_orchestrator import MemoryOrchestrator
+
+logger = get_logger("neurotrace.context_builder")
+
+
+@lru_cache(maxsize=4096)
+def _text_tokens(text: str) -> int:
+    return estimate_tokens(text)
+
+
+def _message_tokens(message: Message) -> int:
+    """Token count of a message: its own ``token_count`` if set, else a cached estimate.
+
+    Messages are shared with short-term memory, so the estimate is not written back to them.
+    """
+    if message.metadata.token_count is not None:
+        return message.metadata.token_count
+    return _text_tokens(message.content)
+
+
+@dataclass
+class MemoryContext:
+    """Memory selected for one prompt.
+
+    Attributes:
+        stm (List[Message]): Recent conversation messages, oldest first.
+        vector (List[Message]): Vector memories, most relevant first.
+        graph (List[str]): Graph facts.
+        tokens (int): Estimated tokens used by everything above.
+    """
+
+    stm: List[Message] = field(default_factory=list)
+    vector: List[Message] = field(default_factory=list)
+    graph: List[str] = field(default_factory=list)
+    tokens: int = 0
+
+    def format_long_term(self) -> str:
+        """Render the vector memories and graph facts as prompt text.
+
+        Returns:
+            str: The formatted long-term context, or an empty string if there is none.
+        """
+        sections = []
+        if self.vector:
+            sections.append("Relevant memories:\n" + "\n".join(f"- {msg.content}" for msg in self.vector))
+        if self.graph:
+            sections.append("Known facts:\n" + "\n".join(f"- {fact}" for fact in self.graph))
+        return "\n\n".join(sections)
+
+
+class ContextBuilder:
+    """Fills one token budget from short-term, vector and graph memory.
+
+    Args:
+        memory_orchestrator (MemoryOrchestrator, optional): Source of vector and graph
+            memory. When None, only short-term memory is used. Defaults to None.
+        token_budget (int, optional): Total estimated tokens for the context.
+            Defaults to 2048.
+        vector_k (int, optional): Vector memories to retrieve. Defaults to 5.
+        include_vector (bool, optional): Retrieve vector memories. Defaults to True.
+        include_graph (bool, optional): Retrieve graph facts. Defaults to True.
+        retrieval_timeout (float, optional): Seconds to wait for long-term
+            retrieval, for all sources together, before building the context
+            without what has not arrived. None waits indefinitely. Defaults to 2.
+        graph_retriever (Callable[[str], str], optional): Returns graph facts for a
+            query, one per line. Defaults to ``memory_orchestrator.search_graph_memory``
+            in ``"direct"`` mode, which reads the neighbourhood of the entities in the
+            query without calling the LLM.
+    """
+
+    def __init__(
+        self,
+        memory_orchestrator: Optional["MemoryOrchestrator"] = None,
+        token_budget: int = 2048,
+        vector_k: int = 5,
+        include_vector: bool = True,
+        include_graph: bool = True,
+        retrieval_timeout: Optional[float] = 2.0,
+        graph_retriever: Optional[Callable[[str], str]] = None,
+    ):
+        self.memory_orchestrator = memory_orchestrator
+        self.token_budget = token_budget
+        self.vector_k = vector_k
+        self.include_vector = include_vector and memory_orchestrator is not None
+        self.include_graph = include_graph and (memory_orchestrator is not None or graph_retriever is not None)
+        self.retrieval_timeout = retrieval_timeout
+        if graph_retriever is None and memory_orchestrator is not None:
+            # The Cypher QA chain would add two LLM calls to every turn and return prose, not facts.
+            graph_retriever = partial(memory_orchestrator.search_graph_memory, mode="direct")
+        self.graph_retriever = graph_retriever
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def build(self, query: Optional[str], stm_messages: List[Message]) -> MemoryContext:
+        """
+        Select the memory context for ``query``.
+
+        Args:
+            query (str, optional): Text used for long-term retrieval, usually the
+                user's input. Without a query only short-term memory is used.
+            stm_messages (List[Message]): Short-term messages, oldest first.
+
+        Returns:
+            MemoryContext: The selected memory and its estimated token count.
+        """
+        vector_future = graph_future = None
+        deadline = None if self.retrieval_timeout is None else time.monotonic() + self.retrieval_timeout
+        if query:
+            if self.include_vector:
+                vector_future = self._submit(self.memory_orchestrator.search_vector_memory, query, self.vector_k)
+            if self.include_graph:
+                graph_future = self._submit(self.graph_retriever, query)
+
+        context = MemoryContext()
+        remaining = self.token_budget
+
+        # 1. Most recent conversation first, kept in chronological order.
+        for message in reversed(stm_messages):
+            tokens = _message_tokens(message)
+            if tokens > remaining:
+                break
+            context.stm.append(message)
+            remaining -= tokens
+        context.stm.reverse()
+
+        # 2. Vector memories, in relevance order, skipping what STM already holds.
+        seen = {message.content for message in context.stm}
+        for message in self._result(vector_future, "vector", deadline) or []:
+            if message.content in seen:
+                continue
+            tokens = _message_tokens(message)
+            if tokens > remaining:
+                continue
+            context.vector.append(message)
+            seen.add(message.content)
+            remaining -= tokens
+
+        # 3. Graph facts fill whatever is left.
+        for fact in (self._result(graph_future, "graph", deadline) or "").splitlines():
+            fact = fact.strip().lstrip("- ").strip()
+            if not fact:
+                continue
+            tokens = _text_tokens(fact)
+            if tokens > remaining:
+                continue
+            context.graph.append(fact)
+            remaining -= tokens
+
+        context.tokens = self.token_budget - remaining
+        return context
+
+    def _submit(self, fn: Callable, *args):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="neurotrace-context")
+        return self._executor.submit(fn, *args)
+
+    def _result(self, future, source: str, deadline: Optional[float]):
+        if future is None:
+            return None
+        try:
+            # One deadline for every source, so waiting for several never exceeds the timeout.
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logger.warning("Skipping %s memory: retrieval took longer than %ss", source, self.retrieval_timeout)
+        except Exception:
+            logger.exception("Skipping %s memory: retrieval failed", source)
+        return None
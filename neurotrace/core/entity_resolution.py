@@ -0,0 +1,347 @@
+"""
+Entity Resolution Module.
+
+This module maps the many surface forms an LLM produces for one entity ("New
+York", "new-york", "NYC") to a single canonical name before it reaches the
+graph. Names are matched against a local alias index in increasing order of
+cost: exact normalised form, known alias, spacing-insensitive form, acronym,
+fuzzy string similarity, and optionally embedding similarity. Only names that
+match nothing become new canonical entities.
+
+:class:`EntityMergeJob` applies the same resolver to the entities already in
+the graph and collapses the duplicates it finds. Because a merge deletes the
+duplicate node, it only acts on fuzzy or embedding matches when asked to.
+"""
+
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
+
+from neurotrace.neurotrace_logging.logger_factory import get_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+    from langchain_core.embeddings import Embeddings
+
+    from neurotrace.core.graph_memory import GraphMemoryAdapter
+
+logger = get_logger("neurotrace.entity_resolution")
+
+_NON_WORD = re.compile(r"[\W_]+")
+_DIGITS = re.compile(r"\d+")
+_LEADING_ARTICLE = re.compile(r"^(the|a|an) ")
+
+
+def normalise_entity(name: str) -> str:
+    """
+    Reduce an entity name to its comparison key.
+
+    Applies Unicode NFKC, lower-cases, spells out ``&``, turns punctuation into
+    spaces and drops a leading article, e.g. ``"The New-York Times"`` ->
+    ``"new york times"``.
+
+    Args:
+        name (str): Entity name as written.
+
+    Returns:
+        str: The normalised key; empty if the name has no word characters.
+    """
+    key = unicodedata.normalize("NFKC", name).lower().replace("&", " and ")
+    key = _NON_WORD.sub(" ", key).strip()
+    return _LEADING_ARTICLE.sub("", key)
+
+
+def _acronym(key: str) -> Optional[str]:
+    # Two-letter acronyms ("us", "it") collide with ordinary words too often.
+    words = key.split()
+    return "".join(word[0] for word in words) if len(words) >= 3 else None
+
+
+class EntityResolver:
+    """Alias index that maps entity names to canonical names.
+
+    The first name seen for an entity becomes its canonical name; later names
+    that match it are recorded as aliases. Fuzzy matching only compares names
+    that share a whole word and differ in length by at most one character in
+    ten, and never merges names whose numbers differ ("version 10" and
+    "version 11" stay apart). Single-word names therefore never match fuzzily:
+    "Paris" and "Parish" are as similar as a typo and its correction.
+
+    Args:
+        embeddings (Embeddings, optional): If given, names that match nothing
+            else are compared by cosine similarity of their embeddings. Defaults
+            to None.
+        fuzzy_threshold (float, optional): Minimum ``difflib`` ratio for a fuzzy
+            match. Set above 1 to disable fuzzy matching. Defaults to 0.9.
+        embedding_threshold (float, optional): Minimum cosine similarity for an
+            embedding match. Defaults to 0.9.
+        aliases (Dict[str, str], optional): Known ``alias -> canonical`` pairs,
+            e.g. ``{"nyc": "new york city"}``. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional["Embeddings"] = None,
+        fuzzy_threshold: float = 0.9,
+        embedding_threshold: float = 0.9,
+        aliases: Optional[Dict[str, str]] = None,
+    ):
+        self.embeddings = embeddings
+        self.fuzzy_threshold = fuzzy_threshold
+        self.embedding_threshold = embedding_threshold
+
+        self._canonical: Dict[str, str] = {}  # key -> canonical name
+        self._aliases: Dict[str, str] = {}  # key of any known form -> canonical name
+        self._compact: Dict[str, str] = {}  # key without spaces -> canonical name
+        self._acronyms: Dict[str, Optional[str]] = {}  # None when several names share an acronym
+        self._blocks: Dict[str, Set[str]] = {}  # word or word prefix -> canonical keys
+        self._vector_names: List[str] = []
+        self._vectors: List["np.ndarray"] = []
+        self._matrix: Optional["np.ndarray"] = None
+        self._lock = threading.RLock()
+
+        for alias, canonical in (aliases or {}).items():
+            self.add_alias(alias, canonical)
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    @property
+    def canonical_names(self) -> List[str]:
+        return list(self._canonical.values())
+
+    def resolve(self, name: str, fuzzy: bool = True) -> str:
+        """
+        Return the canonical name for ``name``, registering it if it is new.
+
+        Args:
+            name (str): Entity name as written.
+            fuzzy (bool, optional): Also try fuzzy and embedding matching. If False,
+                a name that only matches that way is registered as a new entity.
+                Defaults to True.
+
+        Returns:
+            str: The canonical name, or ``name`` itself for a new entity.
+        """
+        key = normalise_entity(name)
+        if not key:
+            return name
+        with self._lock:
+            canonical = self._match(key, name, fuzzy)
+            if canonical is None:
+                self._register(key, name)
+                return name
+            self._aliases[key] = canonical
+            return canonical
+
+    def lookup(self, name: str, exact: bool = False) -> Optional[str]:
+        """
+        Return the canonical name for ``name`` without registering anything.
+
+        Args:
+            name (str): Entity name as written.
+            exact (bool, optional): Only consult the alias index, skipping acronym,
+                fuzzy and embedding matching. Defaults to False.
+
+        Returns:
+            Optional[str]: The canonical name, or None if ``name`` is unknown.
+        """
+        key = normalise_entity(name)
+        if not key:
+            return None
+        if exact:
+            return self._aliases.get(key) or self._compact.get(key.replace(" ", ""))
+        with self._lock:
+            return self._match(key, name)
+
+    def add_alias(self, alias: str, canonical: str) -> None:
+        """
+        Record that ``alias`` refers to ``canonical``.
+
+        Args:
+            alias (str): Alternative name.
+            canonical (str): Name to resolve it to; resolved itself first, so
+                it may be an alias of an existing entity.
+        """
+        canonical = self.resolve(canonical)
+        key = normalise_entity(alias)
+        if key:
+            with self._lock:
+                self._aliases[key] = canonical
+
+    def _match(self, key: str, name: str, fuzzy: bool = True) -> Optional[str]:
+        canonical = self._aliases.get(key) or self._compact.get(key.replace(" ", ""))
+        if canonical is not None:
+            return canonical
+
+        # "nyc" -> "new york city", and "new york city" -> an existing "nyc".
+        if " " not in key and self._acronyms.get(key):
+            return self._acronyms[key]
+        acronym = _acronym(key)
+        if acronym and acronym in self._canonical:
+            return self._canonical[acronym]
+        if not fuzzy:
+            return None
+
+        canonical = self._fuzzy_match(key)
+        if canonical is None and self.embeddings is not None:
+            canonical = self._embedding_match(name)
+        return canonical
+
+    def _fuzzy_match(self, key: str) -> Optional[str]:
+        if self.fuzzy_threshold > 1:
+            return None
+        candidates: Set[str] = set()
+        for block in self._block_keys(key):
+            candidates |= self._blocks.get(block, set())
+        digits = _DIGITS.findall(key)
+
+        best, best_ratio = None, self.fuzzy_threshold
+        matcher = SequenceMatcher(b=key, autojunk=False)
+        for candidate in sorted(candidates):
+            if abs(len(candidate) - len(key)) > max(1, len(key) // 10):
+                continue
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if (best is None or ratio > best_ratio) and ratio >= best_ratio and _DIGITS.findall(candidate) == digits:
+                best, best_ratio = candidate, ratio
+        return self._canonical[best] if best is not None else None
+
+    def _embedding_match(self, name: str) -> Optional[str]:
+        import numpy as np
+
+        if not self._vectors:
+            return None
+        if self._matrix is None or len(self._matrix) != len(self._vectors):
+            self._matrix = np.vstack(self._vectors)
+        query = self._embed(name)
+        scores = self._matrix @ query
+        best = int(np.argmax(scores))
+        return self._vector_names[best] if scores[best] >= self.embedding_threshold else None
+
+    def _embed(self, name: str) -> "np.ndarray":
+        # numpy is only needed for embedding matching, so it is not imported with the module.
+        import numpy as np
+
+        vector = np.asarray(self.embeddings.embed_query(name), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _block_keys(key: str) -> Set[str]:
+        # A shared word is required, so one-word names only ever match exactly.
+        words = key.split()
+        return set(words) if len(words) > 1 else set()
+
+    def _register(self, key: str, name: str) -> None:
+        self._canonical[key] = name
+        self._aliases[key] = name
+        self._compact.setdefault(key.replace(" ", ""), name)
+        acronym = _acronym(key)
+        if acronym:
+            self._acronyms[acronym] = name if acronym not in self._acronyms else None
+        for block in self._block_keys(key):
+            self._blocks.setdefault(block, set()).add(key)
+        if self.embeddings is not None:
+            self._vector_names.append(name)
+            self._vectors.append(self._embed(name))
+
+
+@dataclass
+class MergeReport:
+    """Outcome of one :class:`EntityMergeJob` run.
+
+    Attributes:
+        entities_scanned (int): Entities read from the graph.
+        duplicates_merged (int): Entities collapsed into a canonical entity.
+        relationships_moved (int): Relationships re-pointed at canonical entities.
+    """
+
+    entities_scanned: int = 0
+    duplicates_merged: int = 0
+    relationships_moved: int = 0
+
+
+class EntityMergeJob:
+    """Collapses duplicate entities already stored in graph memory.
+
+    Every entity name in the graph is resolved; names that resolve to another
+    entity have their relationships moved to it and are then deleted. Run it
+    once with :meth:`run_once` or every ``interval`` seconds on a daemon thread
+    with :meth:`start`.
+
+    By default only exact, alias, spacing and acronym matches are merged. Fuzzy
+    and embedding matches can join distinct entities, and the deleted node
+    cannot be recovered, so they are merged only with ``merge_fuzzy_matches``.
+
+    Args:
+        graph_memory_adapter (GraphMemoryAdapter): Graph memory to clean up.
+        resolver (EntityResolver, optional): Defaults to the adapter's resolver,
+            or a new default resolver if it has none.
+        interval (float, optional): Seconds between background runs. Defaults to 3600.
+        merge_fuzzy_matches (bool, optional): Also merge entities matched only by
+            fuzzy or embedding similarity. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        graph_memory_adapter: "GraphMemoryAdapter",
+        resolver: Optional[EntityResolver] = None,
+        interval: float = 3600.0,
+        merge_fuzzy_matches: bool = False,
+    ):
+        self.adapter = graph_memory_adapter
+        self.resolver = resolver or graph_memory_adapter.entity_resolver or EntityResolver()
+        self.interval = interval
+        self.merge_fuzzy_matches = merge_fuzzy_matches
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> MergeReport:
+        """Resolve every entity in the graph and merge the duplicates found."""
+        names = self.adapter.entity_names()
+        duplicates = self._duplicates(names)
+        moved = self.adapter.merge_entities(duplicates) if duplicates else 0
+        report = MergeReport(len(names), len(duplicates), moved)
+        logger.info(
+            "Entity merge: %d entities scanned, %d duplicates merged, %d relationships moved",
+            report.entities_scanned,
+            report.duplicates_merged,
+            report.relationships_moved,
+        )
+        return report
+
+    def _duplicates(self, names: Iterable[str]) -> Dict[str, str]:
+        duplicates = {}
+        for name in names:
+            canonical = self.resolver.resolve(name, fuzzy=self.merge_fuzzy_matches)
+            if canonical != name:
+                duplicates[name] = canonical
+        return duplicates
+
+    def start(self) -> None:
+        """Run the job every ``interval`` seconds on a daemon thread until :meth:`stop`."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="neurotrace-entity-merge", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread, waiting up to ``timeout`` seconds for a run in progress."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Entity merge run failed")
@@ -1,52 +1,295 @@
+import re
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Tuple, Union
-
-from langchain.llms.base import BaseLLM
-from langchain_community.chains.graph_qa.cypher import GraphCypherQAChain
-from langchain_community.graphs import Neo4jGraph
-from langchain_community.graphs.graph_store import GraphStore
-from langchain_core.language_models import BaseChatModel
-from langchain_google_genai import GoogleGenerativeAI
+from functools import cached_property
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
+from neurotrace.core import metrics
+from neurotrace.core.entity_resolution import EntityResolver
+from neurotrace.core.llm_dispatcher import get_dispatcher
 from neurotrace.core.utils import safe_json_loads, strip_json_code_block
+from neurotrace.neurotrace_logging.logger_factory import get_logger
 from neurotrace.prompts.task_prompts import PROMPT_TRIPLETS_EXTRACTOR
 
+if TYPE_CHECKING:
+    from langchain_community.chains.graph_qa.cypher import GraphCypherQAChain
+    from langchain_community.graphs.graph_store import GraphStore
+    from langchain_core.language_models import BaseChatModel, BaseLLM
+
+logger = get_logger("neurotrace.graph_memory")
+
+ENTITY_NAMES_QUERY = "MATCH (e:Entity) RETURN e.name AS name"
+
+# The hop count cannot be a Cypher parameter, so it is formatted into the query.
+NEIGHBOURHOOD_QUERY = """
+MATCH p = (e:Entity)-[*1..{hops}]-(:Entity)
+WHERE e.name IN $names
+UNWIND relationships(p) AS r
+WITH r, min(length(p)) AS distance
+ORDER BY distance
+LIMIT $limit
+RETURN startNode(r).name AS subject, type(r) AS relation, endNode(r).name AS object
+"""
+
+# Every relationship touching each entity, for the adjacency cache.
+ADJACENCY_QUERY = """
+UNWIND $names AS name
+MATCH (e:Entity {name: name})-[r]-(other:Entity)
+RETURN name AS entity, startNode(r).name AS subject, type(r) AS relation, endNode(r).name AS object
+"""
+
+# Relationships of duplicate entities are moved to their canonical entity, one
+# relationship type at a time, before the duplicates are deleted. The canonical
+# entity may only be known as a configured alias target, so it is created first.
+MERGE_ENTITIES_QUERY = """
+UNWIND $names AS name
+MERGE (e:Entity {name: name})
+  ON CREATE SET e.created_at = $timestamp
+"""
+
+MOVE_OUTGOING_QUERY = """
+UNWIND $pairs AS pair
+MATCH (alias:Entity {{name: pair.alias}})-[r:`{relation}`]->(other:Entity)
+WHERE other.name <> pair.canonical
+MATCH (canonical:Entity {{name: pair.canonical}})
+MERGE (canonical)-[moved:`{relation}`]->(other)
+  ON CREATE SET moved = properties(r)
+DELETE r
+RETURN count(*) AS moved
+"""
+
+MOVE_INCOMING_QUERY = """
+UNWIND $pairs AS pair
+MATCH (other:Entity)-[r:`{relation}`]->(alias:Entity {{name: pair.alias}})
+WHERE other.name <> pair.canonical
+MATCH (canonical:Entity {{name: pair.canonical}})
+MERGE (other)-[moved:`{relation}`]->(canonical)
+  ON CREATE SET moved = properties(r)
+DELETE r
+RETURN count(*) AS moved
+"""
+
+DELETE_ENTITIES_QUERY = """
+UNWIND $names AS name
+MATCH (e:Entity {name: name})
+DETACH DELETE e
+"""
+
+# Retention: relationships are deleted in batches so that no single transaction
+# holds an unbounded number of locks, and entities left without relationships go
+# after them. Each query returns how many it deleted; callers repeat it until
+# fewer than ``$batch_size`` come back.
+PRUNE_RELATIONSHIPS_QUERY = """
+MATCH (:Entity)-[r]->(:Entity)
+WHERE r.created_at < $before
+WITH r LIMIT $batch_size
+DELETE r
+RETURN count(*) AS deleted
+"""
+
+PRUNE_ORPHANS_QUERY = """
+MATCH (e:Entity)
+WHERE NOT (e)--()
+WITH e LIMIT $batch_size
+DELETE e
+RETURN count(*) AS deleted
+"""
+
+# Single words that are never looked up as entities on their own.
+_STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from has have how i in is it me my of on or our so that the their "
+    "them they this to was we were what when where which who why will with you your".split()
+)
+_NON_WORD = re.compile(r"\W+")
+
+
+def _relation_type(relation: str) -> str:
+    """Turn a free-text relation into a Cypher relationship type, e.g. "works at" -> WORKS_AT."""
+    return relation.upper().replace(" ", "_").replace("`", "")
+
+
+def _normalise_name(text: str) -> str:
+    """Lower-case ``text`` and collapse punctuation and whitespace, e.g. "New-York " -> "new york"."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def format_fact(subject: str, relation: str, obj: str) -> str:
+    """Render a relationship as a sentence-like fact, e.g. ("alice", "WORKS_AT", "acme") -> "alice works at acme"."""
+    return f"{subject} {relation.lower().replace('_', ' ')} {obj}".strip()
+
 
 class GraphTripletIndexerBase(ABC): ...
 
 
 class GraphTripletIndexer(GraphTripletIndexerBase):
-    def __init__(self, llm: Union[BaseLLM, BaseChatModel]):
+    def __init__(self, llm: Union["BaseLLM", "BaseChatModel"]):
         self.llm = llm
         self.prompt = PROMPT_TRIPLETS_EXTRACTOR
 
     def extract(self, graph_summary: str) -> List[Tuple[str, str]]:
         prompt_text = self.prompt.format(text=graph_summary)
-        response = self.llm.invoke(prompt_text).content.strip()
+        with metrics.timer("neurotrace_graph_triplet_extraction_seconds"):
+            response = get_dispatcher().invoke(self.llm, prompt_text)
         response = strip_json_code_block(response).lower()
 
-        return safe_json_loads(response, return_type=list)  # noqa
+        triplets = safe_json_loads(response, return_type=list)
+        metrics.observe("neurotrace_graph_triplets_extracted", len(triplets))
+        return triplets  # noqa
 
 
 class BaseGraphMemoryAdapter(ABC): ...
 
 
+Triplet = Tuple[str, str, str]
+
+
+class AdjacencyCache:
+    """Bounded LRU of per-entity adjacency lists.
+
+    Each entry holds every relationship touching one entity, in either
+    direction. Entries are filled from reads and kept current by
+    :meth:`add`, which the adapter's write path calls for every relationship it
+    writes; entities that are not cached are left to be fetched on their next
+    read.
+
+    Args:
+        max_entities (int, optional): Entities kept before the least recently
+            used is evicted. Defaults to 1024.
+    """
+
+    def __init__(self, max_entities: int = 1024):
+        self.max_entities = max_entities
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[Triplet, None]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Increases on every write, so a fill can tell whether it raced with one."""
+        return self._generation
+
+    def get_many(self, names: Iterable[str]) -> Tuple[Dict[str, List[Triplet]], List[str]]:
+        """
+        Look up the adjacency lists of ``names``.
+
+        Returns:
+            Tuple[Dict[str, List[Triplet]], List[str]]: Cached lists by entity, and
+                the names that were not cached.
+        """
+        found: Dict[str, List[Triplet]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for name in names:
+                entry = self._entries.get(name)
+                if entry is None:
+                    missing.append(name)
+                else:
+                    self._entries.move_to_end(name)
+                    found[name] = list(entry)
+            self.hits += len(found)
+            self.misses += len(missing)
+        if found:
+            metrics.inc("neurotrace_graph_adjacency_cache_total", len(found), result="hit")
+        if missing:
+            metrics.inc("neurotrace_graph_adjacency_cache_total", len(missing), result="miss")
+        return found, missing
+
+    def fill(self, adjacency: Dict[str, List[Triplet]], generation: int) -> None:
+        """Cache lists read from the graph, unless a write happened since ``generation`` was read."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            for name, triplets in adjacency.items():
+                self._entries[name] = dict.fromkeys(triplets)
+                self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entities:
+                self._entries.popitem(last=False)
+
+    def add(self, triplets: Iterable[Triplet]) -> None:
+        """Write-through: append new relationships to the cached lists of their endpoints."""
+        with self._lock:
+            self._generation += 1
+            for triplet in triplets:
+                for name in (triplet[0], triplet[2]):
+                    entry = self._entries.get(name)
+                    if entry is not None:
+                        entry[triplet] = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
 # class CustomGraphCypherQAChain(GraphCypherQAChain):
 
 
 class GraphMemoryAdapter(BaseGraphMemoryAdapter):
+    """Reads and writes graph memory.
+
+    Args:
+        llm (Union[BaseLLM, BaseChatModel]): Model for triplet extraction and the Cypher QA chain.
+        graph_database (GraphStore): Graph to store ``Entity`` nodes and relations in.
+        triplets_indexer (GraphTripletIndexerBase, optional): Extracts triplets from text.
+            Defaults to a :class:`GraphTripletIndexer` over ``llm``.
+        entity_resolver (EntityResolver, optional): If given, subjects and objects are
+            mapped to canonical entity names before they are written, so different
+            spellings of one entity share a node. Seeded with the graph's existing
+            entities on first write. Defaults to None.
+        adjacency_cache_size (int, optional): Entities whose adjacency lists are kept
+            in process for :meth:`neighbourhood`. 0 disables the cache, so every
+            lookup is a single k-hop query. Defaults to 1024.
+    """
+
     def __init__(
         self,
-        llm: Union[BaseLLM, BaseChatModel],
-        graph_database: GraphStore,
+        llm: Union["BaseLLM", "BaseChatModel"],
+        graph_database: "GraphStore",
         triplets_indexer: GraphTripletIndexerBase = None,
+        entity_resolver: Optional[EntityResolver] = None,
+        adjacency_cache_size: int = 1024,
     ):
         self.llm = llm
         self.graph = graph_database
 
         self.triplets_indexer = triplets_indexer or GraphTripletIndexer(self.llm)
-        self.qa_chain = GraphCypherQAChain.from_llm(
+        self.entity_resolver = entity_resolver
+        self._resolver_seeded = False
+        self.adjacency_cache = AdjacencyCache(adjacency_cache_size) if adjacency_cache_size > 0 else None
+
+        # Normalised entity name -> stored names, loaded from the graph on first lookup.
+        self._entity_index: Optional[Dict[str, Set[str]]] = None
+        self._longest_entity = 1
+        self._entity_lock = threading.Lock()
+
+    @cached_property
+    def qa_chain(self) -> "GraphCypherQAChain":
+        """Cypher QA chain used by ``ask_graph``, built on first use.
+
+        Building the chain imports ``langchain_community`` and reads the graph
+        schema, so it is deferred until a question is actually asked.
+        """
+        from langchain_community.chains.graph_qa.cypher import GraphCypherQAChain
+
+        return GraphCypherQAChain.from_llm(
             llm=self.llm, graph=self.graph, verbose=True, allow_dangerous_requests=True  # Prints the generated Cypher
         )
 
@@ -65,6 +308,7 @@ class GraphMemoryAdapter(BaseGraphMemoryAdapter):
             return
 
         s, r, o = triples
+        s, o = self._resolve_entity(s), self._resolve_entity(o)
         query = f"""
         MERGE (a:Entity {{name: $s}})
           ON CREATE SET a.created_at = $timestamp
@@ -72,13 +316,74 @@ class GraphMemoryAdapter(BaseGraphMemoryAdapter):
         MERGE (b:Entity {{name: $o}})
           ON CREATE SET b.created_at = $timestamp
 
-        MERGE (a)-[r:`{r.upper().replace(" ", "_")}`]->(b)
+        MERGE (a)-[r:`{_relation_type(r)}`]->(b)
           ON CREATE SET r.created_at = $timestamp, r.source = $sender
           ON CREATE SET r.tags = $tags
         """
-        self.graph.query(
-            query, params={"s": s, "o": o, "r": r, "timestamp": timestamp, "sender": sender, "tags": tags or []}
-        )
+        with metrics.timer("neurotrace_graph_cypher_seconds", op="insert_triplets"):
+            self.graph.query(
+                query, params={"s": s, "o": o, "r": r, "timestamp": timestamp, "sender": sender, "tags": tags or []}
+            )
+        self._index_entities([s, o])
+        if self.adjacency_cache is not None:
+            self.adjacency_cache.add([(s, _relation_type(r), o)])
+        metrics.inc("neurotrace_graph_triplets_written_total")
+
+    def add_triplets(
+        self,
+        triplets: List[List[str]],
+        sender: Literal["user", "agent"] = "user",
+        timestamp: str = None,
+        tags: List[str] = None,
+    ) -> int:
+        """
+        Insert many triplets with one query per relation type.
+
+        Relation types cannot be parameterised in Cypher, so triplets are grouped
+        by relation and each group is written with a single ``UNWIND`` query.
+
+        Args:
+            triplets (List[List[str]]): ``[subject, relation, object]`` entries.
+                Entries that are not exactly three items long or have an empty
+                relation are skipped.
+            sender (Literal["user", "agent"]): Recorded as the relation source.
+            timestamp (str, optional): ISO timestamp for new nodes and relations.
+                Defaults to now.
+            tags (List[str], optional): Tags stored on new relations.
+
+        Returns:
+            int: Number of triplets written.
+        """
+        by_relation: Dict[str, List[Dict[str, str]]] = defaultdict(list)
+        for triplet in triplets or []:
+            if len(triplet) != 3 or not _relation_type(triplet[1]):
+                continue
+            s, r, o = triplet
+            by_relation[_relation_type(r)].append({"s": self._resolve_entity(s), "o": self._resolve_entity(o)})
+
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+
+        for relation, rows in by_relation.items():
+            query = f"""
+            UNWIND $rows AS row
+            MERGE (a:Entity {{name: row.s}})
+              ON CREATE SET a.created_at = $timestamp
+            MERGE (b:Entity {{name: row.o}})
+              ON CREATE SET b.created_at = $timestamp
+            MERGE (a)-[r:`{relation}`]->(b)
+              ON CREATE SET r.created_at = $timestamp, r.source = $sender, r.tags = $tags
+            """
+            with metrics.timer("neurotrace_graph_cypher_seconds", op="add_triplets"):
+                self.graph.query(
+                    query, params={"rows": rows, "timestamp": timestamp, "sender": sender, "tags": tags or []}
+                )
+            self._index_entities(name for row in rows for name in (row["s"], row["o"]))
+            if self.adjacency_cache is not None:
+                self.adjacency_cache.add((row["s"], relation, row["o"]) for row in rows)
+        written = sum(len(rows) for rows in by_relation.values())
+        metrics.inc("neurotrace_graph_triplets_written_total", written)
+        return written
 
     def add_conversation(
         self, summarised_text: str, sender: Literal["user", "agent"] = "agent", tags: List[str] = None
@@ -91,9 +396,7 @@ class GraphMemoryAdapter(BaseGraphMemoryAdapter):
             :param summarised_text:
         """
         triplets = self.triplets_indexer.extract(summarised_text)
-
-        for triplet in triplets:
-            self.insert_triplets(triplet, sender=sender, tags=tags)
+        self.add_triplets(triplets, sender=sender, tags=tags)
 
     def ask_graph(self, query: str) -> Dict[str, Any]:
         """
@@ -105,9 +408,275 @@ class GraphMemoryAdapter(BaseGraphMemoryAdapter):
         Returns:
             str: The answer from the graph memory.
         """
-        return self.qa_chain.invoke({"query": query})
+        with metrics.timer("neurotrace_graph_cypher_seconds", op="ask_graph"):
+            return self.qa_chain.invoke({"query": query})
+
+    def _resolve_entity(self, name: str) -> str:
+        """Map ``name`` to its canonical entity name, if an entity resolver is configured."""
+        if self.entity_resolver is None:
+            return name
+        if not self._resolver_seeded:
+            with self._entity_lock:
+                if not self._resolver_seeded:
+                    for existing in self.entity_names():
+                        self.entity_resolver.resolve(existing)
+                    self._resolver_seeded = True
+        canonical = self.entity_resolver.resolve(name)
+        if canonical != name:
+            metrics.inc("neurotrace_graph_entities_resolved_total")
+        return canonical
+
+    def entity_names(self) -> List[str]:
+        """Names of every ``Entity`` node in the graph."""
+        with metrics.timer("neurotrace_graph_cypher_seconds", op="entity_names"):
+            return [record["name"] for record in self.graph.query(ENTITY_NAMES_QUERY)]
+
+    def merge_entities(self, duplicates: Dict[str, str]) -> int:
+        """
+        Collapse duplicate entities into their canonical entities.
+
+        Each duplicate's relationships are moved to its canonical entity (keeping
+        the canonical entity's own relationship when both exist), creating the
+        canonical entity if the graph does not have it yet. The duplicate is then
+        deleted, unless it still has relationships to other entities, in which
+        case it is kept and a warning is logged. Relationships between a
+        duplicate and its canonical entity are dropped rather than turned into
+        self-loops.
+
+        Args:
+            duplicates (Dict[str, str]): ``duplicate name -> canonical name``.
+
+        Returns:
+            int: Number of relationships moved.
+        """
+        pairs = [
+            {"alias": alias, "canonical": canonical} for alias, canonical in duplicates.items() if alias != canonical
+        ]
+        if not pairs:
+            return 0
+        canonical_of = {pair["alias"]: pair["canonical"] for pair in pairs}
+        canonicals = sorted(set(canonical_of.values()))
+        moved = 0
+        with metrics.timer("neurotrace_graph_cypher_seconds", op="merge_entities"):
+            self.graph.query(
+                MERGE_ENTITIES_QUERY, params={"names": canonicals, "timestamp": datetime.now().isoformat()}
+            )
+            for relation in self.get_all_relation_types():
+                for template in (MOVE_OUTGOING_QUERY, MOVE_INCOMING_QUERY):
+                    records = self.graph.query(template.format(relation=relation), params={"pairs": pairs})
+                    moved += sum(record["moved"] for record in records)
+            remaining = {
+                record["entity"]
+                for record in self.graph.query(ADJACENCY_QUERY, params={"names": list(canonical_of)})
+                if canonical_of[record["entity"]] not in (record["subject"], record["object"])
+            }
+            deleted = [alias for alias in canonical_of if alias not in remaining]
+            self.graph.query(DELETE_ENTITIES_QUERY, params={"names": deleted})
+        if remaining:
+            logger.warning(
+                "Kept %d duplicate entities whose relationships were not moved: %s", len(remaining), remaining
+            )
+        if self.adjacency_cache is not None:
+            self.adjacency_cache.clear()
+
+        self._index_entities(canonicals)
+        if self._entity_index is not None:
+            with self._entity_lock:
+                for alias in deleted:
+                    names = self._entity_index.get(_normalise_name(alias))
+                    if names is not None:
+                        names.discard(alias)
+        metrics.inc("neurotrace_graph_entities_merged_total", len(deleted))
+        return moved
+
+    def _run_batched(self, query: str, batch_size: int, **params: Any) -> int:
+        deleted = 0
+        while True:
+            records = self.graph.query(query, params={**params, "batch_size": batch_size})
+            count = sum(record["deleted"] for record in records)
+            deleted += count
+            if count < batch_size:
+                return deleted
+
+    def prune_relationships(self, before: str, batch_size: int = 1000) -> int:
+        """
+        Delete relationships created before ``before``.
+
+        Relationships without a ``created_at`` property are kept.
+
+        Args:
+            before (str): ISO timestamp, in the same format as the ``timestamp``
+                passed to :meth:`add_triplets`.
+            batch_size (int, optional): Relationships deleted per query. Defaults to 1000.
+
+        Returns:
+            int: Number of relationships deleted.
+        """
+        with metrics.timer("neurotrace_graph_cypher_seconds", op="prune_relationships"):
+            deleted = self._run_batched(PRUNE_RELATIONSHIPS_QUERY, batch_size, before=before)
+        if deleted and self.adjacency_cache is not None:
+            self.adjacency_cache.clear()
+        return deleted
+
+    def prune_orphan_entities(self, batch_size: int = 1000) -> int:
+        """
+        Delete entities that no longer have any relationships.
+
+        Args:
+            batch_size (int, optional): Entities deleted per query. Defaults to 1000.
+
+        Returns:
+            int: Number of entities deleted.
+        """
+        with metrics.timer("neurotrace_graph_cypher_seconds", op="prune_orphan_entities"):
+            deleted = self._run_batched(PRUNE_ORPHANS_QUERY, batch_size)
+        if deleted:
+            if self.adjacency_cache is not None:
+                self.adjacency_cache.clear()
+            if self._entity_index is not None:
+                self.refresh_entity_index()
+        return deleted
+
+    def _index_entities(self, names: Iterable[str]) -> None:
+        """Add written entity names to the entity index, if it has been loaded."""
+        if self._entity_index is None:
+            return
+        with self._entity_lock:
+            for name in names:
+                key = _normalise_name(str(name))
+                if key:
+                    self._entity_index.setdefault(key, set()).add(name)
+                    self._longest_entity = max(self._longest_entity, key.count(" ") + 1)
+
+    def refresh_entity_index(self) -> None:
+        """(Re)load the entity index from every ``Entity.name`` in the graph."""
+        index: Dict[str, Set[str]] = {}
+        for name in self.entity_names():
+            key = _normalise_name(str(name))
+            if key:
+                index.setdefault(key, set()).add(name)
+        with self._entity_lock:
+            self._entity_index = index
+            self._longest_entity = max((key.count(" ") + 1 for key in index), default=1)
+
+    def find_entities(self, text: str) -> List[str]:
+        """
+        Find the stored entities mentioned in ``text``.
+
+        Every run of up to as many words as the longest entity name is looked up
+        in an in-memory index of ``Entity.name`` values, after lower-casing and
+        stripping punctuation. With an entity resolver, known aliases of stored
+        entities match too. Single stopwords are ignored.
+
+        Args:
+            text (str): Free text, typically the user's question.
+
+        Returns:
+            List[str]: Matching entity names as stored, in order of appearance.
+        """
+        if self._entity_index is None:
+            self.refresh_entity_index()
+        words = _normalise_name(text).split()
+        resolver = self.entity_resolver
+        longest = max(self._longest_entity, 4) if resolver is not None else self._longest_entity
+        found: Dict[str, None] = {}
+        with self._entity_lock:
+            for start in range(len(words)):
+                for end in range(start + 1, min(len(words), start + longest) + 1):
+                    if end == start + 1 and words[start] in _STOPWORDS:
+                        continue
+                    phrase = " ".join(words[start:end])
+                    names = self._entity_index.get(phrase)
+                    if not names and resolver is not None:
+                        canonical = resolver.lookup(phrase, exact=True)
+                        names = self._entity_index.get(_normalise_name(canonical)) if canonical else None
+                    for name in sorted(names or ()):
+                        found[name] = None
+        return list(found)
+
+    def neighbourhood(self, entities: List[str], hops: int = 2, limit: int = 25) -> List[Tuple[str, str, str]]:
+        """
+        Fetch the relationships within ``hops`` of ``entities``, nearest first.
+
+        With the adjacency cache, the neighbourhood is walked hop by hop over cached
+        adjacency lists and only uncached entities are fetched, one query per hop.
+        Without it, the neighbourhood is fetched with a single k-hop query.
+
+        Args:
+            entities (List[str]): Entity names as stored.
+            hops (int, optional): Path length to expand. Defaults to 2.
+            limit (int, optional): Maximum relationships, nearest first. Defaults to 25.
+
+        Returns:
+            List[Tuple[str, str, str]]: ``(subject, relation_type, object)`` triplets.
+        """
+        if not entities:
+            return []
+        if self.adjacency_cache is not None:
+            return self._cached_neighbourhood(entities, hops, limit)
+        with metrics.timer("neurotrace_graph_cypher_seconds", op="neighbourhood"):
+            records = self.graph.query(
+                NEIGHBOURHOOD_QUERY.format(hops=int(hops)), params={"names": list(entities), "limit": int(limit)}
+            )
+        return [(record["subject"], record["relation"], record["object"]) for record in records]
+
+    def _cached_neighbourhood(self, entities: List[str], hops: int, limit: int) -> List[Triplet]:
+        frontier = list(dict.fromkeys(entities))
+        visited = set(frontier)
+        seen = set()
+        found: List[Triplet] = []
+        for _ in range(hops):
+            adjacency = self._adjacency(frontier)
+            next_frontier = []
+            for name in frontier:
+                for triplet in adjacency.get(name, ()):
+                    if triplet not in seen:
+                        seen.add(triplet)
+                        found.append(triplet)
+                        if len(found) >= limit:
+                            return found
+                    other = triplet[2] if triplet[0] == name else triplet[0]
+                    if other not in visited:
+                        visited.add(other)
+                        next_frontier.append(other)
+            frontier = next_frontier
+            if not frontier:
+                break
+        return found
+
+    def _adjacency(self, names: List[str]) -> Dict[str, List[Triplet]]:
+        """Adjacency lists of ``names``, fetching the uncached ones in one query."""
+        adjacency, missing = self.adjacency_cache.get_many(names)
+        if missing:
+            generation = self.adjacency_cache.generation
+            with metrics.timer("neurotrace_graph_cypher_seconds", op="adjacency"):
+                records = self.graph.query(ADJACENCY_QUERY, params={"names": missing})
+            fetched: Dict[str, List[Triplet]] = {name: [] for name in missing}
+            for record in records:
+                fetched[record["entity"]].append((record["subject"], record["relation"], record["object"]))
+            self.adjacency_cache.fill(fetched, generation)
+            adjacency.update(fetched)
+        return adjacency
+
+    def search_facts(self, query: str, hops: int = 2, limit: int = 25) -> List[str]:
+        """
+        Answer ``query`` from the graph without an LLM.
+
+        The entities mentioned in the query are matched against the entity index
+        and their neighbourhood is returned as facts.
+
+        Args:
+            query (str): The question to look up.
+            hops (int, optional): Path length to expand. Defaults to 2.
+            limit (int, optional): Maximum number of facts. Defaults to 25.
+
+        Returns:
+            List[str]: Facts such as ``"alice works at acme"``; empty if no entity matched.
+        """
+        return [format_fact(*triplet) for triplet in self.neighbourhood(self.find_entities(query), hops, limit)]
 
     def get_all_relation_types(self) -> list[str]:
-        result = self.graph.query("CALL db.relationshipTypes()")
+        with metrics.timer("neurotrace_graph_cypher_seconds", op="relationship_types"):
+            result = self.graph.query("CALL db.relationshipTypes()")
         # Output is like: [{'relationshipType': 'WORKS_AT'}, ...]
         return [record["relationshipType"] for record in result]
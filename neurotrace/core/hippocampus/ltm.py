@@ -1,11 +1,13 @@
 # neurotrace/core/ltm.py
 
+import threading
 from abc import ABC, abstractmethod
 from typing import List
 
 from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.messages import BaseMessage
 
+from neurotrace.core import metrics
 from neurotrace.core.adapters.langchain_adapter import from_langchain_message
 from neurotrace.core.constants import Role
 from neurotrace.core.schema import Message
@@ -28,6 +30,15 @@ class BaseLongTermMemory(ABC):
         """
         pass
 
+    def add_messages(self, messages: List[Message]) -> None:
+        """Store several messages in long-term memory, in order.
+
+        Args:
+            messages (List[Message]): The message objects to be stored.
+        """
+        for message in messages:
+            self.add_message(message)
+
     @abstractmethod
     def add_user_message(self, content: str) -> None:
         """Add a user message to long-term memory.
@@ -72,7 +83,9 @@ class LongTermMemory(BaseLongTermMemory):
     """LangChain chat history adapter for long-term memory storage.
 
     This adapter implements the BaseLongTermMemory interface using LangChain's
-    chat history components for persistent storage.
+    chat history components for persistent storage. Writes are serialised, so
+    messages written together by :meth:`add_messages` stay adjacent even when
+    several threads share the adapter.
 
     Args:
         history (BaseChatMessageHistory): LangChain chat history implementation
@@ -89,6 +102,7 @@ class LongTermMemory(BaseLongTermMemory):
         """
         self.history = history
         self.session_id = session_id
+        self._lock = threading.Lock()
 
     def add_message(self, message: Message) -> None:
         """Add a message to the LangChain chat history.
@@ -99,7 +113,18 @@ class LongTermMemory(BaseLongTermMemory):
             message (Message): The message to store.
         """
         lc_msg: BaseMessage = message.to_langchain_message()
-        self.history.add_message(lc_msg)
+        with metrics.timer("neurotrace_ltm_write_seconds"), self._lock:
+            self.history.add_message(lc_msg)
+
+    def add_messages(self, messages: List[Message]) -> None:
+        """Add messages to the LangChain chat history in one write.
+
+        Args:
+            messages (List[Message]): The messages to store, in order.
+        """
+        lc_msgs: List[BaseMessage] = [message.to_langchain_message() for message in messages]
+        with metrics.timer("neurotrace_ltm_write_seconds"), self._lock:
+            self.history.add_messages(lc_msgs)
 
     def add_user_message(self, content: str) -> None:
         """Add a user message to the chat history.
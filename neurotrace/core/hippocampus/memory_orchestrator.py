@@ -1,29 +1,96 @@
-from typing import Any, Dict, List, Union
-
-from langchain.llms.base import BaseLLM
-from langchain_community.graphs.graph_store import GraphStore
-from langchain_community.vectorstores import VectorStore
-from langchain_core.language_models import BaseChatModel
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Union
 
+from neurotrace.core import metrics
 from neurotrace.core.constants import Role
+from neurotrace.core.entity_resolution import EntityResolver
 from neurotrace.core.graph_memory import GraphMemoryAdapter, GraphTripletIndexer
+from neurotrace.core.llm_tasks import get_vector_summary_and_triplets
 from neurotrace.core.schema import Message, MessageMetadata
 from neurotrace.core.vector_memory import VectorMemoryAdapter
+from neurotrace.neurotrace_logging.logger_factory import get_logger
+
+if TYPE_CHECKING:
+    from langchain_community.graphs.graph_store import GraphStore
+    from langchain_core.language_models import BaseChatModel, BaseLLM
+    from langchain_core.vectorstores import VectorStore
+
+    from neurotrace.core.query_rewrite import QueryRewriter
+    from neurotrace.core.ranking import MemoryRanker
+
+logger = get_logger("neurotrace.orchestrator")
+
+GraphSearchMode = Literal["auto", "direct", "chain"]
 
 
 class MemoryOrchestrator:
-    """Manages both short-term and long-term memory for Neurotrace agents."""
+    """Manages both short-term and long-term memory for Neurotrace agents.
+
+    Args:
+        llm (Union[BaseLLM, BaseChatModel]): Model used for summaries, triplet
+            extraction and the Cypher QA chain.
+        graph_store (GraphStore): Graph database for graph memory.
+        vector_store (VectorStore): Vector store for vector memory.
+        graph_search_mode (GraphSearchMode, optional): How ``search_graph_memory``
+            answers. ``"direct"`` returns the neighbourhood of the entities named in
+            the query without an LLM, ``"chain"`` always uses the Cypher QA chain,
+            and ``"auto"`` tries direct retrieval first and falls back to the chain
+            when no facts are found. Defaults to ``"auto"``.
+        graph_hops (int, optional): Neighbourhood depth for direct retrieval. Defaults to 2.
+        graph_max_facts (int, optional): Facts returned by direct retrieval. Defaults to 25.
+        entity_resolver (EntityResolver, optional): Maps entity names to canonical
+            names before they are written to the graph. Defaults to None.
+        graph_adjacency_cache_size (int, optional): Entities whose adjacency lists the
+            graph adapter keeps in process; 0 disables the cache. Defaults to 1024.
+        memory_ranker (MemoryRanker, optional): Re-ranks vector memory search
+            candidates by recency, access frequency and intensity as well as
+            similarity. Defaults to None (similarity order).
+        vector_overfetch (float, optional): Candidates fetched per requested result
+            when a ranker is set. Defaults to 4.
+        query_rewriter (QueryRewriter, optional): Expands vector memory searches
+            into LLM-written query variants and fuses their results. Defaults to None.
+    """
 
     def __init__(
         self,
-        llm: Union[BaseLLM, BaseChatModel],
-        graph_store: GraphStore,
-        vector_store: VectorStore,
+        llm: Union["BaseLLM", "BaseChatModel"],
+        graph_store: "GraphStore",
+        vector_store: "VectorStore",
+        graph_search_mode: GraphSearchMode = "auto",
+        graph_hops: int = 2,
+        graph_max_facts: int = 25,
+        entity_resolver: Optional[EntityResolver] = None,
+        graph_adjacency_cache_size: int = 1024,
+        memory_ranker: Optional["MemoryRanker"] = None,
+        vector_overfetch: float = 4.0,
+        query_rewriter: Optional["QueryRewriter"] = None,
     ):
         self.llm = llm
+        self.graph_search_mode = graph_search_mode
+        self.graph_hops = graph_hops
+        self.graph_max_facts = graph_max_facts
         self._graph_indexer = GraphTripletIndexer(llm)
-        self._graph_memory_adapter = GraphMemoryAdapter(llm, graph_store, self._graph_indexer)
-        self._vector_memory_adapter = VectorMemoryAdapter(vector_store)
+        self._graph_memory_adapter = GraphMemoryAdapter(
+            llm,
+            graph_store,
+            self._graph_indexer,
+            entity_resolver=entity_resolver,
+            adjacency_cache_size=graph_adjacency_cache_size,
+        )
+        self._vector_memory_adapter = VectorMemoryAdapter(
+            vector_store, ranker=memory_ranker, overfetch=vector_overfetch, query_rewriter=query_rewriter
+        )
+
+    @property
+    def vector_memory_adapter(self) -> VectorMemoryAdapter:
+        return self._vector_memory_adapter
+
+    @property
+    def graph_memory_adapter(self) -> GraphMemoryAdapter:
+        return self._graph_memory_adapter
+
+    @property
+    def graph_indexer(self) -> GraphTripletIndexer:
+        return self._graph_indexer
 
     def save_in_graph_memory(self, summary: str, tags: List[str] = None) -> str:
         """Saves a summary in graph memory."""
@@ -37,8 +104,57 @@ class MemoryOrchestrator:
         self._vector_memory_adapter.add_messages([message])
         return "Vector memory saved."
 
+    def save_memory(self, text: str, tags: List[str] = None) -> str:
+        """Saves a memory in both vector and graph memory with one LLM call.
+
+        A single prompt returns the vector summary and the graph triplets
+        together. If the response cannot be parsed, the raw text is stored in
+        vector memory and triplets are extracted with the graph indexer instead.
+        """
+        result = get_vector_summary_and_triplets(self.llm, text)
+        if not result:
+            self.save_in_vector_memory(text, tags=tags)
+            self.save_in_graph_memory(text, tags=tags)
+            return "Memory saved in both vector and graph memory."
+
+        self.save_in_vector_memory(result["vector_summary"], tags=tags)
+        self._graph_memory_adapter.add_triplets(result["triplets"], sender="user", tags=tags)
+        return "Memory saved in both vector and graph memory."
+
     def search_vector_memory(self, query: str, k: int = 5) -> List[Message]:
         return self._vector_memory_adapter.search(query, k)
 
-    def search_graph_memory(self, query: str) -> str:
-        return self._graph_memory_adapter.ask_graph(query)["result"]
+    def search_graph_memory(self, query: str, mode: Optional[GraphSearchMode] = None) -> str:
+        """Looks up ``query`` in graph memory.
+
+        Direct retrieval returns one fact per line; the chain returns the LLM's answer.
+        In ``"auto"`` mode the chain is only used when direct retrieval finds no
+        facts, whether because the query names no stored entity or because the
+        entities it names have no relationships. If the chain then cannot turn the
+        question into a valid query, the search finds nothing; connection and
+        database errors are raised.
+
+        Args:
+            query (str): The question to answer.
+            mode (GraphSearchMode, optional): Overrides ``graph_search_mode`` for this call.
+
+        Returns:
+            str: The graph memory answer, or an empty string if nothing was found.
+        """
+        mode = mode or self.graph_search_mode
+        adapter = self._graph_memory_adapter
+        if mode != "chain":
+            facts = adapter.search_facts(query, hops=self.graph_hops, limit=self.graph_max_facts)
+            if facts or mode == "direct":
+                metrics.inc("neurotrace_graph_search_total", mode="direct")
+                return "\n".join(facts)
+
+        metrics.inc("neurotrace_graph_search_total", mode="chain")
+        if mode == "chain":
+            return adapter.ask_graph(query)["result"]
+        try:
+            return adapter.ask_graph(query)["result"]
+        except ValueError:
+            # GraphCypherQAChain raises ValueError for Cypher it generated but cannot run.
+            logger.exception("Cypher QA fallback could not answer the graph memory search")
+            return ""
@@ -1,9 +1,13 @@
 # neurotrace/core/_stm.py
+import threading
 import uuid
 from abc import ABC, abstractmethod
-from typing import List
+from collections import deque
+from typing import Deque, Iterable, List
 
+from neurotrace.core import metrics
 from neurotrace.core.schema import Message
+from neurotrace.core.snapshot import decode_messages, encode_messages
 from neurotrace.neurotrace_logging.memory_logger import MemoryLogger
 
 
@@ -23,6 +27,15 @@ class BaseShortTermMemory(ABC):
         """
         ...
 
+    def extend(self, messages: Iterable[Message]) -> None:
+        """Add several messages to short-term memory, in order.
+
+        Args:
+            messages (Iterable[Message]): The messages to add.
+        """
+        for message in messages:
+            self.append(message)
+
     @abstractmethod
     def get_messages(self) -> List[Message]:
         """Retrieve all messages from short-term memory.
@@ -55,6 +68,24 @@ class BaseShortTermMemory(ABC):
         """
         ...
 
+    def snapshot(self) -> bytes:
+        """Encode the stored messages, with their ids and metadata, as a binary snapshot.
+
+        Returns:
+            bytes: Snapshot accepted by :meth:`restore`.
+        """
+        return encode_messages(self.get_messages())
+
+    def restore(self, snapshot: bytes) -> None:
+        """Replace the stored messages with those of a snapshot.
+
+        The token limit of this memory applies, so older messages may be evicted.
+
+        Args:
+            snapshot (bytes): Snapshot produced by :meth:`snapshot`.
+        """
+        self.set_messages(decode_messages(snapshot))
+
     def __len__(self) -> int:
         """Get the number of messages in memory.
 
@@ -71,6 +102,12 @@ class ShortTermMemory(BaseShortTermMemory):
     count stays within a specified limit. When the limit is exceeded, older
     messages are automatically evicted.
 
+    All methods are thread-safe. Writers hold a lock only while they update
+    the message queue and the running token total, and readers get a
+    consistent snapshot copy. No lock is held across I/O or ``await``, so the
+    memory can also be shared by coroutines and executor threads of an
+    asyncio server.
+
     Args:
         max_tokens (int, optional): Maximum number of tokens to store. Set to 0
             to disable memory (all messages will be evicted). Defaults to 2048.
@@ -83,8 +120,20 @@ class ShortTermMemory(BaseShortTermMemory):
             max_tokens (int, optional): Maximum number of tokens to store.
                 Defaults to 2048.
         """
-        self.messages: List[Message] = []
         self.max_tokens = max_tokens
+        self._messages: Deque[Message] = deque()
+        self._token_counts: Deque[int] = deque()  # token length of each message, in the same order
+        self._tokens = 0
+        self._lock = threading.RLock()
+
+    @property
+    def messages(self) -> List[Message]:
+        """Snapshot of the stored messages, oldest first; assigning calls :meth:`set_messages`."""
+        return self.get_messages()
+
+    @messages.setter
+    def messages(self, messages: List[Message]) -> None:
+        self.set_messages(messages)
 
     def append(self, message: Message) -> None:
         """Add a message to memory and evict old messages if needed.
@@ -96,44 +145,85 @@ class ShortTermMemory(BaseShortTermMemory):
         Args:
             message (Message): The message to add to memory.
         """
-        if not message.id:
-            message.id = str(uuid.uuid4())
+        self.extend([message])
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        """Add messages to memory in one atomic step, then evict if needed.
 
-        self.messages.append(message)
-        MemoryLogger.log_add(message, destination="stm")
-        self._evict_if_needed()
+        Concurrent writers cannot interleave their messages between these, so
+        a user message and its reply stay adjacent.
+
+        Args:
+            messages (Iterable[Message]): The messages to add, in order.
+        """
+        messages = list(messages)
+        for message in messages:
+            if not message.id:
+                message.id = str(uuid.uuid4())
+        counts = [message.estimated_token_length() for message in messages]
+
+        with self._lock:
+            self._messages.extend(messages)
+            self._token_counts.extend(counts)
+            self._tokens += sum(counts)
+            with metrics.timer("neurotrace_stm_evict_seconds"):
+                evicted = self._evict_if_needed()
+            total = self._tokens
+
+        for message in messages:
+            MemoryLogger.log_add(message, destination="stm")
+        metrics.inc("neurotrace_stm_appends_total", len(messages))
+        self._record_evictions(evicted, total)
 
     def get_messages(self) -> List[Message]:
         """Get all messages currently in memory.
 
         Returns:
-            List[Message]: List of all stored messages.
+            List[Message]: A snapshot copy of the stored messages; later writes
+                do not change it.
         """
-        return self.messages
+        with self._lock:
+            return list(self._messages)
 
     def clear(self) -> None:
         """Remove all messages from memory."""
-        self.messages = []
+        with self._lock:
+            self._messages.clear()
+            self._token_counts.clear()
+            self._tokens = 0
 
-    def _evict_if_needed(self) -> None:
+    def _evict_if_needed(self) -> List[Message]:
         """Maintain token limit by removing oldest messages.
 
         If max_tokens is 0, clears all messages. Otherwise, removes oldest
         messages until total token count is within limit, always keeping at
-        least one message.
+        least one message. Must be called with the lock held.
+
+        Returns:
+            List[Message]: The evicted messages, oldest first.
         """
         # If max_tokens is 0, clear everything (user wants no memory)
         if self.max_tokens == 0:
-            self.messages.clear()
-            return
-
-        total = sum(msg.estimated_token_length() for msg in self.messages)
+            evicted = list(self._messages)
+            self._messages.clear()
+            self._token_counts.clear()
+            self._tokens = 0
+            return evicted
 
         # Keep at least 1 message even if over limit (unless max_tokens is zero)
-        while total > self.max_tokens and len(self.messages) > 1:
-            evicted = self.messages.pop(0)
-            total -= evicted.estimated_token_length()
-            MemoryLogger.log_evict(evicted)
+        evicted = []
+        while self._tokens > self.max_tokens and len(self._messages) > 1:
+            evicted.append(self._messages.popleft())
+            self._tokens -= self._token_counts.popleft()
+        return evicted
+
+    @staticmethod
+    def _record_evictions(evicted: List[Message], total: int) -> None:
+        for message in evicted:
+            MemoryLogger.log_evict(message)
+        if evicted:
+            metrics.inc("neurotrace_stm_evictions_total", len(evicted))
+        metrics.observe("neurotrace_stm_tokens", total)
 
     def set_messages(self, messages: List[Message]) -> None:
         """Replace current messages with new list and maintain token limit.
@@ -141,16 +231,23 @@ class ShortTermMemory(BaseShortTermMemory):
         Args:
             messages (List[Message]): New messages to store in memory.
         """
-        self.messages = messages
-        self._evict_if_needed()
+        counts = [message.estimated_token_length() for message in messages]
+        with self._lock:
+            self._messages = deque(messages)
+            self._token_counts = deque(counts)
+            self._tokens = sum(counts)
+            evicted = self._evict_if_needed()
+            total = self._tokens
+        self._record_evictions(evicted, total)
 
     def total_tokens(self) -> int:
         """Calculate total tokens used by all messages.
 
         Returns:
-            int: Sum of estimated token lengths across all messages.
+            int: Sum of estimated token lengths across all messages, kept as a
+                running total rather than recomputed.
         """
-        return sum(m.estimated_token_length() for m in self.messages)
+        return self._tokens
 
     def __len__(self):
         """Get number of messages in memory.
@@ -158,7 +255,7 @@ class ShortTermMemory(BaseShortTermMemory):
         Returns:
             int: Count of stored messages.
         """
-        return len(self.messages)
+        return len(self._messages)
 
     def __repr__(self):
         """Get string representation of memory state.
@@ -166,4 +263,5 @@ class ShortTermMemory(BaseShortTermMemory):
         Returns:
             str: String showing message count and token usage/limit.
         """
-        return f"<STM messages={len(self.messages)} tokens={self.total_tokens()}/{self.max_tokens}>"
+        with self._lock:
+            return f"<STM messages={len(self._messages)} tokens={self._tokens}/{self.max_tokens}>"
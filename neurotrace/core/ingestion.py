@@ -0,0 +1,280 @@
+"""
+Ingestion Pipeline Module.
+
+This module provides a streaming pipeline for backfilling historical transcripts
+into neurotrace. Messages are consumed lazily from any iterable, grouped into
+chunks and pushed through token counting, STM/LTM writes, summarisation (one LLM
+call per chunk returning the vector summary and the triplets), embedding, vector
+upsert, fallback triplet extraction and graph insertion. Every stage has
+its own concurrency limit and batch size, and progress is checkpointed after each
+window so an interrupted backfill resumes where it stopped. Replaying an
+interrupted window does not duplicate anything: STM/LTM writes are checkpointed
+on their own, vector memories get ids derived from their chunk, and graph writes
+are merges.
+"""
+
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+from neurotrace.core import metrics
+from neurotrace.core.checkpoint import JsonCheckpoint
+from neurotrace.core.constants import Role
+from neurotrace.core.hippocampus.memory_orchestrator import MemoryOrchestrator
+from neurotrace.core.llm_tasks import get_vector_summary_and_triplets
+from neurotrace.core.memory import NeurotraceMemory
+from neurotrace.core.schema import Message, MessageMetadata
+from neurotrace.neurotrace_logging.logger_factory import get_logger
+
+logger = get_logger("neurotrace.ingestion")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_MEMORY_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "neurotrace/ingestion")
+
+
+@dataclass
+class StageConfig:
+    """Concurrency and batching for one pipeline stage.
+
+    Attributes:
+        concurrency (int): Maximum number of batches processed at the same time.
+        batch_size (int): Number of items handed to the stage function per call.
+    """
+
+    concurrency: int = 1
+    batch_size: int = 1
+
+
+@dataclass
+class IngestionReport:
+    """Counters describing one pipeline run.
+
+    Attributes:
+        messages (int): Messages processed in this run.
+        skipped (int): Messages skipped because the checkpoint showed them as done.
+        chunks (int): Chunks summarised.
+        tokens (int): Estimated tokens across processed messages.
+        vectors (int): Vector memories written.
+        triplets (int): Graph triplets inserted.
+    """
+
+    messages: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    tokens: int = 0
+    vectors: int = 0
+    triplets: int = 0
+
+
+@dataclass
+class _Chunk:
+    start: int
+    messages: List[Message]
+    vector_summary: Optional[str] = None
+    extraction_text: Optional[str] = None
+    triplets: List[list] = field(default_factory=list)
+    memory: Optional[Message] = None
+
+
+def _batched(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _run_stage(stage: StageConfig, fn: Callable[[Sequence[T]], List[R]], items: Sequence[T]) -> List[R]:
+    """Run ``fn`` over ``items`` in batches with at most ``stage.concurrency`` in flight.
+
+    Results are returned in input order.
+    """
+    batches = list(_batched(items, max(stage.batch_size, 1)))
+    if stage.concurrency <= 1 or len(batches) <= 1:
+        return [result for batch in batches for result in fn(batch)]
+    with ThreadPoolExecutor(max_workers=stage.concurrency) as executor:
+        return [result for batch_results in executor.map(fn, batches) for result in batch_results]
+
+
+class IngestionPipeline:
+    """Streaming, checkpointed backfill of transcripts into neurotrace memory.
+
+    Messages are read from the input iterable ``window_size * chunk_size`` at a
+    time, so arbitrarily large archives can be streamed from a generator. Each
+    window goes through the stages in order; within a stage, batches run
+    concurrently up to the stage's limit. The checkpoint is advanced once a
+    window has been fully written.
+
+    Args:
+        memory_orchestrator (MemoryOrchestrator): Provides the LLM, vector memory and
+            graph memory to write to.
+        memory (NeurotraceMemory, optional): If given, every message is also
+            appended to its STM and, when enabled, LTM. Defaults to None.
+        checkpoint_path (str, optional): Where to record progress. Defaults to None
+            (no checkpointing).
+        chunk_size (int, optional): Consecutive messages summarised together.
+            Defaults to 10.
+        window_size (int, optional): Chunks held in memory between checkpoints.
+            Defaults to 16.
+        tags (List[str], optional): Tags attached to the stored vector memories and
+            graph relations. Defaults to ``["ingested"]``.
+        summarise (StageConfig, optional): Summarisation stage. Defaults to 4 workers.
+        embed (StageConfig, optional): Embedding stage. Defaults to 2 workers,
+            batches of 64.
+        upsert (StageConfig, optional): Vector upsert stage. Defaults to one
+            writer, batches of 256.
+        extract (StageConfig, optional): Fallback triplet extraction for chunks whose
+            summary could not be parsed. Defaults to 4 workers.
+        graph (StageConfig, optional): Graph insert stage. Defaults to one writer,
+            batches of 256 triplets.
+    """
+
+    def __init__(
+        self,
+        memory_orchestrator: MemoryOrchestrator,
+        memory: Optional[NeurotraceMemory] = None,
+        checkpoint_path: Optional[str] = None,
+        chunk_size: int = 10,
+        window_size: int = 16,
+        tags: Optional[List[str]] = None,
+        summarise: Optional[StageConfig] = None,
+        embed: Optional[StageConfig] = None,
+        upsert: Optional[StageConfig] = None,
+        extract: Optional[StageConfig] = None,
+        graph: Optional[StageConfig] = None,
+    ):
+        self.orchestrator = memory_orchestrator
+        self.memory = memory
+        self.checkpoint = JsonCheckpoint(checkpoint_path)
+        self.chunk_size = chunk_size
+        self.window_size = window_size
+        self.tags = tags if tags is not None else ["ingested"]
+        self.summarise = summarise or StageConfig(concurrency=4)
+        self.embed = embed or StageConfig(concurrency=2, batch_size=64)
+        self.upsert = upsert or StageConfig(concurrency=1, batch_size=256)
+        self.extract = extract or StageConfig(concurrency=4)
+        self.graph = graph or StageConfig(concurrency=1, batch_size=256)
+
+    def run(self, messages: Iterable[Message]) -> IngestionReport:
+        """Ingest ``messages``, resuming from the checkpoint if one exists.
+
+        Args:
+            messages (Iterable[Message]): Messages in conversation order. Must yield
+                the same sequence on every run for resumption to be correct.
+
+        Returns:
+            IngestionReport: What this run processed.
+        """
+        report = IngestionReport()
+        state = self.checkpoint.load()
+        done = state.get("messages_done", 0)
+        # Messages of the interrupted window that already reached STM/LTM.
+        written = state.get("conversation_done", 0)
+        stream = iter(messages)
+        if done:
+            report.skipped = sum(1 for _ in islice(stream, done))
+            logger.info("Resuming ingestion after %d messages", report.skipped)
+
+        window_messages = self.window_size * self.chunk_size
+        while True:
+            window = list(islice(stream, window_messages))
+            if not window:
+                break
+            self._process_window(window, done, written, report)
+            written = 0
+            done += len(window)
+            self.checkpoint.save({"messages_done": done})
+            logger.info("Ingested %d messages (%d vectors, %d triplets)", done, report.vectors, report.triplets)
+
+        return report
+
+    # ----------------------------------------------------------------- stages
+
+    def _process_window(self, window: List[Message], start: int, written: int, report: IngestionReport) -> None:
+        self._count_tokens(window, report)
+        if self.memory is not None and written < len(window):
+            self._write_conversation(window[written:])
+            self.checkpoint.save({"messages_done": start, "conversation_done": len(window)})
+
+        chunks = [
+            _Chunk(start=start + offset, messages=list(window[offset : offset + self.chunk_size]))
+            for offset in range(0, len(window), self.chunk_size)
+        ]
+        _run_stage(self.summarise, self._summarise_batch, chunks)
+        report.chunks += len(chunks)
+
+        memories = [self._to_memory(chunk) for chunk in chunks if chunk.vector_summary]
+        if hasattr(self.orchestrator.vector_memory_adapter.vector_store, "add_embeddings"):
+            _run_stage(self.embed, self._embed_batch, memories)
+        _run_stage(self.upsert, self._upsert_batch, memories)
+        report.vectors += len(memories)
+
+        _run_stage(self.extract, self._extract_batch, [chunk for chunk in chunks if chunk.extraction_text])
+        triplets = [triplet for chunk in chunks for triplet in chunk.triplets]
+        _run_stage(self.graph, self._insert_batch, triplets)
+        report.triplets += len(triplets)
+        report.messages += len(window)
+
+    def _count_tokens(self, window: List[Message], report: IngestionReport) -> None:
+        for msg in window:
+            if msg.metadata.token_count is None:
+                msg.metadata.token_count = msg.estimated_token_length()
+            report.tokens += msg.metadata.token_count
+
+    def _write_conversation(self, window: List[Message]) -> None:
+        # STM/LTM keep conversation order, so this stage is always sequential.
+        self.memory.add_messages(window)
+
+    def _summarise_batch(self, chunks: Sequence[_Chunk]) -> List[_Chunk]:
+        for chunk in chunks:
+            text = "\n".join(f"{msg.role}: {msg.content}" for msg in chunk.messages)
+            result = get_vector_summary_and_triplets(self.orchestrator.llm, text)
+            if result:
+                chunk.vector_summary, chunk.triplets = result["vector_summary"], result["triplets"]
+            else:
+                # Unparseable response: store the raw transcript and extract triplets separately.
+                chunk.vector_summary, chunk.extraction_text = text, text
+        return list(chunks)
+
+    @staticmethod
+    def _memory_id(chunk: _Chunk) -> str:
+        # Derived from the chunk's position and text rather than the source message ids, which
+        # a transcript generator may mint afresh on every run.
+        key = json.dumps([chunk.start, [[msg.metadata.session_id, msg.role, msg.content] for msg in chunk.messages]])
+        return str(uuid.uuid5(_MEMORY_ID_NAMESPACE, key))
+
+    def _to_memory(self, chunk: _Chunk) -> Message:
+        chunk.memory = Message(
+            id=self._memory_id(chunk),
+            role=Role.AI.value,
+            content=chunk.vector_summary,
+            metadata=MessageMetadata(
+                tags=self.tags,
+                session_id=chunk.messages[0].metadata.session_id,
+                related_ids=[msg.id for msg in chunk.messages],
+            ),
+        )
+        return chunk.memory
+
+    def _embed_batch(self, memories: Sequence[Message]) -> List[Message]:
+        embedding_model = self.orchestrator.vector_memory_adapter.embedding_model
+        with metrics.timer("neurotrace_embedding_seconds"):
+            vectors = embedding_model.embed_documents([memory.content for memory in memories])
+        for memory, vector in zip(memories, vectors):
+            memory.metadata.embedding = vector
+        return list(memories)
+
+    def _upsert_batch(self, memories: Sequence[Message]) -> List[Message]:
+        self.orchestrator.vector_memory_adapter.add_messages(list(memories))
+        return list(memories)
+
+    def _extract_batch(self, chunks: Sequence[_Chunk]) -> List[_Chunk]:
+        for chunk in chunks:
+            chunk.triplets = self.orchestrator.graph_indexer.extract(chunk.extraction_text)
+        return list(chunks)
+
+    def _insert_batch(self, triplets: Sequence[list]) -> List[list]:
+        self.orchestrator.graph_memory_adapter.add_triplets(list(triplets), sender="user", tags=self.tags)
+        return list(triplets)
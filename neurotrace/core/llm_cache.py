@@ -0,0 +1,217 @@
+"""
+LLM Response Cache Module.
+
+This module provides an opt-in cache for neurotrace's LLM tasks. Responses are
+keyed by a hash of the prompt template, the placeholder values and the model id,
+and kept in an in-memory LRU backed by an optional local SQLite file so replays
+and repeated summaries survive restarts.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for an :class:`LLMResponseCache`.
+
+    Attributes:
+        hits (int): Lookups answered from memory or disk.
+        disk_hits (int): The subset of ``hits`` answered from SQLite.
+        misses (int): Lookups that had to call the LLM.
+    """
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LLMResponseCache:
+    """Two-tier prompt/response cache with TTL.
+
+    Expired SQLite rows are deleted when they are read and by
+    :meth:`purge_expired`, which also runs when the file is opened.
+
+    Args:
+        max_entries (int, optional): Size of the in-memory LRU. Defaults to 1024.
+        ttl (float, optional): Seconds after which an entry expires. None keeps
+            entries forever. Defaults to None.
+        path (Union[str, Path], optional): SQLite file for the persistent tier.
+            None keeps the cache in memory only. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL)"
+            )
+            self._db.commit()
+            self.purge_expired()
+
+    @staticmethod
+    def make_key(template: str, placeholders: Dict[str, Any], model: str) -> str:
+        """
+        Build the cache key for one LLM task call.
+
+        Args:
+            template (str): The prompt template text.
+            placeholders (Dict[str, Any]): Values used to fill the template.
+            model (str): Model id, see :func:`neurotrace.core.llm_dispatcher.model_id`.
+
+        Returns:
+            str: A hex digest identifying the call.
+        """
+        template_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()
+        payload = json.dumps([template_hash, placeholders, model], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached response for ``key``, or None on a miss.
+
+        Args:
+            key (str): Key from :meth:`make_key`.
+
+        Returns:
+            Optional[str]: The cached response.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[1]):
+                self._memory.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]
+            self._memory.pop(key, None)
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and not self._expired(row[1]):
+                    self._remember(key, row[0], row[1])
+                    self.stats.hits += 1
+                    self.stats.disk_hits += 1
+                    return row[0]
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.stats.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store ``value`` under ``key`` in both tiers.
+
+        Args:
+            key (str): Key from :meth:`make_key`.
+            value (str): The LLM response.
+        """
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, value, created_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, created_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries from both tiers.
+
+        Returns:
+            int: Number of SQLite rows deleted.
+        """
+        if self.ttl is None:
+            return 0
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for key in [key for key, (_, created_at) in self._memory.items() if created_at < cutoff]:
+                del self._memory[key]
+            if self._db is None:
+                return 0
+            deleted = self._db.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,)).rowcount
+            self._db.commit()
+            return deleted
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers and reset the stats."""
+        with self._lock:
+            self._memory.clear()
+            self.stats = CacheStats()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the SQLite connection, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the cache used by neurotrace's LLM tasks, or None if caching is off."""
+    return _cache
+
+
+def enable_llm_cache(**kwargs: Any) -> LLMResponseCache:
+    """
+    Turn on response caching for neurotrace's LLM tasks.
+
+    Args:
+        **kwargs: Arguments for :class:`LLMResponseCache`.
+
+    Returns:
+        LLMResponseCache: The new cache.
+    """
+    global _cache
+    disable_llm_cache()
+    _cache = LLMResponseCache(**kwargs)
+    return _cache
+
+
+def disable_llm_cache() -> None:
+    """Turn off response caching and close the current cache."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
@@ -0,0 +1,454 @@
+"""
+LLM Dispatcher Module.
+
+This module provides a shared dispatcher for the LLM calls neurotrace makes on
+its own behalf (summarisation, triplet extraction, memory tools). Identical
+prompts that are already in flight are coalesced into one call, concurrent
+prompts to the same model can be micro-batched through ``llm.batch`` /
+``llm.abatch``, and every model gets its own concurrency and request-rate
+limits so bursts from many sessions do not turn into rate-limit errors.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from neurotrace.neurotrace_logging.logger_factory import get_logger
+
+logger = get_logger("neurotrace.llm_dispatcher")
+
+
+def model_id(llm: Any) -> str:
+    """Name used to share limits between LLM objects that talk to the same model."""
+    return str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__)
+
+
+def _to_text(response: Any) -> str:
+    """Return the text of a chat message or plain LLM response."""
+    return str(getattr(response, "content", response)).strip()
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Return the text of a streamed chunk without stripping whitespace."""
+    return str(getattr(chunk, "content", chunk))
+
+
+class _ModelLimiter:
+    """Concurrency slots plus token bucket for one model.
+
+    Slots are handed to waiters in arrival order. A waiting thread blocks on a
+    ``threading.Event`` and a waiting coroutine awaits a future on its own loop,
+    so the same limiter serves sync and async callers. The bucket only computes
+    how long a caller has to wait (``time.sleep`` or ``asyncio.sleep``).
+    """
+
+    def __init__(self, max_concurrency: Optional[int], requests_per_second: Optional[float]):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self._active = 0
+        self._waiters: Deque[Union[threading.Event, asyncio.Future]] = deque()
+        self._capacity = max(requests_per_second or 0.0, 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, n: int) -> float:
+        """Take ``n`` request tokens and return the delay before they are available."""
+        if not self.requests_per_second:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self.requests_per_second)
+            self._updated = now
+            self._tokens -= n
+            return max(-self._tokens / self.requests_per_second, 0.0)
+
+    def _take_slot(self, waiter: Union[threading.Event, asyncio.Future]) -> bool:
+        """Take a free slot, or queue ``waiter`` and return False. Call with the lock held."""
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            return True
+        self._waiters.append(waiter)
+        return False
+
+    def acquire(self, n: int = 1) -> None:
+        if self.max_concurrency:
+            event = threading.Event()
+            with self._lock:
+                queued = not self._take_slot(event)
+            if queued:
+                event.wait()
+        delay = self._reserve(n)
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self, n: int = 1) -> None:
+        if self.max_concurrency:
+            waiter = asyncio.get_running_loop().create_future()
+            with self._lock:
+                queued = not self._take_slot(waiter)
+            if queued:
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    with self._lock:
+                        if waiter in self._waiters:
+                            self._waiters.remove(waiter)
+                            raise
+                    if not waiter.cancelled():
+                        self.release()  # the slot was handed over just before the cancellation
+                    raise
+        delay = self._reserve(n)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def release(self) -> None:
+        if not self.max_concurrency:
+            return
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            # The slot passes straight to the next waiter, so the active count is unchanged.
+            waiter = self._waiters.popleft()
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+        else:
+            waiter.get_loop().call_soon_threadsafe(self._hand_over, waiter)
+
+    def _hand_over(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            self.release()  # cancelled while the slot was on its way
+        else:
+            waiter.set_result(None)
+
+
+@dataclass
+class _PendingBatch:
+    prompts: List[str] = field(default_factory=list)
+    futures: List[Any] = field(default_factory=list)
+    full: Any = None
+
+
+class LLMDispatcher:
+    """Coalesces, batches and rate-limits LLM calls.
+
+    Args:
+        max_concurrency (int, optional): Default limit on in-flight calls per model.
+            A micro-batch counts as one call. None disables the limit. Defaults to None.
+        requests_per_second (float, optional): Default request rate per model; a
+            batch of ``n`` prompts counts as ``n`` requests. None disables rate
+            limiting. Defaults to None.
+        batch_window (float, optional): Seconds to wait for more prompts to the same
+            LLM before sending them together with ``llm.batch``. 0 sends every
+            prompt on its own with ``llm.invoke``. Defaults to 0.
+        max_batch_size (int, optional): A pending batch is sent as soon as it holds
+            this many prompts. Defaults to 16.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        batch_window: float = 0.0,
+        max_batch_size: int = 16,
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+        self._ainflight: Dict[Hashable, asyncio.Task] = {}
+        self._apending: Dict[Hashable, _PendingBatch] = {}
+        self._acallers: Dict[asyncio.Task, int] = {}
+        self._atasks: Set[asyncio.Task] = set()
+
+    def set_limits(
+        self, model: str, max_concurrency: Optional[int] = None, requests_per_second: Optional[float] = None
+    ) -> None:
+        """
+        Override the concurrency and rate limits for one model.
+
+        Args:
+            model (str): Model name as reported by the LLM's ``model_name`` or
+                ``model`` attribute, or its class name.
+            max_concurrency (int, optional): In-flight call limit. None disables it.
+            requests_per_second (float, optional): Request rate. None disables it.
+        """
+        with self._lock:
+            self._limiters[model] = _ModelLimiter(max_concurrency, requests_per_second)
+
+    def _limiter(self, llm: Any) -> _ModelLimiter:
+        model = model_id(llm)
+        with self._lock:
+            if model not in self._limiters:
+                self._limiters[model] = _ModelLimiter(self.max_concurrency, self.requests_per_second)
+            return self._limiters[model]
+
+    # ------------------------------------------------------------------- sync
+
+    def invoke(self, llm: Any, prompt: str) -> str:
+        """
+        Run ``prompt`` on ``llm`` and return the response text.
+
+        If the same prompt is already in flight on the same LLM, waits for that
+        call instead of making a new one.
+
+        Args:
+            llm (Any): A LangChain LLM or chat model.
+            prompt (str): The fully formatted prompt.
+
+        Returns:
+            str: The stripped response text.
+        """
+        key = (id(llm), prompt)
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            if self.batch_window > 0:
+                future.set_result(self._batched_invoke(llm, prompt))
+            else:
+                future.set_result(self._call(llm, prompt))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return future.result()
+
+    def _call(self, llm: Any, prompt: str) -> str:
+        limiter = self._limiter(llm)
+        limiter.acquire()
+        try:
+            return _to_text(llm.invoke(prompt))
+        finally:
+            limiter.release()
+
+    def _batched_invoke(self, llm: Any, prompt: str) -> str:
+        future: Future = Future()
+        with self._lock:
+            batch = self._pending.get(id(llm))
+            leader = batch is None
+            if leader:
+                batch = self._pending[id(llm)] = _PendingBatch(full=threading.Event())
+            batch.prompts.append(prompt)
+            batch.futures.append(future)
+            if len(batch.prompts) >= self.max_batch_size:
+                batch.full.set()
+                self._pending.pop(id(llm), None)
+
+        if leader:
+            batch.full.wait(self.batch_window)
+            with self._lock:
+                if self._pending.get(id(llm)) is batch:
+                    del self._pending[id(llm)]
+            self._send_batch(llm, batch)
+        return future.result()
+
+    def _send_batch(self, llm: Any, batch: _PendingBatch) -> None:
+        limiter = self._limiter(llm)
+        limiter.acquire(len(batch.prompts))
+        try:
+            responses = llm.batch(batch.prompts, return_exceptions=True)
+        except BaseException as e:
+            responses = [e] * len(batch.prompts)
+        finally:
+            limiter.release()
+        logger.debug("Sent batch of %d prompts to %s", len(batch.prompts), model_id(llm))
+
+        for future, response in zip(batch.futures, responses):
+            if isinstance(response, BaseException):
+                future.set_exception(response)
+            else:
+                future.set_result(_to_text(response))
+
+    def stream(self, llm: Any, prompt: str) -> Iterator[str]:
+        """
+        Stream the response to ``prompt`` with ``llm.stream``.
+
+        Streams are neither coalesced nor batched, but hold one of the model's
+        concurrency slots until they finish.
+
+        Args:
+            llm (Any): A LangChain LLM or chat model.
+            prompt (str): The fully formatted prompt.
+
+        Yields:
+            str: Response text as it arrives.
+        """
+        limiter = self._limiter(llm)
+        limiter.acquire()
+        try:
+            for chunk in llm.stream(prompt):
+                yield _chunk_text(chunk)
+        finally:
+            limiter.release()
+
+    # ------------------------------------------------------------------ async
+
+    async def ainvoke(self, llm: Any, prompt: str) -> str:
+        """
+        Async counterpart of :meth:`invoke`, using ``llm.ainvoke`` / ``llm.abatch``.
+
+        The call runs in its own task that every caller awaits, so cancelling
+        one caller does not cancel the call for the others. The call is only
+        cancelled once all of its callers are.
+
+        Args:
+            llm (Any): A LangChain LLM or chat model.
+            prompt (str): The fully formatted prompt.
+
+        Returns:
+            str: The stripped response text.
+        """
+        loop = asyncio.get_running_loop()
+        key: Tuple[int, int, str] = (id(loop), id(llm), prompt)
+        task = self._ainflight.get(key)
+        if task is None:
+            task = self._ainflight[key] = loop.create_task(self._ainvoke(llm, prompt))
+            task.add_done_callback(lambda done: self._ainvoke_done(key, done))
+        self._acallers[task] = self._acallers.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._acallers[task] -= 1
+            if not self._acallers[task]:
+                del self._acallers[task]
+                if not task.done():
+                    task.cancel()  # the last caller is gone, nobody needs the result
+
+    def _ainvoke_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._ainflight.get(key) is task:
+            del self._ainflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller was cancelled
+
+    async def _ainvoke(self, llm: Any, prompt: str) -> str:
+        if self.batch_window > 0:
+            return await self._abatched_invoke(llm, prompt)
+        limiter = self._limiter(llm)
+        await limiter.aacquire()
+        try:
+            return _to_text(await llm.ainvoke(prompt))
+        finally:
+            limiter.release()
+
+    async def astream(self, llm: Any, prompt: str) -> AsyncIterator[str]:
+        """
+        Async counterpart of :meth:`stream`, using ``llm.astream``.
+
+        Args:
+            llm (Any): A LangChain LLM or chat model.
+            prompt (str): The fully formatted prompt.
+
+        Yields:
+            str: Response text as it arrives.
+        """
+        limiter = self._limiter(llm)
+        await limiter.aacquire()
+        try:
+            async for chunk in llm.astream(prompt):
+                yield _chunk_text(chunk)
+        finally:
+            limiter.release()
+
+    async def _abatched_invoke(self, llm: Any, prompt: str) -> str:
+        loop = asyncio.get_running_loop()
+        key = (id(loop), id(llm))
+        future = loop.create_future()
+        batch = self._apending.get(key)
+        if batch is None:
+            batch = self._apending[key] = _PendingBatch(full=asyncio.Event())
+            # Sent by a task of its own, so the caller that opened the batch can be cancelled safely.
+            task = loop.create_task(self._aflush(key, llm, batch))
+            self._atasks.add(task)
+            task.add_done_callback(self._atasks.discard)
+        batch.prompts.append(prompt)
+        batch.futures.append(future)
+        if len(batch.prompts) >= self.max_batch_size:
+            batch.full.set()
+            self._apending.pop(key, None)
+        return await future
+
+    async def _aflush(self, key: Hashable, llm: Any, batch: _PendingBatch) -> None:
+        try:
+            try:
+                await asyncio.wait_for(batch.full.wait(), self.batch_window)
+            except asyncio.TimeoutError:
+                pass
+            if self._apending.get(key) is batch:
+                del self._apending[key]
+            await self._asend_batch(llm, batch)
+        finally:
+            if self._apending.get(key) is batch:
+                del self._apending[key]
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(RuntimeError("LLM batch was cancelled before it was sent."))
+
+    async def _asend_batch(self, llm: Any, batch: _PendingBatch) -> None:
+        limiter = self._limiter(llm)
+        await limiter.aacquire(len(batch.prompts))
+        try:
+            responses = await llm.abatch(batch.prompts, return_exceptions=True)
+        except Exception as e:
+            responses = [e] * len(batch.prompts)
+        finally:
+            limiter.release()
+
+        for future, response in zip(batch.futures, responses):
+            if future.done():
+                continue  # its caller was cancelled
+            if isinstance(response, BaseException):
+                future.set_exception(response)
+            else:
+                future.set_result(_to_text(response))
+
+
+_dispatcher = LLMDispatcher()
+
+
+def get_dispatcher() -> LLMDispatcher:
+    """Return the process-wide dispatcher used by neurotrace's LLM tasks."""
+    return _dispatcher
+
+
+def configure_dispatcher(**kwargs: Any) -> LLMDispatcher:
+    """
+    Replace the process-wide dispatcher.
+
+    Args:
+        **kwargs: Arguments for :class:`LLMDispatcher`.
+
+    Returns:
+        LLMDispatcher: The new dispatcher.
+    """
+    global _dispatcher
+    _dispatcher = LLMDispatcher(**kwargs)
+    return _dispatcher
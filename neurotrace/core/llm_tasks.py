@@ -1,34 +1,97 @@
 import json
-from typing import Any, Dict
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
 
-from langchain.llms.base import BaseLLM
-from langchain.prompts.prompt import PromptTemplate
-from langchain_core.messages import AIMessage
+from langchain_core.prompts import PromptTemplate
 
-from neurotrace.core.utils import strip_json_code_block
+from neurotrace.core import metrics
+from neurotrace.core.llm_cache import LLMResponseCache, get_llm_cache
+from neurotrace.core.llm_dispatcher import get_dispatcher, model_id
+from neurotrace.core.utils import (
+    estimate_tokens,
+    safe_json_loads,
+    strip_json_code_block,
+)
 from neurotrace.prompts import task_prompts
 
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseLLM
 
-def _perform_summarisation(llm: BaseLLM, prompt: PromptTemplate, **kwargs) -> str:
+
+def _cached_response(llm: "BaseLLM", prompt: PromptTemplate, placeholders: Dict[str, Any]) -> Optional[str]:
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+    return cache.get(LLMResponseCache.make_key(prompt.template, placeholders, model_id(llm)))
+
+
+def _cache_response(llm: "BaseLLM", prompt: PromptTemplate, placeholders: Dict[str, Any], response: str) -> None:
+    cache = get_llm_cache()
+    if cache is not None:
+        cache.set(LLMResponseCache.make_key(prompt.template, placeholders, model_id(llm)), response.strip())
+
+
+def _record_tokens(llm: "BaseLLM", prompt_text: str, response: str) -> None:
+    if metrics.enabled():
+        model = model_id(llm)
+        metrics.inc("neurotrace_llm_prompt_tokens_total", estimate_tokens(prompt_text), model=model)
+        metrics.inc("neurotrace_llm_response_tokens_total", estimate_tokens(response), model=model)
+
+
+def _record_stream(llm: "BaseLLM", prompt_text: str, chunks: List[str], start: float, first_chunk_at: float) -> None:
+    if metrics.enabled():
+        model = model_id(llm)
+        metrics.observe("neurotrace_llm_stream_seconds", time.perf_counter() - start, model=model)
+        metrics.observe("neurotrace_llm_first_chunk_seconds", first_chunk_at - start, model=model)
+        _record_tokens(llm, prompt_text, "".join(chunks))
+
+
+def _perform_summarisation(
+    llm: "BaseLLM", prompt: PromptTemplate, validate: Optional[Callable[[str], bool]] = None, **kwargs
+) -> str:
     """
     Perform summarisation using the provided LLM and prompt with dynamic inputs.
 
+    The call goes through the shared LLM dispatcher, so identical concurrent
+    prompts are coalesced and per-model limits apply. If the response cache is
+    enabled (see :func:`neurotrace.core.llm_cache.enable_llm_cache`), repeated
+    calls are answered from it.
+
     Args:
         llm (BaseLLM): The language model to use for summarisation.
         prompt (PromptTemplate): The prompt with any number of variables.
+        validate (Callable[[str], bool], optional): The response is only cached
+            if this returns True for it, so a malformed response is retried next
+            time instead of being replayed. Defaults to None (always cache).
         **kwargs: The input variables required to fill the prompt.
 
     Returns:
         str: The summarized or generated output from the LLM.
     """
-    formatted_prompt = prompt.format(**kwargs)
-    response = llm.invoke(formatted_prompt)
-    if isinstance(response, AIMessage):
-        response = response.content.strip()
-    return response.strip()
+    response = _cached_response(llm, prompt, kwargs)
+    if response is not None:
+        metrics.inc("neurotrace_llm_cache_hits_total")
+        return response
+
+    prompt_text = prompt.format(**kwargs)
+    with metrics.timer("neurotrace_llm_call_seconds", model=model_id(llm)):
+        response = get_dispatcher().invoke(llm, prompt_text)
+    _record_tokens(llm, prompt_text, response)
+    if validate is None or validate(response):
+        _cache_response(llm, prompt, kwargs, response)
+    return response
 
 
-def perform_summarisation(llm: BaseLLM, prompt_placeholders: Dict[str, Any], prompt: PromptTemplate = None) -> str:
+def perform_summarisation(llm: "BaseLLM", prompt_placeholders: Dict[str, Any], prompt: PromptTemplate = None) -> str:
     """
     Perform summarisation using the provided LLM and prompt with a single message.
 
@@ -45,7 +108,74 @@ def perform_summarisation(llm: BaseLLM, prompt_placeholders: Dict[str, Any], pro
     return _perform_summarisation(llm=llm, prompt=prompt, **prompt_placeholders)
 
 
-def get_graph_summary(llm: BaseLLM, text: str) -> str:
+def stream_summarisation(
+    llm: "BaseLLM", prompt_placeholders: Dict[str, Any], prompt: PromptTemplate = None
+) -> Iterator[str]:
+    """
+    Streaming variant of :func:`perform_summarisation` built on ``llm.stream``.
+
+    Args:
+        llm (BaseLLM): The language model to use for summarisation.
+        prompt_placeholders (Dict[str, Any]): The input variables required to fill the prompt.
+        prompt (PromptTemplate, optional): The prompt to use. Defaults to PROMPT_GENERAL_SUMMARY.
+
+    Yields:
+        str: Chunks of the summary as the LLM produces them. A cached response is
+            yielded as a single chunk.
+    """
+    prompt = prompt or task_prompts.PROMPT_GENERAL_SUMMARY
+    cached = _cached_response(llm, prompt, prompt_placeholders)
+    if cached is not None:
+        metrics.inc("neurotrace_llm_cache_hits_total")
+        yield cached
+        return
+
+    prompt_text = prompt.format(**prompt_placeholders)
+    chunks = []
+    start = first_chunk_at = time.perf_counter()
+    for chunk in get_dispatcher().stream(llm, prompt_text):
+        if not chunks:
+            first_chunk_at = time.perf_counter()
+        chunks.append(chunk)
+        yield chunk
+    _record_stream(llm, prompt_text, chunks, start, first_chunk_at)
+    _cache_response(llm, prompt, prompt_placeholders, "".join(chunks))
+
+
+async def astream_summarisation(
+    llm: "BaseLLM", prompt_placeholders: Dict[str, Any], prompt: PromptTemplate = None
+) -> AsyncIterator[str]:
+    """
+    Async variant of :func:`stream_summarisation` built on ``llm.astream``.
+
+    Args:
+        llm (BaseLLM): The language model to use for summarisation.
+        prompt_placeholders (Dict[str, Any]): The input variables required to fill the prompt.
+        prompt (PromptTemplate, optional): The prompt to use. Defaults to PROMPT_GENERAL_SUMMARY.
+
+    Yields:
+        str: Chunks of the summary as the LLM produces them.
+    """
+    prompt = prompt or task_prompts.PROMPT_GENERAL_SUMMARY
+    cached = _cached_response(llm, prompt, prompt_placeholders)
+    if cached is not None:
+        metrics.inc("neurotrace_llm_cache_hits_total")
+        yield cached
+        return
+
+    prompt_text = prompt.format(**prompt_placeholders)
+    chunks = []
+    start = first_chunk_at = time.perf_counter()
+    async for chunk in get_dispatcher().astream(llm, prompt_text):
+        if not chunks:
+            first_chunk_at = time.perf_counter()
+        chunks.append(chunk)
+        yield chunk
+    _record_stream(llm, prompt_text, chunks, start, first_chunk_at)
+    _cache_response(llm, prompt, prompt_placeholders, "".join(chunks))
+
+
+def get_graph_summary(llm: "BaseLLM", text: str) -> str:
     """
     Get a graph summary from the LLM.
 
@@ -61,7 +191,7 @@ def get_graph_summary(llm: BaseLLM, text: str) -> str:
     return response
 
 
-def get_vector_and_graph_summary(llm: BaseLLM, text: str) -> Dict[str, str]:
+def get_vector_and_graph_summary(llm: "BaseLLM", text: str) -> Dict[str, str]:
     """
     Get vector and graph summaries from the LLM.
 
@@ -72,9 +202,86 @@ def get_vector_and_graph_summary(llm: BaseLLM, text: str) -> Dict[str, str]:
     Returns:
         Tuple[str, str]: A tuple containing the vector summary and graph summary.
     """
-    response = _perform_summarisation(llm=llm, prompt=task_prompts.PROMPT_VECTOR_AND_GRAPH_SUMMARY, message=text)
-    response = strip_json_code_block(response)
+    response = _perform_summarisation(
+        llm=llm,
+        prompt=task_prompts.PROMPT_VECTOR_AND_GRAPH_SUMMARY,
+        validate=lambda r: bool(_parse_vector_and_graph_summary(r)),
+        message=text,
+    )
+    return _parse_vector_and_graph_summary(response)
+
+
+def _parse_vector_and_graph_summary(response: str) -> Dict[str, str]:
+    try:
+        return json.loads(strip_json_code_block(response))
+    except json.decoder.JSONDecodeError:
+        return {}
+
+
+def get_vector_summary_and_triplets(llm: "BaseLLM", text: str) -> Dict[str, Any]:
+    """
+    Get a vector summary and graph triplets from a single LLM call.
+
+    Args:
+        llm (BaseLLM): The language model to use.
+        text (str): The input text to summarise and index.
+
+    Returns:
+        Dict[str, Any]: ``{"vector_summary": str, "triplets": List[List[str]]}`` with
+            triplets lower-cased and malformed entries dropped, or an empty dict if
+            the response could not be parsed.
+    """
+    response = _perform_summarisation(
+        llm=llm,
+        prompt=task_prompts.PROMPT_VECTOR_SUMMARY_AND_TRIPLETS,
+        validate=lambda r: bool(_parse_summary_and_triplets(r)),
+        message=text,
+    )
+    return _parse_summary_and_triplets(response)
+
+
+def _parse_summary_and_triplets(response: str) -> Dict[str, Any]:
     try:
-        return json.loads(response)
+        parsed = json.loads(strip_json_code_block(response))
     except json.decoder.JSONDecodeError:
         return {}
+    if not isinstance(parsed, dict) or not parsed.get("vector_summary"):
+        return {}
+
+    triplets: List[List[str]] = [
+        [str(part).strip().lower() for part in triplet]
+        for triplet in parsed.get("triplets") or []
+        if isinstance(triplet, (list, tuple)) and len(triplet) == 3
+    ]
+    return {"vector_summary": str(parsed["vector_summary"]).strip(), "triplets": triplets}
+
+
+def get_query_rewrites(llm: "BaseLLM", query: str, variants: int = 3) -> List[str]:
+    """
+    Ask the LLM for alternative phrasings of a search query.
+
+    Args:
+        llm (BaseLLM): The language model to use.
+        query (str): The search query.
+        variants (int, optional): Number of rewrites to ask for. Defaults to 3.
+
+    Returns:
+        List[str]: Up to ``variants`` distinct, non-empty rewrites, or an empty
+            list if the response could not be parsed.
+    """
+    response = _perform_summarisation(
+        llm=llm,
+        prompt=task_prompts.PROMPT_QUERY_REWRITE,
+        validate=lambda r: bool(_parse_query_rewrites(r, variants)),
+        query=query,
+        variants=variants,
+    )
+    return _parse_query_rewrites(response, variants)
+
+
+def _parse_query_rewrites(response: str, variants: int) -> List[str]:
+    parsed = safe_json_loads(strip_json_code_block(response), return_type=list)
+    if not isinstance(parsed, list):
+        return []
+    rewrites = list(dict.fromkeys(str(item).strip() for item in parsed if isinstance(item, str) and item.strip()))
+    return rewrites[:variants]
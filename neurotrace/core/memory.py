@@ -1,17 +1,21 @@
-from typing import Any, Dict, List, Union
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
-from langchain.llms.base import BaseLLM
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_core.language_models import BaseChatModel
 from langchain_core.memory import BaseMemory
 from langchain_core.messages import BaseMessage
 from pydantic import ConfigDict
 
 from neurotrace.core.constants import Role
+from neurotrace.core.context_builder import ContextBuilder
 from neurotrace.core.hippocampus.ltm import LongTermMemory
 from neurotrace.core.hippocampus.stm import ShortTermMemory
+from neurotrace.core.prefetch import MemoryPrefetcher
 from neurotrace.core.schema import Message, MessageMetadata
 
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel, BaseLLM
+
 
 class NeurotraceMemory(BaseMemory):
     """A LangChain-compatible memory implementation using a hybrid memory system.
@@ -20,6 +24,11 @@ class NeurotraceMemory(BaseMemory):
     optional long-term memory (LTM) capabilities. It wraps the ShortTermMemory
     component and integrates with LangChain's memory interface.
 
+    One instance can serve concurrent requests for its session: each
+    ``save_context`` turn is written atomically, long-term memory receives
+    turns in the same order as short-term memory, and ``load_memory_variables``
+    works on a consistent snapshot of short-term memory.
+
     Attributes:
         session_id (str): Unique identifier for the current chat session.
         _stm (ShortTermMemory): Short-term memory component with token limit.
@@ -31,6 +40,12 @@ class NeurotraceMemory(BaseMemory):
         history (BaseChatMessageHistory, optional): LangChain chat history for long-term
             storage. If provided, enables long-term memory. Defaults to None.
         session_id (str, optional): Identifier for the chat session. Defaults to "default".
+        context_builder (ContextBuilder, optional): If provided, ``chat_history`` is
+            trimmed to the builder's token budget and a ``long_term_context`` variable
+            with relevant vector and graph memory is added. Defaults to None.
+        prefetcher (MemoryPrefetcher, optional): If provided, each user input starts
+            long-term retrieval in the background as soon as it is loaded, for a
+            ``memory_search_tool`` sharing the prefetcher to pick up. Defaults to None.
     """
 
     model_config = ConfigDict(
@@ -40,40 +55,62 @@ class NeurotraceMemory(BaseMemory):
 
     def __init__(
         self,
-        llm: Union[BaseLLM, BaseChatModel],
+        llm: Union["BaseLLM", "BaseChatModel"],
         session_id: str = "default",
         max_tokens: int = 2048,
         history: BaseChatMessageHistory = None,
+        context_builder: Optional[ContextBuilder] = None,
+        prefetcher: Optional[MemoryPrefetcher] = None,
     ):
         super().__init__()
         self.llm = llm
         self.session_id = session_id
+        self.context_builder = context_builder
+        self.prefetcher = prefetcher
         self._stm = ShortTermMemory(max_tokens=max_tokens)
         self._ltm = LongTermMemory(history, session_id=session_id) if history else None
+        # Held across both writes so that long-term memory sees turns in short-term memory order.
+        self._write_lock = threading.Lock()
 
     @property
     def memory_variables(self) -> List[str]:
         """Gets the list of memory variables used by this memory component.
 
         Returns:
-            List[str]: List containing "chat_history" as the only memory variable.
+            List[str]: ``["chat_history"]``, plus ``"long_term_context"`` when a
+                context builder is configured.
         """
+        if self.context_builder is not None:
+            return ["chat_history", "long_term_context"]
         return ["chat_history"]
 
-    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, List[BaseMessage]]:
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Union[List[BaseMessage], str]]:
         """Retrieves the current memory state as LangChain messages.
 
         Converts all messages in short-term memory to LangChain's message format
-        for compatibility with the LangChain framework.
+        for compatibility with the LangChain framework. With a context builder,
+        the messages and long-term context are selected to fit its token budget,
+        using ``inputs["input"]`` as the retrieval query.
 
         Args:
-            inputs (Dict[str, Any]): Input variables (unused in this implementation).
+            inputs (Dict[str, Any]): Input variables.
 
         Returns:
-            Dict[str, List[BaseMessage]]: Dictionary with "chat_history" key containing
-                the list of messages in LangChain format.
+            Dict[str, Union[List[BaseMessage], str]]: Dictionary with "chat_history" key containing
+                the list of messages in LangChain format, and "long_term_context" when
+                a context builder is configured.
         """
-        return {"chat_history": [msg.to_langchain_message() for msg in self._stm.get_messages()]}
+        if self.prefetcher is not None:
+            self.prefetcher.prefetch(inputs.get("input"))
+
+        if self.context_builder is None:
+            return {"chat_history": [msg.to_langchain_message() for msg in self._stm.get_messages()]}
+
+        context = self.context_builder.build(inputs.get("input"), self._stm.get_messages())
+        return {
+            "chat_history": [msg.to_langchain_message() for msg in context.stm],
+            "long_term_context": context.format_long_term(),
+        }
 
     def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, Any]) -> None:
         """Saves the conversation context to both short-term and long-term memory.
@@ -104,13 +141,51 @@ class NeurotraceMemory(BaseMemory):
             ),
         )
 
-        # Save in short-term memory
-        self._stm.append(user_msg)
-        self._stm.append(ai_msg)
+        # Each turn is written in one step so that concurrent turns cannot interleave.
+        self._write([user_msg, ai_msg])
+
+        # The turn is over; whatever was prefetched for it and not used is dropped.
+        if self.prefetcher is not None:
+            self.prefetcher.discard(user_input)
+
+    def add_messages(self, messages: List[Message]) -> None:
+        """Appends already-built messages to short-term and long-term memory.
+
+        Used when replaying or importing conversations, where messages carry
+        their own ids, roles and metadata.
+
+        Args:
+            messages (List[Message]): Messages in conversation order.
+        """
+        self._write(messages)
+
+    def _write(self, messages: List[Message]) -> None:
+        with self._write_lock:
+            self._stm.extend(messages)
+            if self._ltm:
+                self._ltm.add_messages(messages)
+
+    def snapshot(self) -> bytes:
+        """Captures short-term memory as a compact binary snapshot.
+
+        The snapshot keeps message ids, timestamps and metadata, so a session
+        can be moved to another worker or kept across restarts without
+        replaying long-term memory.
+
+        Returns:
+            bytes: Snapshot accepted by :meth:`restore`.
+        """
+        return self._stm.snapshot()
+
+    def restore(self, snapshot: bytes) -> None:
+        """Replaces short-term memory with the contents of a snapshot.
+
+        Long-term memory is not touched.
 
-        if self._ltm:
-            self._ltm.add_message(user_msg)
-            self._ltm.add_message(ai_msg)
+        Args:
+            snapshot (bytes): Snapshot produced by :meth:`snapshot`.
+        """
+        self._stm.restore(snapshot)
 
     def clear(self, delete_history: bool = False) -> None:
         """Clears the memory state.
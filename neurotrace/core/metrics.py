@@ -0,0 +1,265 @@
+"""
+Metrics Module.
+
+This module provides lightweight instrumentation for neurotrace's memory
+operations: counters, histograms and timers, recorded through pluggable
+exporters. Metrics are disabled by default; every hook then returns after a
+single ``None`` check, so instrumented code pays close to nothing.
+
+Example:
+    >>> from neurotrace.core import metrics
+    >>> exporter = metrics.enable_metrics(metrics.PrometheusExporter())
+    >>> ...  # run the agent
+    >>> print(exporter.render())
+"""
+
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+Labels = Dict[str, str]
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_NOOP = nullcontext()
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    # Full precision: ``{:g}`` would render 1234567 as 1.23457e+06.
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class MetricsExporter(ABC):
+    """Receives every recorded measurement. Subclass to send metrics elsewhere."""
+
+    @abstractmethod
+    def record_counter(self, name: str, value: float, labels: Labels) -> None:
+        """Add ``value`` to the counter ``name``."""
+        ...
+
+    @abstractmethod
+    def record_histogram(self, name: str, value: float, labels: Labels) -> None:
+        """Record one observation of ``value`` in the histogram ``name``."""
+        ...
+
+
+class PrometheusExporter(MetricsExporter):
+    """Aggregates metrics in memory and renders them in the Prometheus text format.
+
+    Histograms whose name ends in ``_seconds`` use latency buckets, all others
+    use size buckets, unless ``buckets`` overrides them by name.
+
+    Args:
+        buckets (Dict[str, Sequence[float]], optional): Per-histogram bucket bounds.
+    """
+
+    def __init__(self, buckets: Optional[Dict[str, Sequence[float]]] = None):
+        self.buckets = dict(buckets or {})
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], List] = {}
+        self._lock = threading.Lock()
+
+    def _bounds(self, name: str) -> Sequence[float]:
+        if name in self.buckets:
+            return self.buckets[name]
+        return LATENCY_BUCKETS if name.endswith("_seconds") else SIZE_BUCKETS
+
+    def record_counter(self, name: str, value: float, labels: Labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def record_histogram(self, name: str, value: float, labels: Labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        bounds = self._bounds(name)
+        with self._lock:
+            state = self._histograms.get(key)
+            if state is None:
+                state = self._histograms[key] = [[0] * (len(bounds) + 1), 0.0, 0]
+            state[0][bisect.bisect_left(bounds, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        """Current value of a counter, mostly for tests and debugging."""
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0.0)
+
+    def histogram_count(self, name: str, **labels: str) -> int:
+        """Number of observations in a histogram, mostly for tests and debugging."""
+        state = self._histograms.get((name, tuple(sorted(labels.items()))))
+        return state[2] if state else 0
+
+    @staticmethod
+    def _format_labels(labels: Tuple, extra: Optional[Tuple[str, str]] = None) -> str:
+        items = list(labels) + ([extra] if extra else [])
+        if not items:
+            return ""
+        body = ",".join(f'{key}="{_escape(value)}"' for key, value in items)
+        return "{" + body + "}"
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, [list(state[0]), state[1], state[2]]) for key, state in self._histograms.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{self._format_labels(labels)} {_number(value)}")
+
+        for (name, labels), (counts, total, count) in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, bucket_count in zip(list(self._bounds(name)) + ["+Inf"], counts):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f"{name}_bucket{self._format_labels(labels, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryExporter(MetricsExporter):
+    """Forwards metrics to an OpenTelemetry ``Meter``.
+
+    The meter is used through ``create_counter(...).add`` and
+    ``create_histogram(...).record``, so ``opentelemetry-api`` is only needed by
+    the caller that creates the meter.
+
+    Args:
+        meter (Any): An ``opentelemetry.metrics.Meter``.
+    """
+
+    def __init__(self, meter: Any):
+        self.meter = meter
+        self._instruments: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def _instrument(self, kind: str, name: str) -> Any:
+        key = (kind, name)
+        instrument = self._instruments.get(key)
+        if instrument is None:
+            with self._lock:
+                instrument = self._instruments.get(key)
+                if instrument is None:
+                    unit = "s" if name.endswith("_seconds") else "1"
+                    create = self.meter.create_counter if kind == "counter" else self.meter.create_histogram
+                    instrument = self._instruments[key] = create(name, unit=unit)
+        return instrument
+
+    def record_counter(self, name: str, value: float, labels: Labels) -> None:
+        self._instrument("counter", name).add(value, attributes=labels)
+
+    def record_histogram(self, name: str, value: float, labels: Labels) -> None:
+        self._instrument("histogram", name).record(value, attributes=labels)
+
+
+_exporters: Optional[Tuple[MetricsExporter, ...]] = None
+
+
+def enable_metrics(*exporters: MetricsExporter) -> MetricsExporter:
+    """
+    Start recording metrics.
+
+    Args:
+        *exporters (MetricsExporter): Where to send measurements. Defaults to a
+            new :class:`PrometheusExporter`.
+
+    Returns:
+        MetricsExporter: The first exporter.
+    """
+    global _exporters
+    _exporters = tuple(exporters) or (PrometheusExporter(),)
+    return _exporters[0]
+
+
+def disable_metrics() -> None:
+    """Stop recording metrics."""
+    global _exporters
+    _exporters = None
+
+
+def enabled() -> bool:
+    """Whether metrics are currently being recorded."""
+    return _exporters is not None
+
+
+def inc(name: str, value: float = 1, **labels: str) -> None:
+    """Add ``value`` to the counter ``name``."""
+    if _exporters is None:
+        return
+    for exporter in _exporters:
+        exporter.record_counter(name, value, labels)
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    """Record ``value`` in the histogram ``name``."""
+    if _exporters is None:
+        return
+    for exporter in _exporters:
+        exporter.record_histogram(name, value, labels)
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: Labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.labels = {**self.labels, "error": exc_type.__name__}
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+def timer(name: str, **labels: str):
+    """
+    Context manager recording the duration of its block in the histogram ``name``.
+
+    Failed blocks are recorded with an additional ``error`` label.
+    """
+    if _exporters is None:
+        return _NOOP
+    return _Timer(name, labels)
+
+
+def timed(name: str, **labels: str) -> Callable:
+    """Decorator recording each call's duration in the histogram ``name``."""
+
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _exporters is None:
+                return fn(*args, **kwargs)
+            with _Timer(name, labels):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
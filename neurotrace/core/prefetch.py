@@ -0,0 +1,172 @@
+"""
+Prefetch Module.
+
+This module starts long-term memory retrieval before the agent asks for it.
+When a user turn arrives, :class:`MemoryPrefetcher` runs the vector and graph
+searches for its text in the background, so that a ``search_memory`` tool call
+later in the turn finds the results ready instead of waiting a full retrieval
+round trip. Results nobody asks for are discarded when the turn is saved;
+searches that have not started yet are cancelled.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from neurotrace.core import metrics
+from neurotrace.core.schema import Message
+from neurotrace.core.utils import normalise_query
+from neurotrace.neurotrace_logging.logger_factory import get_logger
+
+if TYPE_CHECKING:
+    # Only for annotations: importing the orchestrator pulls in the graph stack.
+    from neurotrace.core.hippocampus.memory_orchestrator import (
+        GraphSearchMode,
+        MemoryOrchestrator,
+    )
+
+logger = get_logger("neurotrace.prefetch")
+
+
+class MemoryPrefetcher:
+    """Speculatively retrieves vector and graph memory for incoming user turns.
+
+    ``NeurotraceMemory`` calls :meth:`prefetch` from ``load_memory_variables``
+    and :meth:`discard` from ``save_context``; ``memory_search_tool`` calls
+    :meth:`get` before searching itself. Pass the same prefetcher to both.
+
+    A search is served from the prefetch when its normalised text equals a
+    prefetched turn, ignoring case and whitespace. With ``reuse_for_turn`` any
+    search is served from the most recent turn's prefetch, which suits agents
+    that call ``search_memory`` once per turn with a rephrased question, and
+    should only be used with one prefetcher per session.
+
+    Graph memory is prefetched with LLM-free direct retrieval by default, so a
+    speculative search never spends a Cypher QA call on a turn whose results
+    may be thrown away.
+
+    Args:
+        memory_orchestrator (MemoryOrchestrator): Source of vector and graph memory.
+        vector_k (int, optional): Vector memories to retrieve. Defaults to 5.
+        max_pending (int, optional): Turns kept at once; prefetching more discards
+            the oldest. Defaults to 8.
+        max_workers (int, optional): Threads running prefetches. Defaults to 2.
+        timeout (float, optional): Seconds :meth:`get` waits for a prefetch still
+            in flight before giving up on it. None waits until it finishes.
+            Defaults to None.
+        reuse_for_turn (bool, optional): Serve any search from the latest turn's
+            prefetch. Defaults to False.
+        graph_search_mode (GraphSearchMode, optional): Mode of the graph prefetch;
+            None uses the orchestrator's ``graph_search_mode``. Defaults to "direct".
+    """
+
+    def __init__(
+        self,
+        memory_orchestrator: "MemoryOrchestrator",
+        vector_k: int = 5,
+        max_pending: int = 8,
+        max_workers: int = 2,
+        timeout: Optional[float] = None,
+        reuse_for_turn: bool = False,
+        graph_search_mode: Optional["GraphSearchMode"] = "direct",
+    ):
+        self.memory_orchestrator = memory_orchestrator
+        self.vector_k = vector_k
+        self.max_pending = max_pending
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.reuse_for_turn = reuse_for_turn
+        self.graph_search_mode = graph_search_mode
+        self._pending: "OrderedDict[str, Tuple[Future, Future]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def prefetch(self, query: Optional[str]) -> None:
+        """
+        Start retrieving memory for ``query`` unless it is already in flight.
+
+        Args:
+            query (str, optional): The user's input. Empty queries are ignored.
+        """
+        if not query or not query.strip():
+            return
+        key = normalise_query(query)
+        discarded = []
+        with self._lock:
+            if key in self._pending:
+                self._pending.move_to_end(key)
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="neurotrace-prefetch"
+                )
+            self._pending[key] = (
+                self._executor.submit(self.memory_orchestrator.search_vector_memory, query, self.vector_k),
+                self._executor.submit(self.memory_orchestrator.search_graph_memory, query, mode=self.graph_search_mode),
+            )
+            while len(self._pending) > self.max_pending:
+                discarded.append(self._pending.popitem(last=False)[1])
+        metrics.inc("neurotrace_prefetch_total", outcome="started")
+        self._cancel(discarded)
+
+    def get(self, query: str) -> Optional[Tuple[List[Message], str]]:
+        """
+        Prefetched results for ``query``, waiting for them if still in flight.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            Optional[Tuple[List[Message], str]]: The vector memories and graph
+                result, or None if nothing usable was prefetched.
+        """
+        key = normalise_query(query)
+        with self._lock:
+            futures = self._pending.get(key)
+            if futures is None and self.reuse_for_turn and self._pending:
+                futures = next(reversed(self._pending.values()))
+        if futures is None:
+            metrics.inc("neurotrace_prefetch_total", outcome="miss")
+            return None
+
+        vector_future, graph_future = futures
+        try:
+            result = vector_future.result(timeout=self.timeout), graph_future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            logger.warning("Prefetch for %r still running after %ss, searching directly", query, self.timeout)
+        except Exception:
+            logger.exception("Prefetch for %r failed, searching directly", query)
+        else:
+            metrics.inc("neurotrace_prefetch_total", outcome="hit")
+            return result
+        metrics.inc("neurotrace_prefetch_total", outcome="miss")
+        return None
+
+    def discard(self, query: Optional[str]) -> None:
+        """
+        Drop the prefetch for ``query``, cancelling searches that have not started.
+
+        Args:
+            query (str, optional): The user's input for the finished turn.
+        """
+        if not query:
+            return
+        with self._lock:
+            futures = self._pending.pop(normalise_query(query), None)
+        if futures is not None:
+            self._cancel([futures])
+
+    def clear(self) -> None:
+        """Drop every prefetch."""
+        with self._lock:
+            discarded = list(self._pending.values())
+            self._pending.clear()
+        self._cancel(discarded)
+
+    def _cancel(self, discarded: List[Tuple[Future, Future]]) -> None:
+        # Searches already running cannot be interrupted; their results are simply dropped.
+        cancelled = sum(future.cancel() for futures in discarded for future in futures)
+        if cancelled:
+            metrics.inc("neurotrace_prefetch_total", cancelled, outcome="cancelled")
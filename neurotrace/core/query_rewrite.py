@@ -0,0 +1,154 @@
+"""
+Query Rewrite Module.
+
+This module improves vector search recall by searching for several phrasings of
+a query instead of one. :class:`QueryRewriter` asks the LLM for rewrites of the
+user's query, runs the search for every variant concurrently and merges the
+result lists with reciprocal rank fusion. Rewrites are cached by normalised
+query, so the extra LLM call is only paid once per distinct question.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Union
+
+from neurotrace.core import metrics
+from neurotrace.core.llm_cache import LLMResponseCache
+from neurotrace.core.llm_dispatcher import model_id
+from neurotrace.core.llm_tasks import get_query_rewrites
+from neurotrace.core.schema import Message
+from neurotrace.core.utils import normalise_query
+from neurotrace.neurotrace_logging.logger_factory import get_logger
+from neurotrace.prompts.task_prompts import PROMPT_QUERY_REWRITE
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel, BaseLLM
+
+logger = get_logger("neurotrace.query_rewrite")
+
+
+def reciprocal_rank_fusion(result_lists: Sequence[List[Message]], k: int, rrf_k: int = 60) -> List[Message]:
+    """
+    Merge ranked result lists into one.
+
+    Each message scores ``1 / (rrf_k + rank)`` for every list it appears in,
+    with ranks starting at 1, so messages found by several queries rise to the
+    top. Messages are identified by id; ties keep the order of first appearance.
+
+    Args:
+        result_lists (Sequence[List[Message]]): Results per query, best first.
+        k (int): Number of messages to return.
+        rrf_k (int, optional): Damping constant; larger values flatten the
+            advantage of top ranks. Defaults to 60.
+
+    Returns:
+        List[Message]: The ``k`` best messages, best first.
+    """
+    scores: Dict[str, float] = {}
+    messages: Dict[str, Message] = {}
+    for results in result_lists:
+        for rank, message in enumerate(results, start=1):
+            scores[message.id] = scores.get(message.id, 0.0) + 1.0 / (rrf_k + rank)
+            messages.setdefault(message.id, message)
+    best = sorted(scores, key=scores.__getitem__, reverse=True)[:k]
+    return [messages[message_id] for message_id in best]
+
+
+class QueryRewriter:
+    """Expands a search query into LLM-written variants and fuses their results.
+
+    Args:
+        llm (Union[BaseLLM, BaseChatModel]): Model that writes the rewrites.
+        variants (int, optional): Rewrites to ask for per query. Defaults to 3.
+        include_original (bool, optional): Also search for the query as given.
+            Defaults to True.
+        cache (LLMResponseCache, optional): Where rewrites are cached. Defaults to
+            an in-memory cache of 1024 queries.
+        max_workers (int, optional): Threads running variant searches. Defaults to 4.
+        rrf_k (int, optional): Damping constant for :func:`reciprocal_rank_fusion`.
+            Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        llm: Union["BaseLLM", "BaseChatModel"],
+        variants: int = 3,
+        include_original: bool = True,
+        cache: Optional[LLMResponseCache] = None,
+        max_workers: int = 4,
+        rrf_k: int = 60,
+    ):
+        self.llm = llm
+        self.variants = variants
+        self.include_original = include_original
+        self.cache = cache if cache is not None else LLMResponseCache()
+        self.max_workers = max_workers
+        self.rrf_k = rrf_k
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def rewrite(self, query: str) -> List[str]:
+        """
+        Queries to search for in place of ``query``.
+
+        If the LLM call fails or returns nothing usable, only the original
+        query is returned and nothing is cached.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            List[str]: Distinct queries, the original first when ``include_original`` is set.
+        """
+        key = LLMResponseCache.make_key(
+            PROMPT_QUERY_REWRITE.template,
+            {"query": normalise_query(query), "variants": self.variants},
+            model_id(self.llm),
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            metrics.inc("neurotrace_query_rewrite_total", outcome="cached")
+            rewrites = json.loads(cached)
+        else:
+            try:
+                rewrites = get_query_rewrites(self.llm, query, self.variants)
+            except Exception:
+                logger.exception("Query rewrite failed, searching for the original query only")
+                rewrites = []
+            metrics.inc("neurotrace_query_rewrite_total", outcome="rewritten" if rewrites else "failed")
+            if rewrites:
+                self.cache.set(key, json.dumps(rewrites))
+
+        queries = [query] if self.include_original or not rewrites else []
+        seen = {normalise_query(q) for q in queries}
+        for rewrite in rewrites:
+            if normalise_query(rewrite) not in seen:
+                seen.add(normalise_query(rewrite))
+                queries.append(rewrite)
+        return queries
+
+    def search(self, search: Callable[[str, int], List[Message]], query: str, k: int = 5) -> List[Message]:
+        """
+        Run ``search`` for every variant of ``query`` and fuse the results.
+
+        The first query runs on the calling thread and the others on the
+        rewriter's thread pool, so the searches overlap.
+
+        Args:
+            search (Callable[[str, int], List[Message]]): Single-query search, e.g.
+                the similarity search of ``VectorMemoryAdapter``.
+            query (str): The search query.
+            k (int, optional): Number of messages to return. Defaults to 5.
+
+        Returns:
+            List[Message]: The fused top ``k`` messages.
+        """
+        queries = self.rewrite(query)
+        metrics.observe("neurotrace_query_rewrite_variants", len(queries))
+        if len(queries) == 1:
+            return search(queries[0], k)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="neurotrace-rewrite")
+        futures = [self._executor.submit(search, variant, k) for variant in queries[1:]]
+        result_lists = [search(queries[0], k)] + [future.result() for future in futures]
+        return reciprocal_rank_fusion(result_lists, k, self.rrf_k)
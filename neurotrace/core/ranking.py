@@ -0,0 +1,212 @@
+"""
+Memory Ranking Module.
+
+This module re-ranks vector search candidates. Similarity alone lets old,
+stale memories crowd out recent ones, so :class:`MemoryRanker` blends it with
+how recent a memory is, how often it has been returned before and how
+emotionally intense it was. All candidates are scored in one vectorised pass;
+callers over-fetch from the vector store and keep the top ``k``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from neurotrace.core.schema import Message
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+
+def _intensity(message: Message) -> float:
+    emotions = message.metadata.emotions
+    return emotions.intensity or 0.0 if emotions is not None else 0.0
+
+
+class MemoryRanker:
+    """Scores memories by similarity, recency, access frequency and intensity.
+
+    The score of each candidate is::
+
+        similarity_weight * similarity
+        + recency_weight * 0.5 ** (age / half_life)
+        + frequency_weight * log1p(accesses) / log1p(max accesses among candidates)
+        + intensity_weight * emotions.intensity
+
+    Age comes from ``Message.timestamp`` (or the ``created_at`` document
+    metadata), intensity from ``EmotionTag.intensity`` (or ``importance``); a
+    missing intensity counts as 0. Accesses are counted in process each time a
+    memory is returned by :meth:`rank` or :meth:`rank_documents`; only the
+    ``max_tracked`` most recently returned memories keep a count, the others
+    fall back to 0.
+
+    Args:
+        similarity_weight (float, optional): Weight of the similarity score. Defaults to 1.0.
+        recency_weight (float, optional): Weight of the time decay. Defaults to 0.3.
+        frequency_weight (float, optional): Weight of the access frequency. Defaults to 0.1.
+        intensity_weight (float, optional): Weight of ``EmotionTag.intensity``. Defaults to 0.2.
+        half_life (float, optional): Seconds after which the recency term halves.
+            Defaults to one week.
+        max_tracked (int, optional): Most memories whose access count is kept.
+            Defaults to 100000.
+    """
+
+    def __init__(
+        self,
+        similarity_weight: float = 1.0,
+        recency_weight: float = 0.3,
+        frequency_weight: float = 0.1,
+        intensity_weight: float = 0.2,
+        half_life: float = 7 * 24 * 3600.0,
+        max_tracked: int = 100_000,
+    ):
+        self.similarity_weight = similarity_weight
+        self.recency_weight = recency_weight
+        self.frequency_weight = frequency_weight
+        self.intensity_weight = intensity_weight
+        self.half_life = half_life
+        self.max_tracked = max_tracked
+        # Least recently returned first, so the oldest counts are evicted first.
+        self._accesses: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def access_count(self, message_id: str) -> int:
+        """Number of times ``message_id`` has been returned by :meth:`rank`."""
+        with self._lock:
+            return self._accesses.get(message_id, 0)
+
+    def record_access(self, ids: Iterable[str]) -> None:
+        """Count one access for each message id in ``ids``."""
+        with self._lock:
+            for doc_id in ids:
+                self._accesses[doc_id] = self._accesses.pop(doc_id, 0) + 1
+            while len(self._accesses) > self.max_tracked:
+                self._accesses.popitem(last=False)
+
+    def scores(
+        self, messages: Sequence[Message], similarities: Sequence[float], now: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Score candidate messages without recording an access.
+
+        Args:
+            messages (Sequence[Message]): Candidate memories.
+            similarities (Sequence[float]): Relevance of each candidate to the query.
+            now (float, optional): Current time in epoch seconds. Defaults to ``time.time()``.
+
+        Returns:
+            np.ndarray: One score per candidate, higher is better.
+        """
+        return self._score(
+            [msg.id for msg in messages],
+            [msg.timestamp.timestamp() for msg in messages],
+            [_intensity(msg) for msg in messages],
+            similarities,
+            now,
+        )
+
+    def document_scores(
+        self, documents: Sequence["Document"], similarities: Sequence[float], now: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Score vector store documents without converting them to messages.
+
+        Reads the ``id``, ``created_at`` and ``importance`` metadata written by
+        ``VectorMemoryAdapter``. Documents without ``created_at`` are treated as
+        new, and documents without ``importance`` as having none.
+
+        Args:
+            documents (Sequence[Document]): Candidate documents.
+            similarities (Sequence[float]): Relevance of each candidate to the query.
+            now (float, optional): Current time in epoch seconds. Defaults to ``time.time()``.
+
+        Returns:
+            np.ndarray: One score per candidate, higher is better.
+        """
+        now = time.time() if now is None else now
+        return self._score(
+            [doc.metadata.get("id") or doc.id for doc in documents],
+            [doc.metadata.get("created_at", now) for doc in documents],
+            [doc.metadata.get("importance") or 0.0 for doc in documents],
+            similarities,
+            now,
+        )
+
+    def _score(
+        self,
+        ids: List[Optional[str]],
+        created: List[float],
+        intensity: List[float],
+        similarities: Sequence[float],
+        now: Optional[float],
+    ) -> np.ndarray:
+        now = time.time() if now is None else now
+        with self._lock:
+            accesses = np.fromiter((self._accesses.get(doc_id, 0) for doc_id in ids), dtype=np.float64, count=len(ids))
+
+        age = np.maximum(now - np.asarray(created, dtype=np.float64), 0.0)
+        recency = np.exp2(-age / self.half_life)
+        frequency = np.log1p(accesses)
+        peak = frequency.max(initial=0.0)
+        if peak > 0:
+            frequency /= peak
+        return (
+            self.similarity_weight * np.asarray(similarities, dtype=np.float64)
+            + self.recency_weight * recency
+            + self.frequency_weight * frequency
+            + self.intensity_weight * np.asarray(intensity, dtype=np.float64)
+        )
+
+    def top(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the ``k`` highest scores, best first; ties keep candidate order."""
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+            return best[np.argsort(-scores[best], kind="stable")]
+        return np.argsort(-scores, kind="stable")
+
+    def rank(
+        self, messages: Sequence[Message], similarities: Sequence[float], k: int, now: Optional[float] = None
+    ) -> List[Message]:
+        """
+        Return the ``k`` best candidates, best first, and record an access for each.
+
+        Args:
+            messages (Sequence[Message]): Candidate memories, typically over-fetched.
+            similarities (Sequence[float]): Relevance of each candidate to the query.
+            k (int): Number of memories to keep.
+            now (float, optional): Current time in epoch seconds. Defaults to ``time.time()``.
+
+        Returns:
+            List[Message]: The top ``k`` memories.
+        """
+        if not messages:
+            return []
+        ranked = [messages[i] for i in self.top(self.scores(messages, similarities, now), k)]
+        self.record_access(msg.id for msg in ranked)
+        return ranked
+
+    def rank_documents(
+        self, documents: Sequence["Document"], similarities: Sequence[float], k: int, now: Optional[float] = None
+    ) -> List["Document"]:
+        """
+        Like :meth:`rank`, for vector store documents (see :meth:`document_scores`).
+
+        Args:
+            documents (Sequence[Document]): Candidate documents, typically over-fetched.
+            similarities (Sequence[float]): Relevance of each candidate to the query.
+            k (int): Number of documents to keep.
+            now (float, optional): Current time in epoch seconds. Defaults to ``time.time()``.
+
+        Returns:
+            List[Document]: The top ``k`` documents.
+        """
+        if not documents:
+            return []
+        ranked = [documents[i] for i in self.top(self.document_scores(documents, similarities, now), k)]
+        self.record_access(doc.metadata.get("id") or doc.id for doc in ranked)
+        return ranked
@@ -0,0 +1,252 @@
+"""
+Reindex Module.
+
+This module migrates vector memory to a new embedding model without downtime.
+:class:`ReindexJob` streams every stored memory out of the live store in pages,
+re-embeds the texts in large batches with bounded concurrency and writes them
+to a shadow store that uses the new model. Writes that arrive meanwhile go to
+both stores, progress is checkpointed after every page, and once the shadow
+store has caught up the adapter switches to it atomically.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from neurotrace.core import metrics
+from neurotrace.core.checkpoint import JsonCheckpoint
+from neurotrace.core.vector_memory import VectorMemoryAdapter
+from neurotrace.neurotrace_logging.logger_factory import get_logger
+
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+
+logger = get_logger("neurotrace.reindex")
+
+
+def _content(document: Document) -> Tuple[str, Dict[str, Any]]:
+    # Row offsets differ between stores and say nothing about the content.
+    return document.page_content, {k: v for k, v in document.metadata.items() if k != "embedding_offset"}
+
+
+@dataclass
+class ReindexReport:
+    """Outcome of one :class:`ReindexJob` run.
+
+    Attributes:
+        documents (int): Documents re-embedded and copied by the page walk in this run.
+        resumed_from (int): Documents skipped because the checkpoint showed them as done.
+        pages (int): Pages copied in this run.
+        reconciled_added (int): Documents the final check found missing from the
+            new store and copied.
+        reconciled_deleted (int): Documents the final check found deleted from the
+            live store and removed from the new one.
+        reconciled_updated (int): Documents the final check found with different
+            text or metadata in the two stores and copied again.
+        switched (bool): Whether the adapter now uses the new store.
+        duration (float): Seconds the run took.
+    """
+
+    documents: int = 0
+    resumed_from: int = 0
+    pages: int = 0
+    reconciled_added: int = 0
+    reconciled_deleted: int = 0
+    reconciled_updated: int = 0
+    switched: bool = False
+    duration: float = 0.0
+
+
+class ReindexJob:
+    """Re-embeds all of vector memory into a new store and switches to it.
+
+    The run goes through these steps:
+
+    1. Mirror writes. The adapter starts sending every add and delete to the
+       target store as well (see ``VectorMemoryAdapter.start_shadow_writes``).
+    2. Copy. The documents stored when the job starts are read from the live
+       store ``page_size`` at a time.
+       Each page is split into batches of ``batch_size`` texts that are
+       embedded with the target store's model, up to ``concurrency`` at once.
+       The page is then written with ``add_embeddings`` under its original ids
+       and metadata, and the checkpoint records the walk's cursor (see
+       ``VectorMemoryAdapter.iter_documents``).
+    3. Reconcile. The ids of both stores are compared. Documents the walk missed
+       because of concurrent writes are copied, and documents deleted from the
+       live store in the meantime are removed from the target. Documents in
+       both stores whose text or metadata differ, because they were rewritten
+       while their page was being copied, are copied again.
+    4. Switch. The adapter is switched to the target store atomically and the
+       checkpoint is cleared.
+
+    If the job fails, writes stop being mirrored and the checkpoint is kept.
+    Running it again with the same checkpoint and a persistent target store
+    resumes after the last copied page; writes made while no job was running
+    are picked up by the reconcile step.
+
+    Args:
+        vector_memory_adapter (VectorMemoryAdapter): Adapter whose store is migrated.
+        target_store (VectorStore): Store using the new embedding model. It must
+            be able to list its documents (see ``VectorMemoryAdapter.metadata_items``).
+            Stores without ``add_embeddings`` are filled with ``add_texts`` and
+            embed each batch themselves.
+        checkpoint_path (str, optional): Where to record progress. Defaults to None
+            (no checkpointing).
+        page_size (int, optional): Documents read from the live store at a time.
+            Defaults to 1000.
+        batch_size (int, optional): Texts per embedding call. Defaults to 256.
+        concurrency (int, optional): Embedding calls in flight. Defaults to 4.
+        switch (bool, optional): Switch the adapter to the target store when done.
+            With False, writes keep being mirrored until the caller switches.
+            Defaults to True.
+    """
+
+    def __init__(
+        self,
+        vector_memory_adapter: VectorMemoryAdapter,
+        target_store: VectorStore,
+        checkpoint_path: Optional[str] = None,
+        page_size: int = 1000,
+        batch_size: int = 256,
+        concurrency: int = 4,
+        switch: bool = True,
+    ):
+        self.vector_memory = vector_memory_adapter
+        self.target_store = target_store
+        self.checkpoint = JsonCheckpoint(checkpoint_path)
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.switch = switch
+
+    @property
+    def embedding(self) -> "Embeddings":
+        return self.target_store.embeddings
+
+    def run(self) -> ReindexReport:
+        """Copy, reconcile and switch, resuming from the checkpoint if one exists.
+
+        Raises:
+            NotImplementedError: If the target store cannot list its documents,
+                before anything is copied.
+        """
+        if not (hasattr(self.target_store, "metadata_items") or hasattr(self.target_store, "get")):
+            raise NotImplementedError(
+                f"Reindexing needs a target store that can list its documents, not {type(self.target_store)}."
+            )
+        start = time.perf_counter()
+        report = ReindexReport()
+        state = self.checkpoint.load()
+        done = report.resumed_from = state.get("documents_done", 0)
+        if done:
+            logger.info("Resuming reindex after %d documents", done)
+
+        self.vector_memory.start_shadow_writes(self.target_store)
+        try:
+            self._copy_all(report, state.get("cursor", 0), done)
+        except BaseException:
+            self.vector_memory.stop_shadow_writes()
+            raise
+
+        if self.switch:
+            self.vector_memory.switch_store(self.target_store)
+            self.checkpoint.clear()
+            report.switched = True
+        report.duration = time.perf_counter() - start
+        logger.info(
+            "Reindex finished: %d documents in %d pages, %d added, %d updated and %d deleted on reconcile, "
+            "switched=%s, %.2fs",
+            report.documents,
+            report.pages,
+            report.reconciled_added,
+            report.reconciled_updated,
+            report.reconciled_deleted,
+            report.switched,
+            report.duration,
+        )
+        return report
+
+    def _copy_all(self, report: ReindexReport, cursor: int, done: int) -> None:
+        # Anything added from here on is mirrored, so the walk stops at the current size.
+        total = self.vector_memory.count()
+        with ThreadPoolExecutor(max_workers=max(self.concurrency, 1), thread_name_prefix="neurotrace-reindex") as pool:
+            for page, cursor in self.vector_memory.iter_documents(self.page_size, cursor=cursor):
+                if done >= total:
+                    break
+                with metrics.timer("neurotrace_reindex_page_seconds"):
+                    self._copy(page, pool)
+                done += len(page)
+                report.documents += len(page)
+                report.pages += 1
+                metrics.inc("neurotrace_reindex_documents_total", len(page))
+                self.checkpoint.save({"cursor": cursor, "documents_done": done})
+                logger.info("Reindexed %d of %d documents", done, total)
+
+            self._reconcile(report, pool)
+
+    def _copy(self, documents: Sequence[Document], pool: ThreadPoolExecutor) -> None:
+        texts = [doc.page_content for doc in documents]
+        ids = [doc.id or doc.metadata.get("id") for doc in documents]
+        metadatas = [{k: v for k, v in doc.metadata.items() if k != "embedding_offset"} for doc in documents]
+        size = max(self.batch_size, 1)
+        starts = range(0, len(texts), size)
+        if not hasattr(self.target_store, "add_embeddings"):
+            list(
+                pool.map(
+                    lambda i: self.target_store.add_texts(
+                        texts[i : i + size], metadatas[i : i + size], ids=ids[i : i + size]
+                    ),
+                    starts,
+                )
+            )
+            return
+
+        vectors = [
+            vector
+            for batch in pool.map(lambda i: self.embedding.embed_documents(texts[i : i + size]), starts)
+            for vector in batch
+        ]
+        self.target_store.add_embeddings(text_embeddings=list(zip(texts, vectors)), metadatas=metadatas, ids=ids)
+
+    def _reconcile(self, report: ReindexReport, pool: ThreadPoolExecutor) -> None:
+        target_ids = {doc_id for doc_id, _ in VectorMemoryAdapter(self.target_store).metadata_items()}
+        live_ids = {doc_id for doc_id, _ in self.vector_memory.metadata_items()}
+
+        stale = list(target_ids - live_ids)
+        if stale:
+            self.target_store.delete(stale)
+        report.reconciled_deleted = len(stale)
+
+        missing = list(live_ids - target_ids)
+        try:
+            changed = self._changed(sorted(live_ids & target_ids))
+            documents = self.vector_memory.vector_store.get_by_ids(missing + changed) if missing or changed else []
+        except NotImplementedError:
+            logger.warning(
+                "Documents cannot be fetched by id: %d missing from the new store were not copied, "
+                "and changed documents were not checked",
+                len(missing),
+            )
+            return
+        for start in range(0, len(documents), max(self.page_size, 1)):
+            self._copy(documents[start : start + self.page_size], pool)
+        report.reconciled_updated = len(changed)
+        report.reconciled_added = len(documents) - len(changed)
+
+    def _changed(self, ids: Sequence[str]) -> List[str]:
+        """Ids whose text or metadata differ between the live and the target store."""
+        changed = []
+        size = max(self.page_size, 1)
+        for start in range(0, len(ids), size):
+            chunk = ids[start : start + size]
+            live = {doc.id: _content(doc) for doc in self.vector_memory.vector_store.get_by_ids(chunk)}
+            changed += [
+                doc.id
+                for doc in self.target_store.get_by_ids(chunk)
+                if live.get(doc.id, _content(doc)) != _content(doc)
+            ]
+        return changed
@@ -0,0 +1,233 @@
+"""
+Retention Module.
+
+This module expires long-term memory so that the vector index and the graph do
+not grow without bound. A :class:`RetentionPolicy` decides which stored messages
+have expired, by age, by a cap on messages per session and by importance, and
+how old a graph relationship may get. :class:`CompactionJob` applies a policy:
+it batch-deletes expired vectors, prunes stale relationships and the entities
+they leave orphaned, compacts the vector store, and reports what it reclaimed.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from neurotrace.core import metrics
+from neurotrace.neurotrace_logging.logger_factory import get_logger
+
+if TYPE_CHECKING:
+    from neurotrace.core.graph_memory import GraphMemoryAdapter
+    from neurotrace.core.vector_memory import VectorMemoryAdapter
+
+logger = get_logger("neurotrace.retention")
+
+
+@dataclass
+class RetentionPolicy:
+    """Rules for how long memory is kept.
+
+    Vector memory rules read the ``created_at``, ``importance`` and
+    ``session_id`` metadata that ``VectorMemoryAdapter`` stores with each
+    message. Messages without ``created_at`` never expire by age, and messages
+    without ``importance`` are never dropped for being unimportant.
+
+    Attributes:
+        max_age (float, optional): Seconds after which a message expires.
+            Defaults to None (no age limit).
+        max_per_session (int, optional): Newest messages kept per session; older
+            ones expire. Defaults to None (no cap).
+        min_importance (float, optional): Messages with a lower importance expire.
+            Defaults to None.
+        keep_importance (float, optional): Messages with at least this importance
+            never expire, whatever their age or session size. Defaults to None.
+        relationship_max_age (float, optional): Seconds after which a graph
+            relationship is pruned, judged by its ``created_at``. Defaults to None
+            (relationships are kept).
+    """
+
+    max_age: Optional[float] = None
+    max_per_session: Optional[int] = None
+    min_importance: Optional[float] = None
+    keep_importance: Optional[float] = None
+    relationship_max_age: Optional[float] = None
+
+    def expired(self, items: Iterable[Tuple[str, Dict[str, Any]]], now: Optional[float] = None) -> List[str]:
+        """
+        Select the messages this policy expires.
+
+        Args:
+            items (Iterable[Tuple[str, Dict[str, Any]]]): ``(id, metadata)`` pairs,
+                e.g. from ``VectorMemoryAdapter.metadata_items``.
+            now (float, optional): Current time in epoch seconds. Defaults to ``time.time()``.
+
+        Returns:
+            List[str]: Ids of the expired messages.
+        """
+        now = time.time() if now is None else now
+        expired: List[str] = []
+        sessions: Dict[Any, List[Tuple[float, str]]] = defaultdict(list)
+        for doc_id, metadata in items:
+            importance = metadata.get("importance")
+            if importance is not None and self.keep_importance is not None and importance >= self.keep_importance:
+                continue
+            created_at = metadata.get("created_at")
+            if (self.max_age is not None and created_at is not None and now - created_at > self.max_age) or (
+                self.min_importance is not None and importance is not None and importance < self.min_importance
+            ):
+                expired.append(doc_id)
+            elif self.max_per_session is not None:
+                # Messages of unknown age sort as the oldest.
+                sessions[metadata.get("session_id")].append((created_at or 0.0, doc_id))
+
+        for entries in sessions.values():
+            if len(entries) > self.max_per_session:
+                entries.sort(reverse=True)
+                expired.extend(doc_id for _, doc_id in entries[self.max_per_session :])
+        return expired
+
+    def relationship_cutoff(self, now: Optional[datetime] = None) -> Optional[str]:
+        """
+        ISO timestamp before which graph relationships are stale.
+
+        Naive local time, matching the timestamps ``GraphMemoryAdapter`` writes.
+
+        Args:
+            now (datetime, optional): Current time. Defaults to ``datetime.now()``.
+
+        Returns:
+            Optional[str]: The cutoff, or None if relationships never expire.
+        """
+        if self.relationship_max_age is None:
+            return None
+        return ((now or datetime.now()) - timedelta(seconds=self.relationship_max_age)).isoformat()
+
+
+@dataclass
+class CompactionReport:
+    """Outcome of one :class:`CompactionJob` run.
+
+    Attributes:
+        vectors_scanned (int): Messages checked against the policy.
+        vectors_deleted (int): Expired messages deleted from vector memory.
+        relationships_deleted (int): Stale relationships pruned from the graph.
+        entities_deleted (int): Entities pruned because they had no relationships left.
+        bytes_reclaimed (int): Bytes freed by compacting the vector store.
+        duration (float): Seconds the run took.
+    """
+
+    vectors_scanned: int = 0
+    vectors_deleted: int = 0
+    relationships_deleted: int = 0
+    entities_deleted: int = 0
+    bytes_reclaimed: int = 0
+    duration: float = 0.0
+
+
+class CompactionJob:
+    """Applies a :class:`RetentionPolicy` to vector and graph memory.
+
+    Expired messages are deleted through ``VectorMemoryAdapter.delete`` in
+    batches; stale relationships and then orphaned entities are pruned with
+    batched Cypher. Afterwards the vector store is compacted if it supports it
+    (see ``NumpyVectorStore.compact``). Run it once with :meth:`run_once` or
+    every ``interval`` seconds on a daemon thread with :meth:`start`.
+
+    Args:
+        policy (RetentionPolicy): What to expire.
+        vector_memory_adapter (VectorMemoryAdapter, optional): Vector memory to
+            clean up. Defaults to None.
+        graph_memory_adapter (GraphMemoryAdapter, optional): Graph memory to
+            clean up. Defaults to None.
+        interval (float, optional): Seconds between background runs. Defaults to 3600.
+        batch_size (int, optional): Ids per ``delete`` call and rows per prune
+            query. Defaults to 500.
+        compact_min_dead_ratio (float, optional): Fraction of deleted rows the
+            vector store must hold before it is compacted. Defaults to 0.1.
+    """
+
+    def __init__(
+        self,
+        policy: RetentionPolicy,
+        vector_memory_adapter: Optional["VectorMemoryAdapter"] = None,
+        graph_memory_adapter: Optional["GraphMemoryAdapter"] = None,
+        interval: float = 3600.0,
+        batch_size: int = 500,
+        compact_min_dead_ratio: float = 0.1,
+    ):
+        self.policy = policy
+        self.vector_memory = vector_memory_adapter
+        self.graph_memory = graph_memory_adapter
+        self.interval = interval
+        self.batch_size = batch_size
+        self.compact_min_dead_ratio = compact_min_dead_ratio
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> CompactionReport:
+        """Expire, prune and compact once."""
+        start = time.perf_counter()
+        report = CompactionReport()
+        if self.vector_memory is not None:
+            self._expire_vectors(report)
+        if self.graph_memory is not None:
+            self._prune_graph(report)
+        report.duration = time.perf_counter() - start
+
+        metrics.inc("neurotrace_retention_deleted_total", report.vectors_deleted, kind="vectors")
+        metrics.inc("neurotrace_retention_deleted_total", report.relationships_deleted, kind="relationships")
+        metrics.inc("neurotrace_retention_deleted_total", report.entities_deleted, kind="entities")
+        metrics.inc("neurotrace_retention_reclaimed_bytes_total", report.bytes_reclaimed)
+        logger.info(
+            "Retention: %d/%d vectors deleted, %d relationships and %d entities pruned, %d bytes reclaimed in %.2fs",
+            report.vectors_deleted,
+            report.vectors_scanned,
+            report.relationships_deleted,
+            report.entities_deleted,
+            report.bytes_reclaimed,
+            report.duration,
+        )
+        return report
+
+    def _expire_vectors(self, report: CompactionReport) -> None:
+        items = self.vector_memory.metadata_items()
+        expired = self.policy.expired(items)
+        report.vectors_scanned = len(items)
+        for start in range(0, len(expired), self.batch_size):
+            self.vector_memory.delete(expired[start : start + self.batch_size])
+        report.vectors_deleted = len(expired)
+
+        store = self.vector_memory.vector_store
+        if hasattr(store, "compact"):
+            report.bytes_reclaimed = store.compact(min_dead_ratio=self.compact_min_dead_ratio)
+
+    def _prune_graph(self, report: CompactionReport) -> None:
+        cutoff = self.policy.relationship_cutoff()
+        if cutoff is not None:
+            report.relationships_deleted = self.graph_memory.prune_relationships(cutoff, self.batch_size)
+        report.entities_deleted = self.graph_memory.prune_orphan_entities(self.batch_size)
+
+    def start(self) -> None:
+        """Run the job every ``interval`` seconds on a daemon thread until :meth:`stop`."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="neurotrace-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread, waiting up to ``timeout`` seconds for a run in progress."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Retention run failed")
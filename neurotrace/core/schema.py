@@ -11,14 +11,14 @@ Note:
 
 import uuid
 from datetime import UTC, datetime
-from typing import List, Literal, Optional, Union
+from typing import Iterable, List, Literal, Optional, Union
 
-from langchain_community.vectorstores.utils import filter_complex_metadata
 from langchain_core.documents import Document
 from langchain_core.messages import AIMessage, HumanMessage
 from pydantic import BaseModel, Field
 
 from neurotrace.core.constants import Role
+from neurotrace.core.utils import estimate_tokens
 
 
 class EmotionTag(BaseModel):
@@ -41,6 +41,9 @@ class MessageMetadata(BaseModel):
     Attributes:
         token_count (Optional[int]): Number of tokens in the associated message.
         embedding (Optional[List[float]]): Vector representation of the message content.
+        embedding_offset (Optional[int]): Row of the embedding in a vector store's
+            append-only embedding log. Set instead of ``embedding`` once the vector
+            has been written to such a store.
         source (Optional[Literal["chat", "web", "api", "system"]]): Origin of the message.
             Defaults to "chat".
         tags (Optional[List[str]]): List of categorical tags. Defaults to empty list.
@@ -55,6 +58,7 @@ class MessageMetadata(BaseModel):
 
     token_count: Optional[int] = None
     embedding: Optional[List[float]] = None
+    embedding_offset: Optional[int] = None
     source: Optional[Literal["chat", "web", "api", "system"]] = "chat"
     tags: Optional[List[str]] = []
     thread_id: Optional[str] = None
@@ -109,7 +113,7 @@ class Message(BaseModel):
             in metadata. TODO: Implement a more accurate token counting method.
         """
         # todo: Implement a more accurate token counting method
-        return self.metadata.token_count or len(self.content.split())
+        return self.metadata.token_count or estimate_tokens(self.content)
 
     def to_langchain_message(self) -> Union[HumanMessage, AIMessage]:
         """Converts this Message to a LangChain compatible format.
@@ -158,11 +162,7 @@ class Message(BaseModel):
             Document: A LangChain Document instance containing the message content
                 and filtered metadata.
         """
-        raw_metadata = self.metadata.model_dump() if self.metadata else {}
-        doc = Document(page_content=self.content, metadata={"id": self.id, "role": self.role, **raw_metadata})
-        doc = filter_complex_metadata([doc])  # Remove lists, dicts, etc.
-
-        return doc[0]
+        return messages_to_documents([self])[0]
 
     @staticmethod
     def from_document(doc: Document) -> "Message":
@@ -170,7 +170,7 @@ class Message(BaseModel):
 
         Extracts content and metadata from a LangChain Document to create
         a new Message instance. The role is extracted from metadata with
-        a fallback to HUMAN if not specified.
+        a fallback to HUMAN if not specified. The document is not modified.
 
         Args:
             doc (Document): The LangChain Document to convert from.
@@ -179,14 +179,7 @@ class Message(BaseModel):
             Message: A new Message instance containing the document's content
                 and metadata.
         """
-        metadata = doc.metadata or {}
-        role_str = metadata.pop("role", Role.HUMAN.value)  # fallback to human
-        return Message(
-            role=Role.from_string(role_str),
-            content=doc.page_content,
-            metadata=MessageMetadata(**metadata) if metadata else None,
-            id=metadata.get("id"),
-        )
+        return documents_to_messages([doc])[0]
 
     def __eq__(self, other):
         """Checks equality between two Message objects.
@@ -225,3 +218,76 @@ class Message(BaseModel):
                 and metadata.
         """
         return f"[{self.timestamp.isoformat()}] ({self.role}): {self.content}"
+
+
+# Metadata values a vector store can hold as-is; everything else (lists, nested
+# models, None) is dropped, matching langchain's ``filter_complex_metadata``.
+_SIMPLE_METADATA_TYPES = (str, bool, int, float)
+_METADATA_FIELDS = frozenset(MessageMetadata.model_fields)
+# Passing every field up front keeps pydantic from resolving defaults per message.
+_METADATA_DEFAULTS = {name: field.default for name, field in MessageMetadata.model_fields.items()}
+
+
+def messages_to_documents(messages: Iterable[Message]) -> List[Document]:
+    """Convert messages to LangChain Documents in one pass.
+
+    Equivalent to calling :meth:`Message.to_document` on each message, but reads
+    the metadata fields directly instead of going through ``model_dump()`` and
+    drops complex values while building each dict rather than in a second
+    filtering pass. Embedding lists are never copied.
+
+    Args:
+        messages (Iterable[Message]): Messages to convert.
+
+    Returns:
+        List[Document]: One document per message, in order.
+    """
+    documents = []
+    for msg in messages:
+        metadata = {"id": msg.id, "role": msg.role}
+        if msg.metadata is not None:
+            for key, value in msg.metadata.__dict__.items():
+                if isinstance(value, _SIMPLE_METADATA_TYPES):
+                    metadata[key] = value
+        documents.append(Document(page_content=msg.content, metadata=metadata))
+    return documents
+
+
+def documents_to_messages(documents: Iterable[Document]) -> List[Message]:
+    """Convert LangChain Documents back to messages without mutating them.
+
+    Each message is validated in a single call from a plain dict that already
+    holds every metadata field, instead of building ``MessageMetadata`` first and
+    letting pydantic resolve defaults and default factories per document.
+
+    A numeric ``created_at`` in the document metadata (epoch seconds, as
+    written by ``VectorMemoryAdapter``) becomes the message timestamp; other
+    documents are stamped with the current time.
+
+    Args:
+        documents (Iterable[Document]): Documents to convert, e.g. vector store
+            search results.
+
+    Returns:
+        List[Message]: One message per document, in order.
+
+    Raises:
+        ValueError: If a document carries an unknown role.
+    """
+    now = datetime.now(UTC)
+    messages = []
+    for doc in documents:
+        metadata = doc.metadata or {}
+        values = dict(_METADATA_DEFAULTS)  # validation copies the list defaults
+        values.update((key, value) for key, value in metadata.items() if key in _METADATA_FIELDS)
+        created_at = metadata.get("created_at")
+        messages.append(
+            Message(
+                id=metadata.get("id") or doc.id or str(uuid.uuid4()),
+                role=Role.from_string(metadata.get("role", Role.HUMAN.value)).value,  # fallback to human
+                content=doc.page_content,
+                timestamp=datetime.fromtimestamp(created_at, UTC) if isinstance(created_at, (int, float)) else now,
+                metadata=values,
+            )
+        )
+    return messages
@@ -0,0 +1,155 @@
+"""
+Snapshot Module.
+
+This module encodes messages into a compact binary snapshot and back, so that
+short-term memory can be moved between workers or kept across restarts with
+ids, timestamps and metadata intact.
+
+A snapshot is a fixed header (magic, format version, message count and the
+length of the record section), followed by one record per message and then a
+single block holding every embedding as raw little-endian float32. Records are
+compact JSON arrays, which the standard library encodes and decodes in C, and
+only carry the metadata fields that differ from their defaults.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from datetime import UTC, datetime
+from typing import Any, Dict, List
+
+from neurotrace.core.schema import EmotionTag, Message, MessageMetadata
+
+MAGIC = b"NTSNAP"
+VERSION = 1
+HEADER = struct.Struct("<6sHII")  # magic, version, message count, record section length
+
+_SWAP_FLOATS = sys.byteorder == "big"  # the embedding block is little-endian
+_METADATA = MessageMetadata().__dict__
+_EMOTIONS = EmotionTag().__dict__
+_METADATA_DEFAULTS = {key: value for key, value in _METADATA.items() if key not in ("embedding", "emotions")}
+_LIST_DEFAULTS = [key for key, value in _METADATA_DEFAULTS.items() if isinstance(value, list)]
+_setattr = object.__setattr__
+
+
+def _construct(cls, values: Dict[str, Any]):
+    # What ``model_construct`` does when every field is given, without its per-field default handling,
+    # which dominates restore time.
+    model = cls.__new__(cls)
+    _setattr(model, "__dict__", values)
+    _setattr(model, "__pydantic_fields_set__", set(values))
+    _setattr(model, "__pydantic_extra__", None)
+    _setattr(model, "__pydantic_private__", None)
+    return model
+
+
+def _sparse_metadata(metadata: MessageMetadata) -> Dict[str, Any]:
+    fields = {
+        key: value
+        for key, value in metadata.__dict__.items()
+        if key in _METADATA_DEFAULTS and _METADATA_DEFAULTS[key] != value
+    }
+    if metadata.emotions is not None:
+        fields["emotions"] = metadata.emotions.__dict__
+    return fields
+
+
+def encode_messages(messages: List[Message]) -> bytes:
+    """
+    Encode messages into a binary snapshot.
+
+    Timestamps are stored as UTC epoch seconds and embeddings as float32, so a
+    restored embedding carries float32 precision.
+
+    Args:
+        messages (List[Message]): Messages to encode, in order.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    records = []
+    embeddings = array("f")
+    for msg in messages:
+        embedding = msg.metadata.embedding
+        if embedding is not None:
+            embeddings.extend(embedding)
+        records.append(
+            [
+                msg.id,
+                msg.role,
+                msg.content,
+                msg.timestamp.timestamp(),
+                _sparse_metadata(msg.metadata),
+                None if embedding is None else len(embedding),
+            ]
+        )
+    body = json.dumps(records, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if _SWAP_FLOATS:
+        embeddings.byteswap()
+    return HEADER.pack(MAGIC, VERSION, len(messages), len(body)) + body + embeddings.tobytes()
+
+
+def decode_messages(data: bytes) -> List[Message]:
+    """
+    Decode a snapshot written by :func:`encode_messages`.
+
+    Messages are rebuilt without re-running validation, since the snapshot
+    was written from validated messages.
+    Metadata fields this version does not know are ignored.
+
+    Args:
+        data (bytes): The snapshot.
+
+    Returns:
+        List[Message]: The messages, in their original order.
+
+    Raises:
+        ValueError: If ``data`` is not a snapshot, uses an unsupported version or is truncated.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Not a neurotrace snapshot: too short.")
+    magic, version, count, body_size = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a neurotrace snapshot.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}; expected {VERSION}.")
+
+    view = memoryview(data)
+    body_end = HEADER.size + body_size
+    records = json.loads(bytes(view[HEADER.size : body_end]))
+    embeddings = array("f")
+    try:
+        embeddings.frombytes(view[body_end:])
+    except ValueError as exc:
+        raise ValueError("Corrupt snapshot: truncated embedding block.") from exc
+    if _SWAP_FLOATS:
+        embeddings.byteswap()
+    if len(records) != count or sum(record[5] or 0 for record in records) != len(embeddings):
+        raise ValueError("Corrupt snapshot: record count or embedding block does not match the header.")
+
+    messages = []
+    offset = 0
+    for msg_id, role, content, timestamp, fields, dims in records:
+        metadata = dict(_METADATA)
+        metadata.update((key, value) for key, value in fields.items() if key in _METADATA)
+        for key in _LIST_DEFAULTS:
+            if key not in fields:
+                metadata[key] = []
+        emotions = metadata["emotions"]
+        if emotions is not None:
+            metadata["emotions"] = _construct(
+                EmotionTag, {key: emotions.get(key, value) for key, value in _EMOTIONS.items()}
+            )
+        if dims is not None:
+            metadata["embedding"] = embeddings[offset : offset + dims].tolist()
+            offset += dims
+        values = {
+            "id": msg_id,
+            "role": role,
+            "content": content,
+            "timestamp": datetime.fromtimestamp(timestamp, UTC),
+            "metadata": _construct(MessageMetadata, metadata),
+        }
+        messages.append(_construct(Message, values))
+    return messages
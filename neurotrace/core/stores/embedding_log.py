@@ -0,0 +1,119 @@
+"""
+Embedding Log Module.
+
+This module provides an append-only, memory-mapped file of float32 embeddings.
+Rows are only ever appended, so a row's offset is a stable handle that messages
+can keep instead of a ``List[float]``, and opening an existing log only maps the
+file instead of reading it.
+"""
+
+import os
+import struct
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+MAGIC = b"NTEMBLOG"
+VERSION = 1
+HEADER = struct.Struct("<8sII")  # magic, version, dimension
+DTYPE = np.dtype("<f4")
+
+
+class EmbeddingLog:
+    """Append-only float32 embedding file with zero-copy reads.
+
+    The file starts with a small header holding the embedding dimension and is
+    followed by the rows back to back. Reads go through a read-only
+    ``np.memmap`` that is re-created lazily after appends, so callers get views
+    into the OS page cache rather than copies.
+
+    Args:
+        path (str): Location of the log file. Created on first append if missing.
+        dim (int, optional): Embedding dimension. Read from the header for an
+            existing file, otherwise inferred from the first append. Defaults to None.
+    """
+
+    def __init__(self, path: Union[str, Path], dim: Optional[int] = None):
+        self.path = Path(path)
+        self.dim = dim
+        self._count = 0
+        self._map: Optional[np.memmap] = None
+
+        if self.path.exists() and self.path.stat().st_size >= HEADER.size:
+            self._open_existing()
+
+    def _open_existing(self) -> None:
+        with open(self.path, "rb") as f:
+            magic, version, dim = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a neurotrace embedding log.")
+        if self.dim is not None and self.dim != dim:
+            raise ValueError(f"Embedding log {self.path} has dimension {dim}, expected {self.dim}.")
+        self.dim = dim
+
+        payload = self.path.stat().st_size - HEADER.size
+        self._count = payload // self._row_bytes
+        if payload % self._row_bytes:
+            # Drop a partially written trailing row left by an interrupted append.
+            with open(self.path, "r+b") as f:
+                f.truncate(HEADER.size + self._count * self._row_bytes)
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dim * DTYPE.itemsize
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the log on disk in bytes."""
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def append(self, vectors: np.ndarray) -> int:
+        """Append rows to the end of the log and fsync them.
+
+        Args:
+            vectors (np.ndarray): Array of shape ``(n, dim)``.
+
+        Returns:
+            int: Offset of the first appended row.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=DTYPE)
+        if vectors.ndim != 2:
+            raise ValueError("Expected a 2-D array of embeddings.")
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match log dimension {self.dim}.")
+
+        if not self.path.exists() or self.path.stat().st_size < HEADER.size:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, self.dim))
+
+        start = self._count
+        with open(self.path, "ab") as f:
+            f.write(vectors.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self._count += len(vectors)
+        self._map = None
+        return start
+
+    def view(self) -> np.ndarray:
+        """Return all rows as a read-only memory-mapped array of shape ``(len, dim)``."""
+        if not self._count:
+            return np.zeros((0, self.dim or 0), dtype=DTYPE)
+        if self._map is None:
+            self._map = np.memmap(self.path, dtype=DTYPE, mode="r", offset=HEADER.size, shape=(self._count, self.dim))
+        return self._map
+
+    def rows(self, offsets: Union[slice, Sequence[int]]) -> np.ndarray:
+        """Return the rows at ``offsets``.
+
+        A slice returns a view into the mapping; a sequence of offsets gathers the
+        rows into a new array.
+        """
+        return self.view()[offsets]
@@ -0,0 +1,536 @@
+"""
+In-Memory Graph Store Module.
+
+This module provides an embedded LangChain ``GraphStore`` for single-process
+deployments and tests. Entities are kept in a dictionary and relationships in
+outgoing and incoming adjacency indexes, so writes and neighbourhood lookups
+never leave the process.
+
+``query`` executes the Cypher subset that ``GraphMemoryAdapter`` issues:
+``MERGE`` of ``Entity`` nodes and typed relationships, optionally driven by
+``UNWIND``, ``ON CREATE SET`` of properties from parameters,
+``CALL db.relationshipTypes()``, the adapter's entity-name and k-hop
+neighbourhood and adjacency reads, its entity merge queries and its retention
+prune queries. Anything else raises ``ValueError``; use the Python read
+methods such as :meth:`InMemoryGraphStore.neighbourhood` instead.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from langchain_community.graphs.graph_store import GraphStore
+
+Triplet = Tuple[str, str, str]
+
+_CLAUSE = re.compile(r"\b(UNWIND|MERGE|ON CREATE SET|CALL)\b")
+_UNWIND = re.compile(r"\$(\w+)\s+AS\s+(\w+)$")
+_MERGE_NODE = re.compile(r"\((\w+):Entity\s*\{\s*name:\s*([\w.$]+)\s*\}\)$")
+_MERGE_RELATIONSHIP = re.compile(r"\((\w+)\)-\[(\w+):(?:`([^`]+)`|(\w+))\]->\((\w+)\)$")
+_ASSIGNMENT = re.compile(r"(\w+)\.(\w+)\s*=\s*([\w.$]+)$")
+_ENTITY_NAMES = re.compile(r"MATCH \(e:Entity\) RETURN e\.name AS (\w+)$")
+_NEIGHBOURHOOD = re.compile(
+    r"MATCH p = \(e:Entity\)-\[\*1\.\.(\d+)\]-\(:Entity\) WHERE e\.name IN \$(\w+) .* LIMIT \$(\w+) "
+    r"RETURN startNode\(r\)\.name AS (\w+), type\(r\) AS (\w+), endNode\(r\)\.name AS (\w+)$"
+)
+
+_MOVE_RELATIONSHIPS = re.compile(
+    r"UNWIND \$(\w+) AS pair MATCH "
+    r"(?:\(alias:Entity \{name: pair\.alias\}\)-\[r:`([^`]+)`\]->\(other:Entity\)"
+    r"|\(other:Entity\)-\[r:`([^`]+)`\]->\(alias:Entity \{name: pair\.alias\}\)) "
+    r"WHERE other\.name <> pair\.canonical .* RETURN count\(\*\) AS (\w+)$"
+)
+_ADJACENCY = re.compile(
+    r"UNWIND \$(\w+) AS name MATCH \(e:Entity \{name: name\}\)-\[r\]-\(other:Entity\) "
+    r"RETURN name AS (\w+), startNode\(r\)\.name AS (\w+), type\(r\) AS (\w+), endNode\(r\)\.name AS (\w+)$"
+)
+_DELETE_ENTITIES = re.compile(r"UNWIND \$(\w+) AS name MATCH \(e:Entity \{name: name\}\) DETACH DELETE e$")
+_PRUNE_RELATIONSHIPS = re.compile(
+    r"MATCH \(:Entity\)-\[r\]->\(:Entity\) WHERE r\.(\w+) < \$(\w+) WITH r LIMIT \$(\w+) DELETE r "
+    r"RETURN count\(\*\) AS (\w+)$"
+)
+_PRUNE_ORPHANS = re.compile(
+    r"MATCH \(e:Entity\) WHERE NOT \(e\)--\(\) WITH e LIMIT \$(\w+) DELETE e RETURN count\(\*\) AS (\w+)$"
+)
+
+
+class _Plan(NamedTuple):
+    """A parsed query: what to run, and the clauses of a write query."""
+
+    kind: str
+    args: Tuple = ()
+    unwind: Optional[Tuple[str, str]] = None
+    ops: Tuple = ()
+
+
+@lru_cache(maxsize=256)
+def _compile(query: str) -> _Plan:
+    """Parse a query once; the adapter reuses a handful of query strings."""
+    flat = " ".join(query.split())
+    if flat == "CALL db.relationshipTypes()":
+        return _Plan("relationship_types")
+    match = _ENTITY_NAMES.match(flat)
+    if match:
+        return _Plan("entity_names", match.groups())
+    match = _NEIGHBOURHOOD.match(flat)
+    if match:
+        return _Plan("neighbourhood", match.groups())
+    match = _ADJACENCY.match(flat)
+    if match:
+        return _Plan("adjacency", match.groups())
+    match = _MOVE_RELATIONSHIPS.match(flat)
+    if match:
+        pairs, outgoing, incoming, column = match.groups()
+        return _Plan("move_relationships", (pairs, outgoing or incoming, outgoing is not None, column))
+    match = _DELETE_ENTITIES.match(flat)
+    if match:
+        return _Plan("delete_entities", match.groups())
+    match = _PRUNE_RELATIONSHIPS.match(flat)
+    if match:
+        return _Plan("prune_relationships", match.groups())
+    match = _PRUNE_ORPHANS.match(flat)
+    if match:
+        return _Plan("prune_orphans", match.groups())
+
+    unsupported = ValueError(f"Unsupported Cypher for InMemoryGraphStore: {flat!r}")
+    parts = _CLAUSE.split(flat)
+    if parts[0].strip():
+        raise unsupported
+    unwind = None
+    target = None
+    ops: List[Tuple] = []
+    for keyword, body in zip(parts[1::2], parts[2::2]):
+        body = body.strip()
+        if keyword == "UNWIND" and not ops and unwind is None and _UNWIND.match(body):
+            unwind = _UNWIND.match(body).groups()
+        elif keyword == "MERGE" and _MERGE_NODE.match(body):
+            ops.append(("node", *_MERGE_NODE.match(body).groups()))
+            target = ops[-1][1]
+        elif keyword == "MERGE" and _MERGE_RELATIONSHIP.match(body):
+            s, var, quoted, plain, o = _MERGE_RELATIONSHIP.match(body).groups()
+            ops.append(("relationship", s, var, quoted or plain, o))
+            target = var
+        elif keyword == "ON CREATE SET" and target:
+            assignments = [_ASSIGNMENT.match(assignment.strip()) for assignment in body.split(",")]
+            if not all(assignments) or any(match.group(1) != target for match in assignments):
+                raise unsupported
+            ops.append(("set", target, tuple(match.groups()[1:] for match in assignments)))
+        else:
+            raise unsupported
+    return _Plan("write", unwind=unwind, ops=tuple(ops))
+
+
+class InMemoryGraphStore(GraphStore):
+    """Embedded graph of ``Entity`` nodes joined by typed, directed relationships.
+
+    Each entity and relationship carries a property dictionary (``created_at``,
+    ``source``, ``tags`` when written by the adapter). Relationships are unique
+    per ``(subject, type, object)``, matching ``MERGE`` semantics.
+
+    Args:
+        path (Union[str, Path], optional): JSON file the graph is loaded from, if
+            it exists, and written to by :meth:`save`. Defaults to None (memory only).
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else None
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._out: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        self._in: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        self._type_counts: Counter = Counter()
+        self._lock = threading.RLock()
+
+        if self.path and self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for name, props in data["nodes"].items():
+                self._nodes[name] = props
+            for s, r, o, props in data["relationships"]:
+                self._merge_relationship(s, r, o, props)
+
+    # ----------------------------------------------------------------- writes
+
+    def _merge_node(self, name: str, props: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], bool]:
+        node = self._nodes.get(name)
+        if node is not None:
+            return node, False
+        node = self._nodes[name] = dict(props or {})
+        return node, True
+
+    def _merge_relationship(
+        self, s: str, relation: str, o: str, props: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        self._merge_node(s)
+        self._merge_node(o)
+        outgoing = self._out.setdefault(s, {})
+        existing = outgoing.get((relation, o))
+        if existing is not None:
+            return existing, False
+        rel = outgoing[(relation, o)] = dict(props or {})
+        self._in.setdefault(o, {})[(relation, s)] = rel
+        self._type_counts[relation] += 1
+        return rel, True
+
+    def add_triplets(self, triplets: Iterable[Triplet], **props: Any) -> int:
+        """
+        Merge ``(subject, relation_type, object)`` triplets directly.
+
+        Args:
+            triplets (Iterable[Triplet]): Relationships to merge. Relation types are
+                used as given.
+            **props: Properties set on newly created relationships.
+
+        Returns:
+            int: Number of relationships created.
+        """
+        with self._lock:
+            return sum(self._merge_relationship(s, r, o, props)[1] for s, r, o in triplets)
+
+    def add_graph_documents(self, graph_documents: List[Any], include_source: bool = False) -> None:
+        """Merge the nodes and relationships of LangChain ``GraphDocument`` objects, keyed by node id."""
+        with self._lock:
+            for document in graph_documents:
+                for node in document.nodes:
+                    self._merge_node(str(node.id), dict(node.properties))
+                for rel in document.relationships:
+                    self._merge_relationship(str(rel.source.id), rel.type, str(rel.target.id), dict(rel.properties))
+
+    def _delete_relationship(self, s: str, relation: str, o: str) -> None:
+        del self._out[s][(relation, o)]
+        del self._in[o][(relation, s)]
+        self._type_counts[relation] -= 1
+        if not self._type_counts[relation]:
+            del self._type_counts[relation]
+
+    def move_relationships(
+        self,
+        alias: str,
+        canonical: str,
+        relation: Optional[str] = None,
+        outgoing: bool = True,
+        incoming: bool = True,
+    ) -> int:
+        """
+        Re-point ``alias``'s relationships at ``canonical``.
+
+        Relationships ``canonical`` already has are kept as they are; the alias's
+        copy is dropped. Relationships between the two entities are left on the
+        alias rather than turned into self-loops.
+
+        Args:
+            alias (str): Entity whose relationships are moved.
+            canonical (str): Entity that receives them.
+            relation (str, optional): Only move this relationship type. Defaults to all.
+            outgoing (bool, optional): Move relationships starting at ``alias``. Defaults to True.
+            incoming (bool, optional): Move relationships ending at ``alias``. Defaults to True.
+
+        Returns:
+            int: Number of relationships moved.
+        """
+        with self._lock:
+            if alias not in self._nodes or canonical not in self._nodes:
+                return 0
+            moved = 0
+            for r, o in list(self._out.get(alias, {}) if outgoing else ()):
+                if (relation is None or r == relation) and o != canonical:
+                    props = self._out[alias][(r, o)]
+                    self._delete_relationship(alias, r, o)
+                    self._merge_relationship(canonical, r, o, props)
+                    moved += 1
+            for r, s in list(self._in.get(alias, {}) if incoming else ()):
+                if (relation is None or r == relation) and s != canonical:
+                    props = self._in[alias][(r, s)]
+                    self._delete_relationship(s, r, alias)
+                    self._merge_relationship(s, r, canonical, props)
+                    moved += 1
+            return moved
+
+    def delete_entities(self, names: Iterable[str]) -> int:
+        """
+        Delete entities together with all of their relationships.
+
+        Args:
+            names (Iterable[str]): Entities to delete. Unknown names are ignored.
+
+        Returns:
+            int: Number of entities deleted.
+        """
+        deleted = 0
+        with self._lock:
+            for name in names:
+                if name not in self._nodes:
+                    continue
+                for r, o in list(self._out.get(name, {})):
+                    self._delete_relationship(name, r, o)
+                for r, s in list(self._in.get(name, {})):
+                    self._delete_relationship(s, r, name)
+                self._out.pop(name, None)
+                self._in.pop(name, None)
+                del self._nodes[name]
+                deleted += 1
+        return deleted
+
+    def prune_relationships(self, before: Any, prop: str = "created_at", limit: Optional[int] = None) -> int:
+        """
+        Delete relationships whose ``prop`` is less than ``before``.
+
+        Relationships without the property are kept, as ``null < x`` is not true in Cypher.
+
+        Args:
+            before (Any): Exclusive upper bound, e.g. an ISO timestamp.
+            prop (str, optional): Relationship property to compare. Defaults to ``"created_at"``.
+            limit (int, optional): Maximum number of relationships to delete. Defaults to None.
+
+        Returns:
+            int: Number of relationships deleted.
+        """
+        with self._lock:
+            stale = (
+                (s, r, o)
+                for s, edges in self._out.items()
+                for (r, o), props in edges.items()
+                if props.get(prop) is not None and props[prop] < before
+            )
+            stale = list(islice(stale, limit))
+            for s, r, o in stale:
+                self._delete_relationship(s, r, o)
+            return len(stale)
+
+    def prune_orphans(self, limit: Optional[int] = None) -> int:
+        """
+        Delete entities without any relationships.
+
+        Args:
+            limit (int, optional): Maximum number of entities to delete. Defaults to None.
+
+        Returns:
+            int: Number of entities deleted.
+        """
+        with self._lock:
+            orphans = (name for name in self._nodes if not self._out.get(name) and not self._in.get(name))
+            return self.delete_entities(list(islice(orphans, limit)))
+
+    def clear(self) -> None:
+        """Remove every entity and relationship."""
+        with self._lock:
+            self._nodes.clear()
+            self._out.clear()
+            self._in.clear()
+            self._type_counts.clear()
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Write the graph to a JSON file, replacing it atomically.
+
+        Args:
+            path (Union[str, Path], optional): Target file. Defaults to the store's ``path``.
+        """
+        target = Path(path) if path else self.path
+        if target is None:
+            raise ValueError("No path given and the store was created without one.")
+        with self._lock:
+            data = {
+                "nodes": self._nodes,
+                "relationships": [
+                    [s, r, o, props] for s, edges in self._out.items() for (r, o), props in edges.items()
+                ],
+            }
+            payload = json.dumps(data, default=str)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, target)
+
+    # ------------------------------------------------------------------ reads
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def relationship_count(self) -> int:
+        return sum(self._type_counts.values())
+
+    def relationship_types(self) -> List[str]:
+        """Relationship types currently in use, sorted."""
+        with self._lock:
+            return sorted(self._type_counts)
+
+    def entity_names(self) -> List[str]:
+        """Names of all entities."""
+        with self._lock:
+            return list(self._nodes)
+
+    def get_entity(self, name: str) -> Optional[Dict[str, Any]]:
+        """Properties of the entity ``name``, or None if it does not exist."""
+        with self._lock:
+            node = self._nodes.get(name)
+            return dict(node) if node is not None else None
+
+    def triplets(self) -> List[Triplet]:
+        """Every relationship as ``(subject, relation_type, object)``."""
+        with self._lock:
+            return [(s, r, o) for s, edges in self._out.items() for r, o in edges]
+
+    def neighbourhood(self, names: Iterable[str], depth: int = 1, limit: Optional[int] = None) -> List[Triplet]:
+        """
+        Relationships within ``depth`` hops of the given entities, in either direction.
+
+        Relationships are returned breadth first, so nearer facts come first.
+
+        Args:
+            names (Iterable[str]): Entities to start from. Unknown names are ignored.
+            depth (int, optional): Number of hops. Defaults to 1.
+            limit (int, optional): Maximum number of relationships. Defaults to None.
+
+        Returns:
+            List[Triplet]: ``(subject, relation_type, object)`` triplets.
+        """
+        with self._lock:
+            frontier = deque((name, 0) for name in dict.fromkeys(names) if name in self._nodes)
+            visited = {name for name, _ in frontier}
+            seen: set = set()
+            found: List[Triplet] = []
+            while frontier:
+                name, hops = frontier.popleft()
+                if hops >= depth:
+                    continue
+                edges = [((name, r, o), o) for r, o in self._out.get(name, {})]
+                edges += [((s, r, name), s) for r, s in self._in.get(name, {})]
+                for triplet, other in edges:
+                    if triplet not in seen:
+                        seen.add(triplet)
+                        found.append(triplet)
+                        if limit is not None and len(found) >= limit:
+                            return found
+                    if other not in visited:
+                        visited.add(other)
+                        frontier.append((other, hops + 1))
+            return found
+
+    # ----------------------------------------------------------------- schema
+
+    @property
+    def get_schema(self) -> str:
+        types = self.relationship_types()
+        return "\n".join(
+            [
+                "Node properties:",
+                "Entity {name: STRING, created_at: STRING}",
+                "Relationship properties:",
+                *(f"{r} {{created_at: STRING, source: STRING, tags: LIST}}" for r in types),
+                "The relationships:",
+                *(f"(:Entity)-[:{r}]->(:Entity)" for r in types),
+            ]
+        )
+
+    @property
+    def get_structured_schema(self) -> Dict[str, Any]:
+        types = self.relationship_types()
+        rel_props = [
+            {"property": "created_at", "type": "STRING"},
+            {"property": "source", "type": "STRING"},
+            {"property": "tags", "type": "LIST"},
+        ]
+        return {
+            "node_props": {
+                "Entity": [{"property": "name", "type": "STRING"}, {"property": "created_at", "type": "STRING"}]
+            },
+            "rel_props": {r: rel_props for r in types},
+            "relationships": [{"start": "Entity", "type": r, "end": "Entity"} for r in types],
+            "metadata": {"constraint": [], "index": []},
+        }
+
+    def refresh_schema(self) -> None:
+        """The schema is derived from the stored data on every access; nothing to refresh."""
+
+    # ------------------------------------------------------------------ Cypher
+
+    def query(self, query: str, params: dict = {}) -> List[Dict[str, Any]]:
+        """
+        Execute a query from the supported Cypher subset.
+
+        Each distinct query string is parsed once and cached.
+
+        Args:
+            query (str): ``MERGE``/``UNWIND`` write query, ``CALL db.relationshipTypes()``,
+                or one of ``GraphMemoryAdapter``'s read queries.
+            params (dict, optional): Query parameters.
+
+        Returns:
+            List[Dict[str, Any]]: Result records; empty for write queries.
+
+        Raises:
+            ValueError: If the query is outside the supported subset.
+        """
+        plan = _compile(query)
+        if plan.kind == "relationship_types":
+            return [{"relationshipType": r} for r in self.relationship_types()]
+        if plan.kind == "entity_names":
+            return [{plan.args[0]: name} for name in self.entity_names()]
+        if plan.kind == "neighbourhood":
+            hops, names, limit, *columns = plan.args
+            triplets = self.neighbourhood(params[names], depth=int(hops), limit=params[limit])
+            return [dict(zip(columns, triplet)) for triplet in triplets]
+        if plan.kind == "adjacency":
+            names, *columns = plan.args
+            return [
+                dict(zip(columns, (name, *triplet))) for name in params[names] for triplet in self.neighbourhood([name])
+            ]
+        if plan.kind == "move_relationships":
+            pairs, relation, outgoing, column = plan.args
+            moved = sum(
+                self.move_relationships(pair["alias"], pair["canonical"], relation, outgoing, not outgoing)
+                for pair in params[pairs]
+            )
+            return [{column: moved}]
+        if plan.kind == "delete_entities":
+            self.delete_entities(params[plan.args[0]])
+            return []
+        if plan.kind == "prune_relationships":
+            prop, before, limit, column = plan.args
+            return [{column: self.prune_relationships(params[before], prop, params[limit])}]
+        if plan.kind == "prune_orphans":
+            limit, column = plan.args
+            return [{column: self.prune_orphans(params[limit])}]
+
+        if plan.unwind is None:
+            rows: List[Dict[str, Any]] = [{}]
+        else:
+            param, alias = plan.unwind
+            rows = [{alias: row} for row in params.get(param) or []]
+        with self._lock:
+            for row in rows:
+                self._execute(plan.ops, params, row)
+        return []
+
+    def _execute(self, ops: Tuple, params: dict, row: Dict[str, Any]) -> None:
+        """Run the MERGE / ON CREATE SET clauses of a write query for one row."""
+
+        def value(expr: str) -> Any:
+            if expr[0] == "$":
+                return params[expr[1:]]
+            var, _, field = expr.partition(".")
+            return row[var][field] if field else row[var]
+
+        bound: Dict[str, Tuple[Dict[str, Any], bool]] = {}
+        names: Dict[str, str] = {}
+        for op in ops:
+            if op[0] == "node":
+                _, var, expr = op
+                names[var] = value(expr)
+                bound[var] = self._merge_node(names[var])
+            elif op[0] == "relationship":
+                _, s, var, relation, o = op
+                bound[var] = self._merge_relationship(names[s], relation, names[o])
+            else:
+                _, var, assignments = op
+                props, created = bound[var]
+                if created:
+                    for prop, expr in assignments:
+                        props[prop] = value(expr)
@@ -0,0 +1,690 @@
+"""
+NumPy Vector Store Module.
+
+This module provides an in-process LangChain ``VectorStore`` backed by a single
+contiguous float32 matrix. Exact search is one matrix-vector product over the
+normalised embeddings and an optional inverted-file (IVF) index narrows the scan
+for large collections. Persistent stores keep their vectors in an append-only
+:class:`EmbeddingLog` that is searched memory-mapped, so startup never reads the
+vectors and writes never rewrite existing ones.
+"""
+
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from neurotrace.core.stores.embedding_log import EmbeddingLog
+
+VECTORS_FILE = "vectors.f32"
+RECORDS_FILE = "records.jsonl"
+# Compaction writes the new files next to the live ones under this suffix first.
+COMPACT_SUFFIX = ".compact"
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise rows so that a dot product equals cosine similarity."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the ``k`` highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    candidates = np.argpartition(-scores, k)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+class IVFIndex:
+    """Inverted-file index for approximate nearest-neighbour search.
+
+    Vectors are clustered with spherical k-means into ``n_lists`` cells. A query
+    is compared against the centroids first and only the rows of the
+    ``n_probe`` closest cells are scored exactly.
+
+    Args:
+        n_lists (int, optional): Number of clusters. Defaults to 256.
+        n_probe (int, optional): Number of clusters scanned per query. Defaults to 8.
+        train_threshold (int, optional): Minimum number of vectors before the index
+            is trained. Smaller collections are always searched exactly.
+            Defaults to ``n_lists * 39``.
+        n_iter (int, optional): Number of k-means iterations. Defaults to 10.
+        seed (int, optional): Seed for centroid initialisation. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        n_lists: int = 256,
+        n_probe: int = 8,
+        train_threshold: Optional[int] = None,
+        n_iter: int = 10,
+        seed: int = 0,
+    ):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_threshold = train_threshold if train_threshold is not None else n_lists * 39
+        self.n_iter = n_iter
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._list_arrays: List[Optional[np.ndarray]] = []
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _assign(self, vectors: np.ndarray, block_size: int = 65536) -> np.ndarray:
+        """Assign each row to its closest centroid, in blocks to bound memory."""
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), block_size):
+            block = vectors[start : start + block_size]
+            assignments[start : start + block_size] = np.argmax(block @ self.centroids.T, axis=1)
+        return assignments
+
+    def train(self, vectors: np.ndarray, rows: Optional[np.ndarray] = None) -> None:
+        """Cluster ``vectors`` and build the inverted lists.
+
+        Args:
+            vectors (np.ndarray): Normalised vectors, one per row.
+            rows (np.ndarray, optional): Store row position of each vector. Defaults
+                to ``0..len(vectors)-1``.
+        """
+        if rows is None:
+            rows = np.arange(len(vectors))
+        n_lists = min(self.n_lists, len(vectors))
+        rng = np.random.default_rng(self.seed)
+        self.centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].astype(np.float32)
+
+        for _ in range(self.n_iter):
+            assignments = self._assign(vectors)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignments, vectors)
+            counts = np.bincount(assignments, minlength=n_lists)
+            non_empty = counts > 0
+            self.centroids[non_empty] = _normalise(sums[non_empty])
+
+        assignments = self._assign(vectors)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        self._lists = [rows[order[bounds[i] : bounds[i + 1]]].tolist() for i in range(n_lists)]
+        self._list_arrays = [None] * n_lists
+
+    def add(self, vectors: np.ndarray, start_row: int) -> None:
+        """Route newly appended rows into their closest lists.
+
+        Args:
+            vectors (np.ndarray): Normalised vectors that were appended to the store.
+            start_row (int): Row position of the first vector.
+        """
+        if not self.is_trained or not len(vectors):
+            return
+        for offset, list_id in enumerate(self._assign(vectors)):
+            self._lists[list_id].append(start_row + offset)
+            self._list_arrays[list_id] = None
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        """Return the row positions to score exactly for ``query``."""
+        probe = _top_k(self.centroids @ query, self.n_probe)
+        for list_id in probe:
+            if self._list_arrays[list_id] is None:
+                self._list_arrays[list_id] = np.asarray(self._lists[list_id], dtype=np.int64)
+        return np.concatenate([self._list_arrays[list_id] for list_id in probe])
+
+
+class _MatrixBuffer:
+    """Growable in-memory float32 matrix used by stores that are not persisted.
+
+    Exposes the same ``append``/``view`` surface as :class:`EmbeddingLog`.
+    """
+
+    def __init__(self):
+        self.dim: Optional[int] = None
+        self._data: Optional[np.ndarray] = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes if self._data is not None else 0
+
+    def append(self, vectors: np.ndarray) -> int:
+        if self._data is None:
+            self.dim = vectors.shape[1]
+            self._data = np.empty((max(len(vectors), 64), self.dim), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match store dimension {self.dim}.")
+        required = self._count + len(vectors)
+        if required > len(self._data):
+            # Grow geometrically so appends stay amortised O(1).
+            data = np.empty((max(required, 2 * len(self._data)), self.dim), dtype=np.float32)
+            data[: self._count] = self._data[: self._count]
+            self._data = data
+        start = self._count
+        self._data[start:required] = vectors
+        self._count = required
+        return start
+
+    def view(self) -> np.ndarray:
+        if self._data is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self._data[: self._count]
+
+    def rows(self, offsets: Union[slice, Sequence[int]]) -> np.ndarray:
+        return self.view()[offsets]
+
+
+class NumpyVectorStore(VectorStore):
+    """In-process vector store backed by a contiguous NumPy matrix.
+
+    Embeddings are L2-normalised on insert and kept in one float32 matrix, so
+    exact cosine search is a single matrix-vector product. Deleted rows are
+    tombstoned and skipped at query time.
+
+    With a ``persist_directory`` the matrix is an append-only
+    :class:`EmbeddingLog` and ids, texts and metadata go to an append-only JSON
+    lines file. Both are fsynced before a write returns. Reopening the store maps
+    the vectors instead of reading them; ids, texts and metadata are rebuilt by
+    reading the records file, which :meth:`compact` shrinks back to one line per
+    live document. Each returned document
+    carries its row in ``metadata["embedding_offset"]``; offsets are stable until
+    the store is compacted with :meth:`compact`.
+
+    Args:
+        embedding (Embeddings): Embedding model used for documents and queries.
+        persist_directory (str, optional): Directory holding the vector log and the
+            records file. Existing data is loaded from it. Defaults to None
+            (in-memory only).
+        index (IVFIndex, optional): Approximate index used once the collection
+            reaches ``index.train_threshold`` vectors. Defaults to None (always exact).
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        persist_directory: Optional[str] = None,
+        index: Optional[IVFIndex] = None,
+    ):
+        self.embedding = embedding
+        self.persist_directory = persist_directory
+        self.index = index
+
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._texts: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+        if persist_directory:
+            directory = Path(persist_directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            self._finish_compaction(directory)
+            self._vectors: Union[EmbeddingLog, _MatrixBuffer] = EmbeddingLog(directory / VECTORS_FILE)
+            self._records_path: Optional[Path] = directory / RECORDS_FILE
+            self._replay_records()
+        else:
+            self._vectors = _MatrixBuffer()
+            self._records_path = None
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return len(self._id_to_row)
+
+    @property
+    def _size(self) -> int:
+        return len(self._vectors)
+
+    # ---------------------------------------------------------------- writes
+
+    def _encode_records(self, records: Iterable[Dict[str, Any]]) -> str:
+        if self._records_path is None:
+            return ""
+        return "".join(json.dumps(record) + "\n" for record in records)
+
+    def _write_records(self, payload: str) -> None:
+        if self._records_path is None or not payload:
+            return
+        with open(self._records_path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _grow_rows(self, size: int) -> None:
+        """Extend the per-row bookkeeping to ``size`` rows."""
+        missing = size - len(self._ids)
+        if missing <= 0:
+            return
+        self._ids.extend([None] * missing)
+        self._texts.extend([None] * missing)
+        self._metadatas.extend([None] * missing)
+        if size > len(self._alive):
+            alive = np.zeros(max(size, 2 * len(self._alive)), dtype=bool)
+            alive[: len(self._alive)] = self._alive
+            self._alive = alive
+
+    def add_embeddings(
+        self,
+        text_embeddings: Iterable[Tuple[str, List[float]]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Add texts with precomputed embeddings.
+
+        Existing ids are replaced: the old row is tombstoned and the new one appended.
+        If an id occurs more than once in the batch, only its last text is stored.
+
+        Args:
+            text_embeddings (Iterable[Tuple[str, List[float]]]): Pairs of text and embedding.
+            metadatas (List[dict], optional): Metadata per text. Defaults to None.
+            ids (List[str], optional): Ids per text. Falls back to ``metadata["id"]``
+                and then to a random UUID. Defaults to None.
+
+        Returns:
+            List[str]: The ids of the added texts.
+        """
+        pairs = list(text_embeddings)
+        if not pairs:
+            return []
+        texts = [text for text, _ in pairs]
+        metadatas = [dict(m) for m in metadatas] if metadatas else [{} for _ in texts]
+        if ids is None:
+            ids = [m.get("id") or str(uuid.uuid4()) for m in metadatas]
+        if not (len(ids) == len(metadatas) == len(texts)):
+            raise ValueError("texts, metadatas and ids must have the same length.")
+
+        vectors = _normalise(np.asarray([vector for _, vector in pairs], dtype=np.float32))
+        last = {doc_id: i for i, doc_id in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            vectors = vectors[keep]
+            texts, metadatas = [texts[i] for i in keep], [metadatas[i] for i in keep]
+            unique_ids = [ids[i] for i in keep]
+        else:
+            unique_ids = list(ids)
+
+        for metadata in metadatas:
+            metadata.pop("embedding_offset", None)
+
+        with self._lock:
+            rows = range(self._size, self._size + len(vectors))
+            # Encoded before anything changes, so metadata that JSON cannot hold leaves the store untouched.
+            payload = self._encode_records(
+                {"op": "add", "row": row, "id": doc_id, "text": text, "metadata": metadata}
+                for row, doc_id, text, metadata in zip(rows, unique_ids, texts, metadatas)
+            )
+            self.delete(unique_ids)
+            start = self._vectors.append(vectors)
+            self._grow_rows(start + len(vectors))
+            for row, doc_id, text, metadata in zip(rows, unique_ids, texts, metadatas):
+                self._ids[row], self._texts[row], self._metadatas[row] = doc_id, text, metadata
+                self._id_to_row[doc_id] = row
+                self._alive[row] = True
+            self._write_records(payload)
+            if self.index is not None:
+                self.index.add(vectors, start)
+        return list(ids)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed texts in one batch and add them to the store.
+
+        Args:
+            texts (Iterable[str]): Texts to add.
+            metadatas (List[dict], optional): Metadata per text. Defaults to None.
+            ids (List[str], optional): Ids per text. Defaults to None.
+
+        Returns:
+            List[str]: The ids of the added texts.
+        """
+        texts = list(texts)
+        vectors = self.embedding.embed_documents(texts)
+        return self.add_embeddings(zip(texts, vectors), metadatas=metadatas, ids=ids)
+
+    def delete(self, ids: Optional[Sequence[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Tombstone documents by id. Unknown ids are ignored.
+
+        Args:
+            ids (Sequence[str], optional): Ids of the documents to delete.
+
+        Returns:
+            Optional[bool]: True once the ids are no longer searchable.
+        """
+        with self._lock:
+            records = []
+            for doc_id in ids or []:
+                row = self._id_to_row.pop(doc_id, None)
+                if row is not None:
+                    self._alive[row] = False
+                    records.append({"op": "delete", "id": doc_id})
+            self._write_records(self._encode_records(records))
+        return True
+
+    def compact(self, min_dead_ratio: float = 0.0) -> int:
+        """Drop tombstoned rows and reclaim their space.
+
+        Live rows are renumbered in order, so ``embedding_offset`` values handed
+        out before compaction no longer apply. Persistent stores write a new
+        vector log and records file beside the old ones and swap them in; the
+        records file is replaced first and carries a marker naming the pending
+        vector log, so a store reopened after an interrupted compaction finishes
+        the swap instead of pairing old vectors with new records.
+
+        Args:
+            min_dead_ratio (float, optional): Only compact once at least this
+                fraction of rows is tombstoned. Defaults to 0.0 (any dead row).
+
+        Returns:
+            int: Bytes reclaimed, 0 if nothing was compacted.
+        """
+        with self._lock:
+            size = self._size
+            live = np.flatnonzero(self._alive[:size])
+            dead = size - len(live)
+            if not dead or dead < min_dead_ratio * size:
+                return 0
+            before = self._footprint()
+            vectors = self._vectors.rows(live)
+            ids = [self._ids[row] for row in live]
+            texts = [self._texts[row] for row in live]
+            metadatas = [self._metadatas[row] for row in live]
+
+            if self._records_path is None:
+                self._vectors = _MatrixBuffer()
+                if len(live):
+                    self._vectors.append(vectors)
+            else:
+                self._write_compacted(vectors, ids, texts, metadatas)
+                self._vectors = EmbeddingLog(self._vectors.path)
+
+            self._ids, self._texts, self._metadatas = ids, texts, metadatas
+            self._alive = np.ones(len(ids), dtype=bool)
+            self._id_to_row = {doc_id: row for row, doc_id in enumerate(ids)}
+            if self.index is not None and self.index.is_trained:
+                if ids:
+                    self._train_index()
+                else:
+                    self.index.centroids = None
+            return max(before - self._footprint(), 0)
+
+    def _footprint(self) -> int:
+        """Bytes held by the vectors plus, for persistent stores, the records file."""
+        records = self._records_path.stat().st_size if self._records_path and self._records_path.exists() else 0
+        return self._vectors.nbytes + records
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        rows = [self._id_to_row[doc_id] for doc_id in ids if doc_id in self._id_to_row]
+        return [self._document(row) for row in rows]
+
+    def offsets_of(self, ids: Sequence[str]) -> List[Optional[int]]:
+        """Return the vector row of each id, or None for unknown ids."""
+        return [self._id_to_row.get(doc_id) for doc_id in ids]
+
+    def metadata_items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return ``(id, metadata)`` for every live document.
+
+        The metadata dictionaries are the store's own and must not be modified.
+        """
+        with self._lock:
+            return [(doc_id, self._metadatas[row]) for doc_id, row in self._id_to_row.items()]
+
+    def documents_page(self, start: int, limit: int) -> List[Document]:
+        """Return up to ``limit`` live documents stored at row ``start`` or later.
+
+        Documents are listed in row order, so documents added while the pages
+        are walked come last. Rows do not move on delete, so a walk that resumes
+        at the row after the last document it saw (its ``embedding_offset``)
+        misses nothing; only :meth:`compact` renumbers rows.
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._alive[start : self._size])[:limit] + start
+            return [self._document(row) for row in rows.tolist()]
+
+    def get_vectors(self, offsets: Union[slice, Sequence[int]]) -> np.ndarray:
+        """Return the normalised vectors stored at ``offsets``.
+
+        Slices are zero-copy views into the matrix (or its memory mapping).
+        """
+        return self._vectors.rows(offsets)
+
+    # --------------------------------------------------------------- search
+
+    def _document(self, row: int) -> Document:
+        metadata = dict(self._metadatas[row])
+        metadata["embedding_offset"] = row
+        return Document(id=self._ids[row], page_content=self._texts[row], metadata=metadata)
+
+    def _matches(self, row: int, filter: Optional[Dict[str, Any]]) -> bool:
+        metadata = self._metadatas[row]
+        return all(metadata.get(key) == value for key, value in filter.items())
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        exact: bool = False,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """Return the ``k`` documents most similar to ``embedding`` with cosine scores.
+
+        Args:
+            embedding (List[float]): Query embedding.
+            k (int, optional): Number of results. Defaults to 4.
+            filter (Dict[str, Any], optional): Metadata key/value pairs that results
+                must match exactly. Defaults to None.
+            exact (bool, optional): Bypass the IVF index. Defaults to False.
+
+        Returns:
+            List[Tuple[Document, float]]: Documents and similarity scores, best first.
+        """
+        with self._lock:
+            if not self._id_to_row:
+                return []
+            query = _normalise(np.asarray(embedding, dtype=np.float32))
+            matrix = self._vectors.view()
+
+            if self.index is not None and not exact and not self.index.is_trained:
+                if len(self._id_to_row) >= self.index.train_threshold:
+                    self._train_index()
+
+            if self.index is not None and self.index.is_trained and not exact:
+                rows = self.index.candidates(query)
+                rows = rows[self._alive[rows]]
+                scores = matrix[rows] @ query
+            else:
+                # Score the whole matrix in place; slicing avoids copying it.
+                all_scores = matrix @ query
+                rows = np.flatnonzero(self._alive[: self._size])
+                scores = all_scores[rows]
+            if filter:
+                keep = np.asarray([self._matches(row, filter) for row in rows], dtype=bool)
+                rows, scores = rows[keep], scores[keep]
+            if not len(rows):
+                return []
+
+            best = _top_k(scores, k)
+            return [(self._document(int(rows[i])), float(scores[i])) for i in best]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k=k, **kwargs)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k=k, **kwargs)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        # Scores are cosine similarities in [-1, 1]; relevance scores must lie in [0, 1].
+        # Clamped because float32 rounding can put an identical vector's score just above 1.
+        return lambda score: min(max((score + 1.0) / 2.0, 0.0), 1.0)
+
+    def _train_index(self) -> None:
+        alive_rows = np.flatnonzero(self._alive[: self._size])
+        self.index.train(self._vectors.rows(alive_rows), rows=alive_rows)
+
+    def build_index(self) -> None:
+        """Train the IVF index now instead of waiting for the size threshold."""
+        if self.index is None:
+            raise ValueError("No index configured for this store.")
+        with self._lock:
+            self._train_index()
+
+    # ---------------------------------------------------------- persistence
+
+    def _replay_records(self) -> None:
+        """Rebuild ids, texts, metadata and tombstones from the records file."""
+        if not self._records_path.exists():
+            return
+        size = self._size
+        self._grow_rows(size)
+        with open(self._records_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write; everything before it is intact.
+                    break
+                if record["op"] == "add":
+                    row = record["row"]
+                    if row >= size:
+                        continue  # vectors for this record never reached the log
+                    previous = self._id_to_row.get(record["id"])
+                    if previous is not None:
+                        self._alive[previous] = False
+                    self._ids[row], self._texts[row], self._metadatas[row] = (
+                        record["id"],
+                        record["text"],
+                        record["metadata"],
+                    )
+                    self._id_to_row[record["id"]] = row
+                    self._alive[row] = True
+                elif record["op"] == "delete":
+                    row = self._id_to_row.pop(record["id"], None)
+                    if row is not None:
+                        self._alive[row] = False
+
+    @staticmethod
+    def _finish_compaction(directory: Path) -> None:
+        """Complete or discard a compaction that was interrupted before its final swap."""
+        pending = sorted(directory.glob(f"{VECTORS_FILE}.*{COMPACT_SUFFIX}"))
+        (directory / (RECORDS_FILE + COMPACT_SUFFIX)).unlink(missing_ok=True)
+        if not pending:
+            return
+        marker: Dict[str, Any] = {}
+        records_path = directory / RECORDS_FILE
+        if records_path.exists():
+            with open(records_path, "r", encoding="utf-8") as f:
+                try:
+                    marker = json.loads(f.readline() or "{}")
+                except json.JSONDecodeError:
+                    marker = {}
+        for path in pending:
+            if marker.get("op") == "compact" and marker.get("vectors") == path.name:
+                os.replace(path, directory / VECTORS_FILE)
+            else:
+                path.unlink()
+
+    def _write_compacted(
+        self, vectors: np.ndarray, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]
+    ) -> None:
+        directory = self._records_path.parent
+        vectors_path = self._vectors.path
+        pending = directory / f"{VECTORS_FILE}.{uuid.uuid4().hex}{COMPACT_SUFFIX}"
+        records_tmp = directory / (RECORDS_FILE + COMPACT_SUFFIX)
+
+        if len(ids):
+            EmbeddingLog(pending, dim=self._vectors.dim).append(vectors)
+        with open(records_tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "compact", "vectors": pending.name}) + "\n")
+            for row, (doc_id, text, metadata) in enumerate(zip(ids, texts, metadatas)):
+                f.write(json.dumps({"op": "add", "row": row, "id": doc_id, "text": text, "metadata": metadata}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The records file is the commit point; see _finish_compaction.
+        os.replace(records_tmp, self._records_path)
+        if len(ids):
+            os.replace(pending, vectors_path)
+        else:
+            vectors_path.unlink(missing_ok=True)
+
+    def persist(self, persist_directory: Optional[str] = None) -> None:
+        """Write the live documents of this store to ``persist_directory``.
+
+        Stores opened with a ``persist_directory`` are already durable, so calling
+        this without an argument on them is a no-op. Otherwise a fresh vector log
+        and records file are written, dropping tombstoned rows.
+
+        Args:
+            persist_directory (str, optional): Target directory. Defaults to the one
+                given at construction.
+        """
+        target = persist_directory or self.persist_directory
+        if not target:
+            raise ValueError("No persist_directory configured.")
+        if self._records_path is not None and Path(target) == Path(self.persist_directory):
+            return
+
+        directory = Path(target)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in (VECTORS_FILE, RECORDS_FILE):
+            (directory / name).unlink(missing_ok=True)
+
+        with self._lock:
+            rows = list(self._id_to_row.values())
+            log = EmbeddingLog(directory / VECTORS_FILE)
+            if rows:
+                log.append(self._vectors.rows(rows))
+            with open(directory / RECORDS_FILE, "w", encoding="utf-8") as f:
+                for new_row, row in enumerate(rows):
+                    record = {
+                        "op": "add",
+                        "row": new_row,
+                        "id": self._ids[row],
+                        "text": self._texts[row],
+                        "metadata": self._metadatas[row],
+                    }
+                    f.write(json.dumps(record) + "\n")
+
+    @classmethod
+    def load(cls, persist_directory: str, embedding: Embeddings, **kwargs: Any) -> "NumpyVectorStore":
+        """Open a persisted store. Vectors are memory-mapped, not read."""
+        return cls(embedding=embedding, persist_directory=persist_directory, **kwargs)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        store = cls(embedding=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
@@ -1,9 +1,18 @@
+import asyncio
+from typing import AsyncIterator, Dict, Iterator, Optional
+
 from langchain_core.tools import Tool
 
+from neurotrace.core import metrics
 from neurotrace.core.hippocampus.memory_orchestrator import MemoryOrchestrator
-from neurotrace.core.llm_tasks import perform_summarisation
+from neurotrace.core.llm_tasks import (
+    astream_summarisation,
+    perform_summarisation,
+    stream_summarisation,
+)
+from neurotrace.core.prefetch import MemoryPrefetcher
 from neurotrace.core.tools.factory import generic_tool_factory
-from neurotrace.core.utils import load_prompt
+from neurotrace.core.utils import estimate_tokens, load_prompt
 from neurotrace.prompts.task_prompts import PROMPT_SUMMARISE_VECTOR_AND_GRAPH_MEMORY
 
 
@@ -15,7 +24,8 @@ def save_memory_tool(
 ) -> Tool:
     """
     Creates a tool that allows the agent to explicitly save important memories
-    to long-term vector memory.
+    to long-term vector and graph memory. Each save costs one LLM call, which
+    produces both the vector summary and the graph triplets.
 
     Args:
         vector_memory_adapter: The adapter to store messages.
@@ -29,9 +39,10 @@ def save_memory_tool(
         :param memory_orchestrator:
     """
 
+    @metrics.timed("neurotrace_tool_seconds", tool=tool_name)
     def _save(summary: str) -> str:
         """
-        Saves a summary in vector memory using the orchestrator.
+        Saves a summary in vector and graph memory using the orchestrator.
 
         Args:
             summary (str): The summary to save.
@@ -47,9 +58,7 @@ def save_memory_tool(
 
         message_text = message_text.strip()
 
-        _save_in_vector_memory(memory_orchestrator, message_text, convo_tags)
-        _save_in_graph_memory(memory_orchestrator, message_text, convo_tags)
-        return "Memory saved in both vector and graph memory."
+        return memory_orchestrator.save_memory(message_text, tags=convo_tags)
 
     return generic_tool_factory(
         func=_save,
@@ -59,67 +68,180 @@ def save_memory_tool(
     )
 
 
-def _save_in_vector_memory(
-    memory_orchestrator: MemoryOrchestrator,
-    summary: str,
-    tags: list[str] = None,
-) -> str:
+MEMORY_CONTEXT_HEADER = (
+    "This is the summarised context from both vector and graph memory:\n--- START OF MEMORY CONTEXT ---\n\n"
+)
+MEMORY_CONTEXT_FOOTER = "\n\n--- END OF MEMORY CONTEXT ---"
+NO_VECTOR_MEMORY = "No relevant vector memory found."
+NO_GRAPH_MEMORY = "No graph relationships found."
+NO_MEMORY_FOUND = "No relevant memory found."
+DEFAULT_SUMMARY_TOKEN_BUDGET = 200
+
+
+def _memory_placeholders(
+    memory_orchestrator: MemoryOrchestrator, query: str, prefetcher: Optional[MemoryPrefetcher] = None
+) -> Dict[str, str]:
     """
-    Saves a summary in vector memory using the orchestrator.
+    Searches both vector and graph memory and formats the results for the summary prompt.
 
     Args:
-        memory_orchestrator (MemoryOrchestrator): The orchestrator managing memory.
-        summary (str): The summary to save.
-        tags (list[str], optional): Tags associated with the summary. Defaults to None.
+        memory_orchestrator (MemoryOrchestrator): Manages both vector and graph memory.
+        query (str): The question or search query.
+        prefetcher (MemoryPrefetcher, optional): Results it already holds for the
+            query are used instead of searching again. Defaults to None.
 
     Returns:
-        str: Confirmation message indicating the summary was saved.
+        Dict[str, str]: The ``vector_memory`` and ``graph_memory`` prompt placeholders.
     """
+    prefetched = prefetcher.get(query) if prefetcher is not None else None
+    if prefetched is not None:
+        vector_results, graph_result = prefetched
+    else:
+        vector_results = memory_orchestrator.search_vector_memory(query)
+        graph_result = memory_orchestrator.search_graph_memory(query)
 
-    memory_orchestrator.save_in_vector_memory(summary, tags=tags)
-    return "Vector memory saved."
+    # Vector memory: semantic search
+    vector_summary = "\n".join(f"- {doc.content}" for doc in vector_results) if vector_results else NO_VECTOR_MEMORY
 
+    # Graph memory: entity/triplet reasoning
+    graph_summary = graph_result if graph_result else NO_GRAPH_MEMORY
 
-def _save_in_graph_memory(
-    memory_orchestrator: MemoryOrchestrator,
-    summary: str,
-    tags: list[str] = None,
-) -> str:
+    return {"vector_memory": vector_summary, "graph_memory": graph_summary}
+
+
+def _unsummarised_context(placeholders: Dict[str, str], token_budget: Optional[int]) -> Optional[str]:
     """
-    Saves a summary in graph memory using the orchestrator.
+    Returns the memory context without an LLM call when summarising would not help.
 
     Args:
-        memory_orchestrator (MemoryOrchestrator): The orchestrator managing memory.
-        summary (str): The summary to save.
-        tags (list[str], optional): Tags associated with the summary. Defaults to None.
+        placeholders (Dict[str, str]): Output of ``_memory_placeholders``.
+        token_budget (int, optional): Raw results up to this many estimated tokens
+            are returned as they are. None always summarises non-empty results.
 
     Returns:
-        str: Confirmation message indicating the summary was saved.
+        Optional[str]: The raw context, or None if the results should be summarised.
+    """
+    vector_memory, graph_memory = placeholders["vector_memory"], placeholders["graph_memory"]
+    sections = []
+    if vector_memory != NO_VECTOR_MEMORY:
+        sections.append(f"Vector memory:\n{vector_memory}")
+    if graph_memory != NO_GRAPH_MEMORY:
+        sections.append(f"Graph memory:\n{graph_memory}")
+
+    if not sections:
+        metrics.inc("neurotrace_memory_search_unsummarised_total", reason="empty")
+        return NO_MEMORY_FOUND
+    raw_context = "\n\n".join(sections)
+    if token_budget is None or estimate_tokens(raw_context) > token_budget:
+        return None
+    metrics.inc("neurotrace_memory_search_unsummarised_total", reason="within_budget")
+    return raw_context
+
+
+def stream_memory_search(
+    memory_orchestrator: MemoryOrchestrator,
+    query: str,
+    token_budget: Optional[int] = DEFAULT_SUMMARY_TOKEN_BUDGET,
+    prefetcher: Optional[MemoryPrefetcher] = None,
+) -> Iterator[str]:
     """
+    Searches memory and streams the summarised memory context as the LLM produces it.
 
-    memory_orchestrator.save_in_graph_memory(summary, tags=tags)
-    return "Graph memory saved."
+    Args:
+        memory_orchestrator (MemoryOrchestrator): Manages both vector and graph memory.
+        query (str): The question or search query.
+        token_budget (int, optional): Results within this many estimated tokens are
+            returned raw, without an LLM call. None always summarises.
+        prefetcher (MemoryPrefetcher, optional): Serves the lookups when it has
+            already prefetched the query. Defaults to None.
+
+    Yields:
+        str: The context header, the summary chunks and the context footer.
+    """
+    yield MEMORY_CONTEXT_HEADER
+    placeholders = _memory_placeholders(memory_orchestrator, query, prefetcher)
+    raw_context = _unsummarised_context(placeholders, token_budget)
+    if raw_context is not None:
+        yield raw_context
+    else:
+        yield from stream_summarisation(
+            llm=memory_orchestrator.llm,
+            prompt=PROMPT_SUMMARISE_VECTOR_AND_GRAPH_MEMORY,
+            prompt_placeholders=placeholders,
+        )
+    yield MEMORY_CONTEXT_FOOTER
+
+
+async def astream_memory_search(
+    memory_orchestrator: MemoryOrchestrator,
+    query: str,
+    token_budget: Optional[int] = DEFAULT_SUMMARY_TOKEN_BUDGET,
+    prefetcher: Optional[MemoryPrefetcher] = None,
+) -> AsyncIterator[str]:
+    """
+    Async variant of :func:`stream_memory_search`. The memory lookups run in a worker thread.
+
+    Args:
+        memory_orchestrator (MemoryOrchestrator): Manages both vector and graph memory.
+        query (str): The question or search query.
+        token_budget (int, optional): Results within this many estimated tokens are
+            returned raw, without an LLM call. None always summarises.
+        prefetcher (MemoryPrefetcher, optional): Serves the lookups when it has
+            already prefetched the query. Defaults to None.
+
+    Yields:
+        str: The context header, the summary chunks and the context footer.
+    """
+    yield MEMORY_CONTEXT_HEADER
+    placeholders = await asyncio.to_thread(_memory_placeholders, memory_orchestrator, query, prefetcher)
+    raw_context = _unsummarised_context(placeholders, token_budget)
+    if raw_context is not None:
+        yield raw_context
+    else:
+        async for chunk in astream_summarisation(
+            llm=memory_orchestrator.llm,
+            prompt=PROMPT_SUMMARISE_VECTOR_AND_GRAPH_MEMORY,
+            prompt_placeholders=placeholders,
+        ):
+            yield chunk
+    yield MEMORY_CONTEXT_FOOTER
 
 
 def memory_search_tool(
     memory_orchestrator: MemoryOrchestrator,
     tool_name: str = "search_memory",
     tool_description: str = None,
+    summary_token_budget: Optional[int] = DEFAULT_SUMMARY_TOKEN_BUDGET,
+    prefetcher: Optional[MemoryPrefetcher] = None,
     **kwargs,
 ) -> Tool:
     """
     Creates a tool that searches memory (vector + graph) and returns fused results.
 
+    Results are only summarised by the LLM when they exceed ``summary_token_budget``;
+    smaller results, and searches that found nothing, are returned without the
+    extra LLM round trip.
+
+    The tool also has an async implementation that streams the summary from the
+    LLM; use :func:`stream_memory_search` or :func:`astream_memory_search` directly
+    to consume the memory context chunk by chunk.
+
     Args:
         memory_orchestrator (MemoryOrchestrator): Manages both vector and graph memory.
         tool_name (str): Name of the tool. Defaults to "search_memory".
         tool_description (str): Description shown to the agent. Loaded from prompt if None.
+        summary_token_budget (int, optional): Largest raw result, in estimated tokens,
+            returned without summarisation. None always summarises. Defaults to 200.
+        prefetcher (MemoryPrefetcher, optional): The prefetcher given to
+            ``NeurotraceMemory``. Searches for a turn it has prefetched return its
+            results instead of searching again. Defaults to None.
         **kwargs: Other Tool configuration options.
 
     Returns:
         Tool: A LangChain tool for searching across memory.
     """
 
+    @metrics.timed("neurotrace_tool_seconds", tool=tool_name)
     def _search(query: str) -> str:
         """
         Searches both vector and graph memory for relevant info.
@@ -130,38 +252,37 @@ def memory_search_tool(
         Returns:
             str: Combined result from vector and graph memory.
         """
+        placeholders = _memory_placeholders(memory_orchestrator, query, prefetcher)
+        summarised_memory_context = _unsummarised_context(placeholders, summary_token_budget)
+        if summarised_memory_context is None:
+            summarised_memory_context = perform_summarisation(
+                llm=memory_orchestrator.llm,
+                prompt=PROMPT_SUMMARISE_VECTOR_AND_GRAPH_MEMORY,
+                prompt_placeholders=placeholders,
+            )
 
-        # Vector memory: semantic search
-        vector_results = memory_orchestrator.search_vector_memory(query)
-        vector_summary = (
-            "\n".join(f"- {doc.content}" for doc in vector_results)
-            if vector_results
-            else "No relevant vector memory found."
-        )
+        # Combine and return
+        return f"{MEMORY_CONTEXT_HEADER}{summarised_memory_context}{MEMORY_CONTEXT_FOOTER}"
 
-        # Graph memory: entity/triplet reasoning
-        graph_result = memory_orchestrator.search_graph_memory(query)
-        graph_summary = graph_result if graph_result else "No graph relationships found."
+    async def _asearch(query: str) -> str:
+        """
+        Async variant of ``_search`` that streams the summary from the LLM.
 
-        summarised_memory_context = perform_summarisation(
-            llm=memory_orchestrator.llm,
-            prompt=PROMPT_SUMMARISE_VECTOR_AND_GRAPH_MEMORY,
-            prompt_placeholders={
-                "vector_memory": vector_summary,
-                "graph_memory": graph_summary,
-            },
-        )
+        Args:
+            query (str): The question or search query.
 
-        # Combine and return
-        return (
-            "This is the summarised context from both vector and graph memory:\n"
-            "--- START OF MEMORY CONTEXT ---\n\n"
-            f"{summarised_memory_context}\n\n"
-            "--- END OF MEMORY CONTEXT ---"
-        )
+        Returns:
+            str: Combined result from vector and graph memory.
+        """
+        with metrics.timer("neurotrace_tool_seconds", tool=tool_name):
+            chunks = astream_memory_search(
+                memory_orchestrator, query, token_budget=summary_token_budget, prefetcher=prefetcher
+            )
+            return "".join([chunk async for chunk in chunks])
 
     return generic_tool_factory(
         func=_search,
+        coroutine=_asearch,
         tool_name=tool_name,
         tool_description=tool_description or load_prompt(tool_name),
         **kwargs,
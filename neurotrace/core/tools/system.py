@@ -1,15 +1,14 @@
 import platform
 from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-import requests
-from dotenv import load_dotenv
-from langchain.tools import BaseTool
-from langchain_tavily import TavilySearch
+from langchain_core.tools import BaseTool
 
 from neurotrace.core.tools.factory import generic_tool_factory
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    from langchain_tavily import TavilySearch
 
 
 def get_current_datetime(_: str = "") -> str:
@@ -27,6 +26,8 @@ def get_ip_address(_: str = "") -> str:
     :param _:
     :return:
     """
+    import requests
+
     try:
         return requests.get("https://api.ipify.org").text
     except Exception:
@@ -39,6 +40,8 @@ def get_current_location(_: str = "") -> str:
     :param _:
     :return:
     """
+    import requests
+
     try:
         ip = requests.get("https://api.ipify.org").text
         response = requests.get(f"https://ipinfo.io/{ip}/json").json()
@@ -75,20 +78,41 @@ def get_day_of_week(_: str = "") -> str:
 
 # ============= EXTERNAL TOOLS =============
 
-web_search_tool = TavilySearch(
-    max_results=5,
-    topic="general",
-    # include_answer=False,
-    # include_raw_content=False,
-    # include_images=False,
-    # include_image_descriptions=False,
-    # include_favicon=False,
-    # search_depth="basic",
-    # time_range="day",
-    # include_domains=None,
-    # exclude_domains=None,
-    # country=None
-)
+
+@lru_cache(maxsize=1)
+def get_web_search_tool() -> "TavilySearch":
+    """
+    Build the Tavily web search client on first use.
+
+    Environment variables (including ``TAVILY_API_KEY``) are loaded from ``.env``
+    at this point rather than when the module is imported.
+    """
+    from dotenv import load_dotenv
+    from langchain_tavily import TavilySearch
+
+    load_dotenv()
+    return TavilySearch(
+        max_results=5,
+        topic="general",
+        # include_answer=False,
+        # include_raw_content=False,
+        # include_images=False,
+        # include_image_descriptions=False,
+        # include_favicon=False,
+        # search_depth="basic",
+        # time_range="day",
+        # include_domains=None,
+        # exclude_domains=None,
+        # country=None
+    )
+
+
+def __getattr__(name: str):
+    # Keeps ``from neurotrace.core.tools.system import web_search_tool`` working without
+    # creating the client at import time.
+    if name == "web_search_tool":
+        return get_web_search_tool()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_system_tools_list() -> list[BaseTool]:
@@ -124,7 +148,7 @@ def get_system_tools_list() -> list[BaseTool]:
     system_tools.extend(
         [
             generic_tool_factory(
-                func=web_search_tool.run,
+                func=lambda query: get_web_search_tool().run(query),
                 tool_name="web_search",
                 tool_description="Use this tool to perform a web search and retrieve relevant information.",
             )
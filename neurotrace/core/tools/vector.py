@@ -1,7 +1,7 @@
 import json
 from typing import TYPE_CHECKING
 
-from langchain.tools import Tool
+from langchain_core.tools import Tool
 
 from neurotrace.core.tools.factory import generic_tool_factory
 from neurotrace.core.utils import load_prompt
@@ -22,6 +22,34 @@ def load_prompt(name: str) -> str:
         return f.read()
 
 
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Uses the same word-based approximation as ``Message.estimated_token_length``.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return len(text.split())
+
+
+def normalise_query(query: str) -> str:
+    """
+    Normalise a search query for use as a cache key.
+
+    Args:
+        query (str): The query text.
+
+    Returns:
+        str: The query lowercased, with runs of whitespace collapsed to single spaces.
+    """
+    return " ".join(query.lower().split())
+
+
 def safe_json_loads(json_string: str, return_type: type = dict) -> type:
     """
     Safely load a JSON string, returning an empty dictionary on failure.
@@ -1,10 +1,19 @@
+import math
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
+from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import VectorStore
 
-from neurotrace.core.schema import Message
+from neurotrace.core import metrics
+from neurotrace.core.schema import Message, documents_to_messages, messages_to_documents
+
+if TYPE_CHECKING:
+    from neurotrace.core.query_rewrite import QueryRewriter
+    from neurotrace.core.ranking import MemoryRanker
+    from neurotrace.core.reindex import ReindexReport
 
 
 class BaseVectorMemoryAdapter(ABC):
@@ -68,18 +77,38 @@ class VectorMemoryAdapter(BaseVectorMemoryAdapter):
             storing embeddings.
         embedding_model (Embeddings): LangChain embeddings model for converting
             text to vectors.
+        ranker (MemoryRanker, optional): Re-ranks search candidates by recency,
+            access frequency and intensity as well as similarity. Defaults to None
+            (similarity order).
+        overfetch (float, optional): With a ranker, ``search`` fetches this many
+            times ``k`` candidates to re-rank. Defaults to 4.
+        query_rewriter (QueryRewriter, optional): Expands each search query into
+            LLM-written variants whose results are fused. Defaults to None.
     """
 
-    def __init__(self, vector_store: VectorStore):
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        ranker: Optional["MemoryRanker"] = None,
+        overfetch: float = 4.0,
+        query_rewriter: Optional["QueryRewriter"] = None,
+    ):
         """
         Vector memory adapter that wraps a LangChain-compatible vector store.
 
         Args:
             vector_store (VectorStore): Any LangChain-compatible vector store.
-            embedding_model (Embeddings): Embedding model to generate embeddings.
+            ranker (MemoryRanker, optional): Re-ranks search candidates. Defaults to None.
+            overfetch (float, optional): Candidates fetched per result when re-ranking. Defaults to 4.
+            query_rewriter (QueryRewriter, optional): Searches for rewrites of the query too. Defaults to None.
         """
         self.vector_store = vector_store
         self.embedding_model = vector_store.embeddings
+        self.ranker = ranker
+        self.overfetch = overfetch
+        self.query_rewriter = query_rewriter
+        self._shadow_store: Optional[VectorStore] = None
+        self._lock = threading.Lock()
 
     def add_messages(self, messages: List[Message]) -> None:
         """Add multiple messages to the vector store.
@@ -88,34 +117,101 @@ class VectorMemoryAdapter(BaseVectorMemoryAdapter):
         the underlying vector store. The documents will be automatically
         embedded using the configured embedding model.
 
+        Messages that already carry ``metadata.embedding`` are written with that
+        vector when the store supports ``add_embeddings``, so they are not
+        embedded again. If the store also reports vector offsets (see
+        ``NumpyVectorStore``), the float list is dropped from the message and
+        only ``metadata.embedding_offset`` is kept.
+
+        Each document also records the message's ``created_at`` time (epoch
+        seconds) and, when the message has an emotion intensity, its
+        ``importance``, so that retention policies can expire it later.
+
+        While a reindex is running (see :meth:`reindex`), the messages are also
+        written to the new store.
+
         Args:
             messages (List[Message]): List of messages to be added to the
                 vector store.
         """
-        documents = [msg.to_document() for msg in messages]
-        self.vector_store.add_documents(documents)
+        metrics.inc("neurotrace_vector_messages_added_total", len(messages))
+        with self._lock:
+            store, shadow = self.vector_store, self._shadow_store
+        with metrics.timer("neurotrace_vector_add_seconds"):
+            if shadow is not None:
+                # Written first and always re-embedded: precomputed vectors belong to the old model.
+                shadow.add_documents(self._documents(messages))
+            precomputed = [msg for msg in messages if msg.metadata.embedding]
+            if precomputed and hasattr(store, "add_embeddings"):
+                messages = [msg for msg in messages if not msg.metadata.embedding]
+                self._add_precomputed(store, precomputed)
+
+            if messages:
+                store.add_documents(self._documents(messages))
+
+    @staticmethod
+    def _documents(messages: List[Message]) -> List[Document]:
+        documents = messages_to_documents(messages)
+        for doc, msg in zip(documents, messages):
+            doc.metadata["created_at"] = msg.timestamp.timestamp()
+            emotions = msg.metadata.emotions
+            if emotions is not None and emotions.intensity is not None:
+                doc.metadata["importance"] = emotions.intensity
+        return documents
+
+    def _add_precomputed(self, store: VectorStore, messages: List[Message]) -> None:
+        documents = self._documents(messages)
+        ids = [msg.id for msg in messages]
+        store.add_embeddings(
+            text_embeddings=[(doc.page_content, msg.metadata.embedding) for doc, msg in zip(documents, messages)],
+            metadatas=[doc.metadata for doc in documents],
+            ids=ids,
+        )
+        if hasattr(store, "offsets_of"):
+            for msg, offset in zip(messages, store.offsets_of(ids)):
+                msg.metadata.embedding = None
+                msg.metadata.embedding_offset = offset
 
     def search(self, query: str, k: int = 5) -> List[Message]:
         """Search for similar messages in the vector store.
 
         Performs a similarity search using the query string. The query is
         embedded and compared against stored message embeddings to find
-        the most similar messages.
+        the most similar messages. With a ranker, ``overfetch * k`` candidates
+        are fetched with relevance scores and the ranker keeps the best k.
+        With a query rewriter, the same search runs concurrently for each
+        rewrite of the query and the results are merged by reciprocal rank
+        fusion.
 
         Args:
             query (str): The search query string.
             k (int, optional): Maximum number of results to return. Defaults to 5.
 
         Returns:
-            List[Message]: List of messages ranked by similarity to the query,
-                limited to k results.
-
-        Note:
-            TODO: Add support for enhancing the prompt for vector search using LLM.
+            List[Message]: List of messages ranked by similarity to the query
+                (or by the ranker's score, or fused rank), limited to k results.
         """
-        # todo: add support for enhancing the prompt for vector search using llm
-        results = self.vector_store.similarity_search(query=query, k=k)
-        return [Message.from_document(doc) for doc in results]
+        if self.query_rewriter is not None:
+            return self.query_rewriter.search(self._search, query, k)
+        return self._search(query, k)
+
+    def _search(self, query: str, k: int) -> List[Message]:
+        if self.ranker is not None:
+            return self._ranked_search(query, k)
+        with metrics.timer("neurotrace_vector_search_seconds"):
+            results = self.vector_store.similarity_search(query=query, k=k)
+        metrics.observe("neurotrace_vector_search_results", len(results))
+        return documents_to_messages(results)
+
+    def _ranked_search(self, query: str, k: int) -> List[Message]:
+        fetch_k = max(k, math.ceil(k * self.overfetch))
+        with metrics.timer("neurotrace_vector_search_seconds"):
+            candidates = self.vector_store.similarity_search_with_relevance_scores(query, k=fetch_k)
+        with metrics.timer("neurotrace_vector_rerank_seconds"):
+            # Scored on document metadata so that only the kept documents become messages.
+            documents = self.ranker.rank_documents([doc for doc, _ in candidates], [s for _, s in candidates], k)
+        metrics.observe("neurotrace_vector_search_results", len(documents))
+        return documents_to_messages(documents)
 
     def delete(self, ids: List[str]) -> None:
         """Delete messages from the vector store by their IDs.
@@ -127,7 +223,134 @@ class VectorMemoryAdapter(BaseVectorMemoryAdapter):
             NotImplementedError: If the underlying vector store doesn't
                 support deletion operations.
         """
-        if hasattr(self.vector_store, "delete"):
-            self.vector_store.delete(ids)
-        else:
-            raise NotImplementedError(f"Delete not supported by {type(self.vector_store)}.")
+        with self._lock:
+            store, shadow = self.vector_store, self._shadow_store
+        if not hasattr(store, "delete"):
+            raise NotImplementedError(f"Delete not supported by {type(store)}.")
+        store.delete(ids)
+        if shadow is not None:
+            shadow.delete(ids)
+
+    def metadata_items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """List the id and metadata of every stored message.
+
+        Used by retention jobs to decide what to expire. Supports stores with a
+        ``metadata_items`` method (see ``NumpyVectorStore``) and Chroma-style
+        stores whose ``get`` returns ``ids`` and ``metadatas``.
+
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: ``(id, metadata)`` pairs.
+
+        Raises:
+            NotImplementedError: If the underlying vector store cannot list its
+                documents.
+        """
+        if hasattr(self.vector_store, "metadata_items"):
+            return self.vector_store.metadata_items()
+        if hasattr(self.vector_store, "get"):
+            data = self.vector_store.get(include=["metadatas"])
+            return list(zip(data["ids"], [metadata or {} for metadata in data["metadatas"]]))
+        raise NotImplementedError(f"Listing documents not supported by {type(self.vector_store)}.")
+
+    def count(self) -> int:
+        """Number of stored messages, without loading their metadata.
+
+        Returns:
+            int: ``len()`` of the store if it has one, else the number of ids a
+                Chroma-style ``get`` returns.
+
+        Raises:
+            NotImplementedError: If the underlying vector store cannot count its
+                documents.
+        """
+        if hasattr(self.vector_store, "__len__"):
+            return len(self.vector_store)
+        if hasattr(self.vector_store, "get"):
+            return len(self.vector_store.get(include=[])["ids"])
+        raise NotImplementedError(f"Counting documents not supported by {type(self.vector_store)}.")
+
+    def iter_documents(self, page_size: int = 1000, cursor: int = 0) -> Iterator[Tuple[List[Document], int]]:
+        """Stream every stored document, one page at a time.
+
+        Supports stores with a ``documents_page`` method (see ``NumpyVectorStore``),
+        which page by row so that deletes during the walk cannot make it skip
+        documents, and Chroma-style stores whose ``get`` accepts ``limit`` and
+        ``offset``, where a concurrent delete can.
+
+        Args:
+            page_size (int, optional): Documents per page. Defaults to 1000.
+            cursor (int, optional): Where to start, as yielded with an earlier
+                page, e.g. to resume a walk. Defaults to 0 (the beginning).
+
+        Yields:
+            Tuple[List[Document], int]: A page of documents, each with its store
+                id set, and the cursor of the page after it.
+
+        Raises:
+            NotImplementedError: If the underlying vector store cannot list its
+                documents.
+        """
+        store = self.vector_store
+        while True:
+            if hasattr(store, "documents_page"):
+                page = store.documents_page(cursor, page_size)
+                next_cursor = page[-1].metadata["embedding_offset"] + 1 if page else cursor
+            elif hasattr(store, "get"):
+                data = store.get(include=["documents", "metadatas"], limit=page_size, offset=cursor)
+                page = [
+                    Document(id=doc_id, page_content=text or "", metadata=metadata or {})
+                    for doc_id, text, metadata in zip(data["ids"], data["documents"], data["metadatas"])
+                ]
+                next_cursor = cursor + len(page)
+            else:
+                raise NotImplementedError(f"Listing documents not supported by {type(store)}.")
+            if not page:
+                return
+            yield page, next_cursor
+            cursor = next_cursor
+
+    def start_shadow_writes(self, vector_store: VectorStore) -> None:
+        """Also send every add and delete to ``vector_store`` until :meth:`switch_store`.
+
+        Args:
+            vector_store (VectorStore): The store being built by a reindex.
+        """
+        with self._lock:
+            self._shadow_store = vector_store
+
+    def stop_shadow_writes(self) -> None:
+        """Stop mirroring writes, e.g. after an abandoned reindex."""
+        with self._lock:
+            self._shadow_store = None
+
+    def switch_store(self, vector_store: VectorStore) -> None:
+        """Atomically make ``vector_store`` the store searched and written to.
+
+        Writes that started before the switch go to both the old store and this
+        one, so none of them is lost.
+
+        Args:
+            vector_store (VectorStore): The new store, typically a reindexed shadow.
+        """
+        with self._lock:
+            self.vector_store = vector_store
+            self.embedding_model = vector_store.embeddings
+            self._shadow_store = None
+
+    def reindex(self, vector_store: VectorStore, **kwargs: Any) -> "ReindexReport":
+        """Copy every memory into ``vector_store``, re-embedded with its model, then switch to it.
+
+        Shortcut for ``ReindexJob(self, vector_store, **kwargs).run()``.
+
+        Args:
+            vector_store (VectorStore): Empty or partially filled store using the new
+                embedding model.
+            **kwargs: Options for ``ReindexJob``.
+
+        Returns:
+            ReindexReport: What the reindex did.
+        """
+        # Imported here because the reindex module builds on this one.
+        from neurotrace.core.reindex import ReindexJob
+
+        return ReindexJob(self, vector_store, **kwargs).run()
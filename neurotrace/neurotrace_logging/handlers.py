@@ -0,0 +1,85 @@
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class LazyQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock ``QueueHandler.prepare`` runs the full formatter in the calling
+    thread. Here only the message arguments are merged (so later mutation of the
+    arguments cannot change the log line); timestamps, level names and
+    tracebacks are formatted by the handlers behind the ``QueueListener``.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class BatchedJsonHandler(logging.Handler):
+    """Writes records as JSON lines, a batch at a time.
+
+    Records are buffered and appended to the file when ``batch_size`` records
+    are waiting or ``flush_interval`` seconds have passed since the last write,
+    whichever comes first, and on ``flush``/``close``. Values passed through
+    ``extra`` are included as top-level keys.
+
+    Args:
+        path (Union[str, Path]): JSON lines file to append to.
+        batch_size (int, optional): Records per write. Defaults to 100.
+        flush_interval (float, optional): Maximum seconds a record waits in the
+            buffer, checked whenever a record arrives. Defaults to 1.0.
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 100, flush_interval: float = 1.0):
+        super().__init__()
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+
+    def to_dict(self, record: logging.LogRecord) -> Dict[str, Any]:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS})
+        if record.exc_info:
+            entry["exception"] = logging.Formatter().formatException(record.exc_info)
+        return entry
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._buffer.append(self.to_dict(record))
+            if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._buffer:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(entry, default=str) + "\n" for entry in self._buffer))
+                self._buffer.clear()
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
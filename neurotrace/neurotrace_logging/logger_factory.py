@@ -1,10 +1,16 @@
+import atexit
 import logging
 import os
-from logging.handlers import SocketHandler, TimedRotatingFileHandler
+import queue
+import threading
+from logging.handlers import QueueListener, SocketHandler, TimedRotatingFileHandler
 from pathlib import Path
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
+from neurotrace.neurotrace_logging.handlers import BatchedJsonHandler, LazyQueueHandler
+
 load_dotenv()
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -14,6 +20,68 @@ LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", "logs/neurotrace.log")
 LOG_TO_NETWORK = os.getenv("LOG_TO_NETWORK", "false").lower() == "true"
 LOG_HOST = os.getenv("LOG_HOST", "localhost")
 LOG_PORT = int(os.getenv("LOG_PORT", 9020))
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() == "true"
+LOG_JSON_PATH = os.getenv("LOG_JSON_PATH", "")
+LOG_JSON_BATCH_SIZE = int(os.getenv("LOG_JSON_BATCH_SIZE", 100))
+LOG_JSON_FLUSH_INTERVAL = float(os.getenv("LOG_JSON_FLUSH_INTERVAL", 1.0))
+
+_lock = threading.Lock()
+_handlers: Optional[List[logging.Handler]] = None
+_queue_handler: Optional[LazyQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _build_handlers() -> List[logging.Handler]:
+    """Create the output handlers shared by every neurotrace logger."""
+    formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s")
+    handlers: List[logging.Handler] = []
+
+    if LOG_TO_STREAM:
+        handlers.append(logging.StreamHandler())
+
+    if LOG_TO_FILE:
+        Path(LOG_FILE_PATH).parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(TimedRotatingFileHandler(LOG_FILE_PATH, when="midnight", backupCount=7))
+
+    if LOG_TO_NETWORK:
+        try:
+            handlers.append(SocketHandler(LOG_HOST, LOG_PORT))
+        except Exception as e:
+            logging.getLogger(__name__).warning("Could not attach network log handler: %s", e)
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if LOG_JSON_PATH:
+        handlers.append(
+            BatchedJsonHandler(LOG_JSON_PATH, batch_size=LOG_JSON_BATCH_SIZE, flush_interval=LOG_JSON_FLUSH_INTERVAL)
+        )
+    return handlers
+
+
+def _get_handlers() -> List[logging.Handler]:
+    """Return the handlers to attach to a logger, starting the queue listener on first use."""
+    global _handlers, _queue_handler, _listener
+    with _lock:
+        if _handlers is None:
+            _handlers = _build_handlers()
+            if LOG_ASYNC and _handlers:
+                _queue_handler = LazyQueueHandler(queue.SimpleQueue())
+                _listener = QueueListener(_queue_handler.queue, *_handlers, respect_handler_level=True)
+                _listener.start()
+                atexit.register(shutdown_logging)
+        return [_queue_handler] if _queue_handler is not None else list(_handlers)
+
+
+def shutdown_logging() -> None:
+    """Stop the background listener, writing out every queued record, and close the handlers."""
+    global _handlers, _queue_handler, _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+        for handler in _handlers or []:
+            handler.close()
+        _handlers, _queue_handler, _listener = None, None, None
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -22,6 +90,11 @@ def get_logger(name: str) -> logging.Logger:
     - Stream logs
     - Daily rotating file logs
     - Optional network logging via sockets
+    - Optional structured JSON lines, written in batches (``LOG_JSON_PATH``)
+
+    All loggers share one set of handlers. Unless ``LOG_ASYNC=false``, records are
+    put on a queue and the handlers run on a background ``QueueListener`` thread,
+    so file, socket and stream I/O never blocks the caller.
     """
 
     logger = logging.getLogger(name)
@@ -29,25 +102,7 @@ def get_logger(name: str) -> logging.Logger:
     logger.propagate = False  # prevent duplicate logs
 
     if not logger.handlers:
-        formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s")
-
-        if LOG_TO_STREAM:
-            stream_handler = logging.StreamHandler()
-            stream_handler.setFormatter(formatter)
-            logger.addHandler(stream_handler)
-
-        if LOG_TO_FILE:
-            Path(LOG_FILE_PATH).parent.mkdir(parents=True, exist_ok=True)
-            file_handler = TimedRotatingFileHandler(LOG_FILE_PATH, when="midnight", backupCount=7)
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
-
-        if LOG_TO_NETWORK:
-            try:
-                socket_handler = SocketHandler(LOG_HOST, LOG_PORT)
-                socket_handler.setFormatter(formatter)
-                logger.addHandler(socket_handler)
-            except Exception as e:
-                logger.warning(f"Could not attach network log handler: {e}")
+        for handler in _get_handlers():
+            logger.addHandler(handler)
 
     return logger
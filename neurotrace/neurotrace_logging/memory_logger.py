@@ -1,3 +1,5 @@
+import logging
+
 from neurotrace.core.schema import Message
 from neurotrace.neurotrace_logging.logger_factory import get_logger
 
@@ -5,25 +7,49 @@ logger = get_logger("neurotrace.memory")
 
 
 class MemoryLogger:
+    # Each method checks the level first, so disabled messages cost no truncation,
+    # token estimate or formatting. Enabled messages are interpolated once on the
+    # calling thread when LazyQueueHandler queues them; the rest of the formatting
+    # and all I/O happen on the listener thread.
+
     @staticmethod
     def log_add(message: Message, destination: str):
-        logger.info(
-            f"Added to {destination.upper()}: "
-            f"{message.role} - {message.content[:60]!r} "
-            f"(tokens ~{message.estimated_token_length()}, id={message.id})"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Added to %s: %s - %r (tokens ~%d, id=%s)",
+                destination.upper(),
+                message.role,
+                message.content[:60],
+                message.estimated_token_length(),
+                message.id,
+                extra={"event": "add", "destination": destination, "message_id": message.id},
+            )
 
     @staticmethod
     def log_evict(message: Message):
-        logger.warning(f"Evicted from STM: {message.role} - {message.content[:60]!r} " f"(id={message.id})")
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning(
+                "Evicted from STM: %s - %r (id=%s)",
+                message.role,
+                message.content[:60],
+                message.id,
+                extra={"event": "evict", "message_id": message.id},
+            )
 
     @staticmethod
     def log_search(query: str, results: list[Message]):
-        logger.info(f"Vector search for: {query!r} — {len(results)} results returned.")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Vector search for: %r — %d results returned.",
+                query,
+                len(results),
+                extra={"event": "search", "results": len(results)},
+            )
 
     @staticmethod
     def log_clear(target: str):
-        logger.info(f"Cleared messages from {target.upper()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Cleared messages from %s", target.upper(), extra={"event": "clear", "target": target})
 
     @staticmethod
     def log_error(message: str):
@@ -1,4 +1,4 @@
-from langchain.prompts import PromptTemplate
+from langchain_core.prompts import PromptTemplate
 
 PROMPT_VECTOR_AND_GRAPH_SUMMARY = PromptTemplate.from_template(
     """
@@ -101,6 +101,32 @@ Return an empty list if no triplets can be extracted.
 )
 
 
+PROMPT_VECTOR_SUMMARY_AND_TRIPLETS = PromptTemplate.from_template(
+    """
+You are a memory indexing assistant.
+
+Given the input message below, produce two outputs in a single response:
+
+1. vector_summary:
+- A semantically rich, concise, and meaningful representation.
+- Optimized for use in vector similarity search (RAG, embeddings, etc.)
+- Avoids repetition and preserves high-level intent/context.
+
+2. triplets:
+- All factual triplets stated in the message, in the form Subject - Relation - Object.
+- Be precise and unambiguous. If the object is implied or missing, use an empty string.
+
+MESSAGE:
+{message}
+
+Return ONLY a JSON object in the format:
+{{"vector_summary": "<your concise semantic summary here>", "triplets": [["Subject1", "Relation1", "Object1"], ...]}}
+
+Use an empty list for triplets if no triplets can be extracted.
+"""
+)
+
+
 PROMPT_SUMMARISE_VECTOR_AND_GRAPH_MEMORY = PromptTemplate(
     input_variables=["vector_memory", "graph_memory"],
     template="""
@@ -131,3 +157,21 @@ Instructions:
 "No relevant context found in memory."
 """,
 )
+
+
+PROMPT_QUERY_REWRITE = PromptTemplate.from_template(
+    """
+You are a search query assistant for a long-term memory store.
+
+Rewrite the query below into {variants} alternative search queries that would retrieve the memories needed to answer it.
+- Resolve vague wording into explicit terms and add likely synonyms.
+- Split questions that ask about several things into separate queries.
+- Keep each query short and self-contained.
+
+QUERY:
+{query}
+
+Return ONLY a JSON list of strings, for example:
+["first query", "second query"]
+"""
+)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from neurotrace.core.stores.embedding_log import HEADER, EmbeddingLog
+
+
+def test_append_returns_offsets_and_view_is_memory_mapped(tmp_path):
+    log = EmbeddingLog(tmp_path / "vectors.f32")
+
+    first = log.append(np.ones((2, 4)))
+    second = log.append(np.full((1, 4), 2.0))
+
+    assert (first, second) == (0, 2)
+    assert len(log) == 3
+    assert isinstance(log.view(), np.memmap)
+    assert log.rows([2]).tolist() == [[2.0, 2.0, 2.0, 2.0]]
+
+
+def test_reopen_reads_header_and_drops_torn_row(tmp_path):
+    path = tmp_path / "vectors.f32"
+    EmbeddingLog(path).append(np.arange(8, dtype=np.float32).reshape(2, 4))
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 6)  # half a row from an interrupted write
+
+    log = EmbeddingLog(path)
+
+    assert log.dim == 4
+    assert len(log) == 2
+    assert path.stat().st_size == HEADER.size + 2 * 4 * 4
+
+
+def test_dimension_mismatch_raises(tmp_path):
+    log = EmbeddingLog(tmp_path / "vectors.f32")
+    log.append(np.zeros((1, 4)))
+
+    with pytest.raises(ValueError):
+        log.append(np.zeros((1, 3)))
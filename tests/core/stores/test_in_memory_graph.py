@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from neurotrace.core.graph_memory import GraphMemoryAdapter
+from neurotrace.core.stores.in_memory_graph import InMemoryGraphStore
+
+
+@pytest.fixture
+def adapter():
+    return GraphMemoryAdapter(llm=MagicMock(), graph_database=InMemoryGraphStore())
+
+
+def test_adapter_writes_merge_into_adjacency(adapter):
+    adapter.add_triplets(
+        [["alice", "works at", "acme"], ["bob", "works at", "acme"], ["alice", "likes", "tea"]],
+        timestamp="2024-01-01T00:00:00",
+        tags=["work"],
+    )
+    adapter.add_triplets([["alice", "works at", "acme"]], timestamp="2024-02-01T00:00:00", tags=["later"])
+    adapter.insert_triplets(["acme", "based in", "berlin"], timestamp="2024-03-01T00:00:00")
+
+    graph = adapter.graph
+    assert graph.node_count == 5
+    assert graph.relationship_count == 4
+    assert adapter.get_all_relation_types() == ["BASED_IN", "LIKES", "WORKS_AT"]
+    assert graph.get_entity("alice") == {"created_at": "2024-01-01T00:00:00"}
+    # ON CREATE SET only applies the first time a relationship is merged.
+    assert graph._out["alice"][("WORKS_AT", "acme")] == {
+        "created_at": "2024-01-01T00:00:00",
+        "source": "user",
+        "tags": ["work"],
+    }
+    assert graph._out["acme"][("BASED_IN", "berlin")]["source"] == "user"
+
+
+def test_neighbourhood_walks_both_directions_breadth_first():
+    graph = InMemoryGraphStore()
+    graph.add_triplets([("alice", "WORKS_AT", "acme"), ("acme", "BASED_IN", "berlin"), ("bob", "KNOWS", "carol")])
+
+    assert graph.neighbourhood(["acme"]) == [("acme", "BASED_IN", "berlin"), ("alice", "WORKS_AT", "acme")]
+    assert graph.neighbourhood(["alice"], depth=1) == [("alice", "WORKS_AT", "acme")]
+    assert graph.neighbourhood(["alice", "unknown"], depth=2) == [
+        ("alice", "WORKS_AT", "acme"),
+        ("acme", "BASED_IN", "berlin"),
+    ]
+    assert graph.neighbourhood(["alice"], depth=2, limit=1) == [("alice", "WORKS_AT", "acme")]
+
+
+def test_unsupported_cypher_raises():
+    with pytest.raises(ValueError):
+        InMemoryGraphStore().query("MATCH (n) RETURN n")
+
+
+def test_save_and_reload(tmp_path):
+    path = tmp_path / "graph.json"
+    graph = InMemoryGraphStore(path)
+    graph.add_triplets([("alice", "LIKES", "tea")], source="user")
+    graph.save()
+
+    reloaded = InMemoryGraphStore(path)
+
+    assert reloaded.triplets() == [("alice", "LIKES", "tea")]
+    assert reloaded._out["alice"][("LIKES", "tea")] == {"source": "user"}
+    assert "(:Entity)-[:LIKES]->(:Entity)" in reloaded.get_schema
+
+
+def test_adapter_prunes_stale_relationships_and_orphans(adapter):
+    adapter.add_triplets([["alice", "works at", "acme"], ["bob", "knows", "alice"]], timestamp="2024-01-01T00:00:00")
+    adapter.add_triplets([["acme", "based in", "berlin"]], timestamp="2024-06-01T00:00:00")
+
+    assert adapter.prune_relationships("2024-03-01T00:00:00", batch_size=1) == 2
+    assert adapter.prune_orphan_entities() == 2
+
+    assert adapter.graph.triplets() == [("acme", "BASED_IN", "berlin")]
+    assert sorted(adapter.entity_names()) == ["acme", "berlin"]
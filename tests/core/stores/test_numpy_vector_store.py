@@ -0,0 +1,178 @@
+import os
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from neurotrace.core.schema import Message
+from neurotrace.core.stores.numpy_vector_store import IVFIndex, NumpyVectorStore
+from neurotrace.core.vector_memory import VectorMemoryAdapter
+
+
+@pytest.fixture
+def embedding():
+    return DeterministicFakeEmbedding(size=16)
+
+
+@pytest.fixture
+def store(embedding):
+    return NumpyVectorStore(embedding=embedding)
+
+
+def test_exact_search_returns_identical_text_first(store):
+    store.add_texts(["apples are red", "the sky is blue", "grass is green"], ids=["a", "b", "c"])
+
+    results = store.similarity_search_with_score("the sky is blue", k=2)
+
+    assert len(results) == 2
+    assert results[0][0].id == "b"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_delete_hides_documents_and_readd_replaces(store):
+    store.add_texts(["one", "two"], ids=["1", "2"])
+    store.delete(["1"])
+
+    assert len(store) == 1
+    assert [doc.id for doc in store.similarity_search("one", k=5)] == ["2"]
+
+    store.add_texts(["two again"], ids=["2"])
+    assert len(store) == 1
+    assert store.get_by_ids(["2"])[0].page_content == "two again"
+
+
+def test_duplicate_ids_in_one_batch_keep_the_last(tmp_path, embedding):
+    store = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+
+    assert store.add_texts(["a", "b"], ids=["x", "x"]) == ["x", "x"]
+
+    assert len(store) == 1
+    assert [doc.page_content for doc in store.similarity_search("a", k=5)] == ["b"]
+    reopened = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+    assert [doc.page_content for doc in reopened.similarity_search("a", k=5)] == ["b"]
+
+
+def test_metadata_filter(store):
+    store.add_texts(["a", "b"], metadatas=[{"session_id": "x"}, {"session_id": "y"}])
+
+    results = store.similarity_search("a", k=5, filter={"session_id": "y"})
+
+    assert [doc.page_content for doc in results] == ["b"]
+
+
+def test_ivf_index_matches_exact_search_for_stored_vectors():
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(500, 8)).astype(np.float32)
+    store = NumpyVectorStore(embedding=DeterministicFakeEmbedding(size=8), index=IVFIndex(n_lists=8, n_probe=8))
+    store.add_embeddings([(str(i), v.tolist()) for i, v in enumerate(vectors)], ids=[str(i) for i in range(500)])
+    store.build_index()
+
+    approx = store.similarity_search_by_vector(vectors[42].tolist(), k=3)
+    exact = store.similarity_search_by_vector(vectors[42].tolist(), k=3, exact=True)
+
+    assert [doc.id for doc in approx] == [doc.id for doc in exact]
+    assert approx[0].id == "42"
+
+
+def test_persistent_store_reopens_memory_mapped(tmp_path, embedding):
+    store = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+    store.add_texts(["persist me", "and me"], ids=["p1", "p2"])
+    store.delete(["p2"])
+
+    reloaded = NumpyVectorStore.load(str(tmp_path), embedding=embedding)
+
+    assert isinstance(reloaded._vectors.view(), np.memmap)
+    assert [doc.id for doc in reloaded.similarity_search("persist me", k=5)] == ["p1"]
+
+    reloaded.add_texts(["new"], ids=["p3"])
+    assert len(NumpyVectorStore.load(str(tmp_path), embedding=embedding)) == 2
+
+
+def test_unserialisable_metadata_leaves_persistent_store_unchanged(tmp_path, embedding):
+    store = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+    store.add_texts(["kept"], ids=["k"])
+
+    with pytest.raises(TypeError):
+        store.add_texts(["bad", "kept again"], metadatas=[{"when": object()}, {}], ids=["b", "k"])
+
+    assert len(store) == 1
+    assert len(store._vectors) == 1
+    assert store.get_by_ids(["k"])[0].page_content == "kept"
+    reopened = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+    assert [doc.id for doc in reopened.similarity_search("kept", k=5)] == ["k"]
+
+
+def test_persist_exports_only_live_documents(tmp_path, store):
+    store.add_texts(["keep", "drop"], ids=["k", "d"])
+    store.delete(["d"])
+    store.persist(str(tmp_path))
+
+    reloaded = NumpyVectorStore.load(str(tmp_path), embedding=store.embeddings)
+
+    assert len(reloaded._vectors) == 1
+    assert reloaded.get_by_ids(["k"])[0].page_content == "keep"
+
+
+def test_plugs_into_vector_memory_adapter(store):
+    adapter = VectorMemoryAdapter(store)
+    adapter.add_messages([Message(role="ai", content="User lives in Paris")])
+
+    results = adapter.search("User lives in Paris", k=1)
+
+    assert results[0].content == "User lives in Paris"
+    assert results[0].role == "ai"
+
+
+def test_adapter_keeps_only_offset_for_precomputed_embeddings(tmp_path, embedding):
+    store = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+    adapter = VectorMemoryAdapter(store)
+    vector = embedding.embed_query("precomputed")
+    message = Message(role="ai", content="precomputed", metadata={"embedding": vector})
+
+    adapter.add_messages([message])
+
+    assert message.metadata.embedding is None
+    assert message.metadata.embedding_offset == 0
+    assert np.allclose(store.get_vectors([0])[0], np.asarray(vector) / np.linalg.norm(vector), atol=1e-6)
+    assert adapter.search("precomputed", k=1)[0].metadata.embedding_offset == 0
+
+
+def test_compact_drops_tombstones_and_survives_reopen(tmp_path, embedding):
+    store = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+    store.add_texts(["one", "two", "three", "four"], ids=["1", "2", "3", "4"])
+    store.delete(["1", "3"])
+
+    assert store.compact(min_dead_ratio=0.6) == 0
+    assert store.compact() > 0
+    assert store.offsets_of(["2", "4"]) == [0, 1]
+    assert store.similarity_search("four", k=1)[0].id == "4"
+
+    reopened = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+    assert len(reopened) == 2
+    assert len(reopened.get_vectors(slice(None))) == 2
+    assert reopened.similarity_search("two", k=1)[0].id == "2"
+
+
+def test_interrupted_compaction_is_finished_on_open(tmp_path, embedding, monkeypatch):
+    store = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+    store.add_texts(["one", "two", "three"], ids=["1", "2", "3"])
+    store.delete(["2"])
+
+    real_replace = os.replace
+    calls = []
+
+    def crash_after_records(src, dst):
+        calls.append(dst)
+        if len(calls) == 2:
+            raise OSError("crash")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", crash_after_records)
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.setattr(os, "replace", real_replace)
+
+    reopened = NumpyVectorStore(embedding=embedding, persist_directory=str(tmp_path))
+    assert reopened.offsets_of(["1", "3"]) == [0, 1]
+    assert reopened.similarity_search("three", k=1)[0].id == "3"
+    assert not list(tmp_path.glob("*.compact"))
@@ -0,0 +1,97 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+
+from neurotrace.core.context_builder import ContextBuilder
+from neurotrace.core.memory import NeurotraceMemory
+from neurotrace.core.schema import Message
+
+
+def msg(content, role="human"):
+    return Message(role=role, content=content)
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = MagicMock()
+    orchestrator.search_vector_memory.return_value = [msg("user likes green tea", "ai"), msg("one two", "ai")]
+    orchestrator.search_graph_memory.return_value = "- user likes tea\n- user lives in oslo"
+    return orchestrator
+
+
+def test_budget_is_filled_by_priority(orchestrator):
+    stm = [msg("old message here"), msg("newest")]
+    builder = ContextBuilder(orchestrator, token_budget=10)
+
+    context = builder.build("tea?", stm)
+
+    # 4 tokens of STM, then both vector memories (4 + 2), then no room for a 3-token fact.
+    assert [m.content for m in context.stm] == ["old message here", "newest"]
+    assert [m.content for m in context.vector] == ["user likes green tea", "one two"]
+    assert context.graph == []
+    assert context.tokens == 10
+
+
+def test_recent_stm_wins_when_budget_is_tight(orchestrator):
+    stm = [msg("a b c d e"), msg("f g"), msg("h")]
+    context = ContextBuilder(orchestrator, token_budget=6).build("q", stm)
+
+    assert [m.content for m in context.stm] == ["f g", "h"]
+    assert [m.content for m in context.vector] == ["one two"]
+    assert context.graph == []
+    assert context.tokens == 5
+
+
+def test_retrieval_is_optional_and_fault_tolerant(orchestrator):
+    orchestrator.search_graph_memory.side_effect = RuntimeError("graph down")
+    context = ContextBuilder(orchestrator, include_vector=False).build("q", [msg("hi")])
+
+    orchestrator.search_vector_memory.assert_not_called()
+    assert context.vector == [] and context.graph == []
+    assert [m.content for m in context.stm] == ["hi"]
+
+
+def test_slow_retrieval_is_skipped_after_timeout(orchestrator):
+    orchestrator.search_vector_memory.side_effect = lambda *_: time.sleep(0.5) or []
+    builder = ContextBuilder(orchestrator, retrieval_timeout=0.05)
+
+    context = builder.build("q", [])
+
+    assert context.vector == []
+    assert context.graph == ["user likes tea", "user lives in oslo"]
+
+
+def test_timeout_bounds_the_wait_for_all_sources_together(orchestrator):
+    orchestrator.search_vector_memory.side_effect = lambda *_: time.sleep(1) or []
+    orchestrator.search_graph_memory.side_effect = lambda *_, **__: time.sleep(1) or ""
+    builder = ContextBuilder(orchestrator, retrieval_timeout=0.2)
+
+    start = time.monotonic()
+    context = builder.build("q", [])
+
+    assert time.monotonic() - start < 0.35
+    assert context.vector == [] and context.graph == []
+
+
+def test_memory_exposes_long_term_context(orchestrator):
+    memory = NeurotraceMemory(MagicMock(spec=BaseChatModel), context_builder=ContextBuilder(orchestrator))
+    memory.save_context({"input": "hello"}, {"output": "hi there"})
+
+    variables = memory.load_memory_variables({"input": "what do I drink?"})
+
+    assert memory.memory_variables == ["chat_history", "long_term_context"]
+    assert len(variables["chat_history"]) == 2
+    assert "- user likes green tea" in variables["long_term_context"]
+    assert "Known facts:\n- user likes tea" in variables["long_term_context"]
+    orchestrator.search_vector_memory.assert_called_once_with("what do I drink?", 5)
+
+
+def test_default_graph_retrieval_is_direct_and_stm_is_left_untouched(orchestrator):
+    stm = [msg("old message here"), msg("newest")]
+
+    ContextBuilder(orchestrator).build("tea?", stm)
+
+    orchestrator.search_graph_memory.assert_called_once_with("tea?", mode="direct")
+    assert [m.metadata.token_count for m in stm] == [None, None]
@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock
+
+from langchain_core.embeddings import Embeddings
+
+from neurotrace.core.entity_resolution import (
+    EntityMergeJob,
+    EntityResolver,
+    normalise_entity,
+)
+from neurotrace.core.graph_memory import GraphMemoryAdapter
+from neurotrace.core.stores.in_memory_graph import InMemoryGraphStore
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds names onto fixed axes so chosen names are near-identical."""
+
+    AXES = {"big apple": [1.0, 0.0], "new york city": [0.99, 0.1], "boston": [0.0, 1.0]}
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.AXES.get(text, [0.5, 0.5])
+
+
+def test_normalise_entity():
+    assert normalise_entity("The New-York  Times") == "new york times"
+    assert normalise_entity("AT&T") == "at and t"
+
+
+def test_resolver_matches_spelling_variants():
+    resolver = EntityResolver(aliases={"big smoke": "london"})
+
+    assert resolver.resolve("new york city") == "new york city"
+    assert resolver.resolve("New-York City") == "new york city"
+    assert resolver.resolve("newyork city") == "new york city"
+    assert resolver.resolve("NYC") == "new york city"
+    assert resolver.resolve("microsoft corporation") == "microsoft corporation"
+    assert resolver.resolve("Microsoft Corporatoin") == "microsoft corporation"
+    assert resolver.resolve("The Big Smoke") == "london"
+    # Numbers must agree for a fuzzy match.
+    assert resolver.resolve("version 10") == "version 10"
+    assert resolver.resolve("version 11") == "version 11"
+    assert resolver.lookup("boston") is None
+    assert sorted(resolver.canonical_names) == [
+        "london",
+        "microsoft corporation",
+        "new york city",
+        "version 10",
+        "version 11",
+    ]
+
+
+def test_resolver_keeps_similar_distinct_names_apart():
+    resolver = EntityResolver()
+
+    for name in ["paris", "parish", "maria", "marian", "maria lopez", "maria lopez garcia"]:
+        assert resolver.resolve(name) == name
+
+
+def test_resolver_embedding_fallback():
+    resolver = EntityResolver(embeddings=KeywordEmbeddings())
+    resolver.resolve("new york city")
+
+    assert resolver.resolve("big apple") == "new york city"
+    assert resolver.resolve("boston") == "boston"
+
+
+def test_adapter_writes_canonical_names():
+    graph = InMemoryGraphStore()
+    graph.add_triplets([("new york city", "HAS", "subway")])
+    adapter = GraphMemoryAdapter(llm=MagicMock(), graph_database=graph, entity_resolver=EntityResolver())
+
+    adapter.add_triplets([["alice", "lives in", "NYC"], ["Alice", "visited", "new-york city"]])
+
+    assert sorted(graph.triplets()) == [
+        ("alice", "LIVES_IN", "new york city"),
+        ("alice", "VISITED", "new york city"),
+        ("new york city", "HAS", "subway"),
+    ]
+    assert adapter.find_entities("anything new in nyc?") == ["new york city"]
+
+
+def test_merge_job_collapses_existing_duplicates():
+    graph = InMemoryGraphStore()
+    graph.add_triplets(
+        [
+            ("alice", "LIVES_IN", "new york city"),
+            ("bob", "LIVES_IN", "nyc"),
+            ("nyc", "PART_OF", "usa"),
+            ("new york city", "PART_OF", "usa"),
+            ("nyc", "SAME_AS", "new york city"),
+        ]
+    )
+    adapter = GraphMemoryAdapter(llm=MagicMock(), graph_database=graph)
+
+    report = EntityMergeJob(adapter).run_once()
+
+    assert (report.entities_scanned, report.duplicates_merged, report.relationships_moved) == (5, 1, 2)
+    assert sorted(graph.triplets()) == [
+        ("alice", "LIVES_IN", "new york city"),
+        ("bob", "LIVES_IN", "new york city"),
+        ("new york city", "PART_OF", "usa"),
+    ]
+    assert graph.relationship_types() == ["LIVES_IN", "PART_OF"]
+
+
+def test_merge_job_only_merges_fuzzy_matches_when_asked():
+    graph = InMemoryGraphStore()
+    graph.add_triplets(
+        [
+            ("alice", "WORKS_AT", "microsoft corporation"),
+            ("bob", "WORKS_AT", "microsoft corporatoin"),
+        ]
+    )
+    adapter = GraphMemoryAdapter(llm=MagicMock(), graph_database=graph)
+
+    assert EntityMergeJob(adapter, resolver=EntityResolver()).run_once().duplicates_merged == 0
+    assert len(graph.triplets()) == 2
+
+    report = EntityMergeJob(adapter, resolver=EntityResolver(), merge_fuzzy_matches=True).run_once()
+
+    assert report.duplicates_merged == 1
+    assert sorted(graph.triplets()) == [
+        ("alice", "WORKS_AT", "microsoft corporation"),
+        ("bob", "WORKS_AT", "microsoft corporation"),
+    ]
+
+
+def test_merge_job_creates_a_canonical_entity_known_only_as_an_alias_target():
+    graph = InMemoryGraphStore()
+    graph.add_triplets([("nyc", "IS_IN", "usa"), ("alice", "LIVES_IN", "nyc")])
+    adapter = GraphMemoryAdapter(llm=MagicMock(), graph_database=graph)
+
+    report = EntityMergeJob(adapter, resolver=EntityResolver(aliases={"nyc": "new york city"})).run_once()
+
+    assert (report.duplicates_merged, report.relationships_moved) == (1, 2)
+    assert sorted(graph.triplets()) == [("alice", "LIVES_IN", "new york city"), ("new york city", "IS_IN", "usa")]
+    assert "nyc" not in graph.entity_names()
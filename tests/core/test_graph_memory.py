@@ -0,0 +1,95 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from neurotrace.core.graph_memory import AdjacencyCache, GraphMemoryAdapter
+from neurotrace.core.llm_tasks import get_vector_summary_and_triplets
+from neurotrace.core.stores.in_memory_graph import InMemoryGraphStore
+
+
+@pytest.fixture
+def adapter():
+    return GraphMemoryAdapter(llm=MagicMock(), graph_database=MagicMock())
+
+
+def test_add_triplets_groups_by_relation(adapter):
+    written = adapter.add_triplets(
+        [["alice", "works at", "acme"], ["bob", "works at", "acme"], ["alice", "likes", "tea"], ["bad"]],
+        tags=["work"],
+    )
+
+    assert written == 3
+    assert adapter.graph.query.call_count == 2
+    first_call = adapter.graph.query.call_args_list[0]
+    assert "UNWIND $rows" in first_call.args[0] and "`WORKS_AT`" in first_call.args[0]
+    assert first_call.kwargs["params"]["rows"] == [{"s": "alice", "o": "acme"}, {"s": "bob", "o": "acme"}]
+    assert first_call.kwargs["params"]["tags"] == ["work"]
+
+
+def test_get_vector_summary_and_triplets_parses_single_response():
+    response = json.dumps({"vector_summary": "Alice works at Acme", "triplets": [["Alice", "WORKS AT", "Acme"], ["x"]]})
+    llm = FakeListChatModel(responses=[f"```json\n{response}\n```"])
+
+    result = get_vector_summary_and_triplets(llm, "Alice works at Acme")
+
+    assert result == {"vector_summary": "Alice works at Acme", "triplets": [["alice", "works at", "acme"]]}
+
+
+def test_get_vector_summary_and_triplets_returns_empty_on_bad_json():
+    assert get_vector_summary_and_triplets(FakeListChatModel(responses=["nope"]), "text") == {}
+
+
+def test_find_entities_matches_multi_word_names_and_tracks_writes():
+    adapter = GraphMemoryAdapter(llm=MagicMock(), graph_database=InMemoryGraphStore())
+    adapter.add_triplets([["alice", "lives in", "new york"], ["the", "is", "a"]])
+
+    assert adapter.find_entities("Does Alice still live in New-York?") == ["alice", "new york"]
+
+    adapter.add_triplets([["bob", "knows", "alice"]])
+    assert adapter.find_entities("who is bob") == ["bob"]
+
+
+def test_search_facts_returns_neighbourhood_without_llm():
+    llm = MagicMock()
+    adapter = GraphMemoryAdapter(llm=llm, graph_database=InMemoryGraphStore())
+    adapter.add_triplets([["alice", "works at", "acme"], ["acme", "based in", "berlin"], ["bob", "likes", "tea"]])
+
+    assert adapter.search_facts("where does alice work?") == ["alice works at acme", "acme based in berlin"]
+    assert adapter.search_facts("where does alice work?", hops=1) == ["alice works at acme"]
+    assert adapter.search_facts("nothing relevant") == []
+    llm.assert_not_called()
+
+
+def test_adjacency_cache_serves_hot_entities_and_writes_through():
+    graph = InMemoryGraphStore()
+    graph.query = MagicMock(side_effect=graph.query)
+    adapter = GraphMemoryAdapter(llm=MagicMock(), graph_database=graph, adjacency_cache_size=2)
+    adapter.add_triplets([["alice", "works at", "acme"], ["acme", "based in", "berlin"]])
+
+    assert adapter.neighbourhood(["alice"]) == [("alice", "WORKS_AT", "acme"), ("acme", "BASED_IN", "berlin")]
+    queries = graph.query.call_count
+    assert adapter.neighbourhood(["alice"]) == [("alice", "WORKS_AT", "acme"), ("acme", "BASED_IN", "berlin")]
+    assert graph.query.call_count == queries
+    assert adapter.adjacency_cache.hits == 2
+
+    # Write-through: the new relationship is visible without another read.
+    adapter.add_triplets([["alice", "likes", "tea"]])
+    queries = graph.query.call_count
+    assert adapter.neighbourhood(["alice"], hops=1) == [("alice", "WORKS_AT", "acme"), ("alice", "LIKES", "tea")]
+    assert graph.query.call_count == queries
+
+    # Bounded: reading a third entity evicts the least recently used one.
+    adapter.neighbourhood(["berlin"], hops=1)
+    assert len(adapter.adjacency_cache) == 2
+
+
+def test_adjacency_cache_skips_fills_that_raced_with_a_write():
+    cache = AdjacencyCache()
+    generation = cache.generation
+    cache.add([("alice", "LIKES", "tea")])
+
+    cache.fill({"alice": []}, generation)
+
+    assert cache.get_many(["alice"]) == ({}, ["alice"])
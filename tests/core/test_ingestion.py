@@ -0,0 +1,82 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from neurotrace.core.ingestion import IngestionPipeline, StageConfig
+from neurotrace.core.memory import NeurotraceMemory
+from neurotrace.core.schema import Message
+from neurotrace.core.stores.numpy_vector_store import NumpyVectorStore
+from neurotrace.core.vector_memory import VectorMemoryAdapter
+
+SUMMARY = json.dumps({"vector_summary": "user likes tea", "triplets": [["User", "likes", "tea"]]})
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = MagicMock()
+    orchestrator.llm = FakeListChatModel(responses=[SUMMARY])
+    orchestrator.vector_memory_adapter = VectorMemoryAdapter(NumpyVectorStore(DeterministicFakeEmbedding(size=8)))
+    return orchestrator
+
+
+def transcript(n):
+    for i in range(n):
+        yield Message(role="human" if i % 2 == 0 else "ai", content=f"message number {i}")
+
+
+def test_pipeline_writes_vectors_and_triplets_per_chunk(orchestrator):
+    pipeline = IngestionPipeline(orchestrator, chunk_size=4, window_size=2, summarise=StageConfig(concurrency=3))
+
+    report = pipeline.run(transcript(10))
+
+    assert (report.messages, report.chunks, report.vectors, report.triplets) == (10, 3, 3, 3)
+    assert report.tokens == 30
+    assert len(orchestrator.vector_memory_adapter.vector_store) == 3
+    stored = orchestrator.vector_memory_adapter.search("user likes tea", k=1)[0]
+    assert stored.content == "user likes tea"
+    orchestrator.graph_indexer.extract.assert_not_called()
+    written = [t for call in orchestrator.graph_memory_adapter.add_triplets.call_args_list for t in call.args[0]]
+    assert written == [["user", "likes", "tea"]] * 3
+
+
+def test_pipeline_resumes_from_checkpoint(orchestrator, tmp_path):
+    checkpoint = tmp_path / "ingest.json"
+    IngestionPipeline(orchestrator, checkpoint_path=str(checkpoint), chunk_size=2, window_size=2).run(transcript(4))
+
+    report = IngestionPipeline(orchestrator, checkpoint_path=str(checkpoint), chunk_size=2, window_size=2).run(
+        transcript(6)
+    )
+
+    assert report.skipped == 4
+    assert report.messages == 2
+    assert json.loads(checkpoint.read_text()) == {"messages_done": 6}
+
+
+def test_resuming_a_crashed_window_does_not_duplicate_memories(orchestrator, tmp_path):
+    history = InMemoryChatMessageHistory()
+    memory = NeurotraceMemory(llm=orchestrator.llm, history=history)
+    checkpoint = str(tmp_path / "ingest.json")
+    orchestrator.graph_memory_adapter.add_triplets.side_effect = [RuntimeError("graph down"), None]
+
+    with pytest.raises(RuntimeError):
+        IngestionPipeline(orchestrator, memory=memory, checkpoint_path=checkpoint, chunk_size=2).run(transcript(4))
+    report = IngestionPipeline(orchestrator, memory=memory, checkpoint_path=checkpoint, chunk_size=2).run(transcript(4))
+
+    assert (report.skipped, report.messages) == (0, 4)
+    assert len(history.messages) == 4
+    assert len(orchestrator.vector_memory_adapter.vector_store) == 2
+    assert json.loads((tmp_path / "ingest.json").read_text()) == {"messages_done": 4}
+
+
+def test_unparseable_summary_falls_back_to_extraction(orchestrator):
+    orchestrator.llm = FakeListChatModel(responses=["not json"])
+    orchestrator.graph_indexer.extract.return_value = [["user", "said", "hi"]]
+
+    report = IngestionPipeline(orchestrator, chunk_size=2).run(transcript(2))
+
+    assert report.triplets == 1
+    assert orchestrator.vector_memory_adapter.search("anything", k=1)[0].content.startswith("human: message number 0")
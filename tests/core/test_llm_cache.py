@@ -0,0 +1,97 @@
+import json
+import sqlite3
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from neurotrace.core.llm_cache import (
+    LLMResponseCache,
+    disable_llm_cache,
+    enable_llm_cache,
+)
+from neurotrace.core.llm_tasks import (
+    get_vector_summary_and_triplets,
+    perform_summarisation,
+)
+
+
+@pytest.fixture
+def cache():
+    cache = enable_llm_cache()
+    yield cache
+    disable_llm_cache()
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LLMResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats.hits == 2 and cache.stats.misses == 1
+
+
+def test_ttl_expires_entries():
+    cache = LLMResponseCache(ttl=0.01)
+    cache.set("a", "1")
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    first = LLMResponseCache(path=path)
+    first.set("a", "1")
+    first.close()
+
+    second = LLMResponseCache(path=path)
+    assert second.get("a") == "1"
+    assert second.stats.disk_hits == 1
+    assert second.get("a") == "1"
+    assert second.stats.disk_hits == 1
+
+
+def test_key_depends_on_template_placeholders_and_model():
+    key = LLMResponseCache.make_key("t {x}", {"x": 1}, "m")
+
+    assert key == LLMResponseCache.make_key("t {x}", {"x": 1}, "m")
+    assert key != LLMResponseCache.make_key("t {x} ", {"x": 1}, "m")
+    assert key != LLMResponseCache.make_key("t {x}", {"x": 2}, "m")
+    assert key != LLMResponseCache.make_key("t {x}", {"x": 1}, "other")
+
+
+def test_perform_summarisation_uses_cache(cache):
+    llm = FakeListChatModel(responses=["first", "second"])
+
+    assert perform_summarisation(llm, {"message": "hello"}) == "first"
+    assert perform_summarisation(llm, {"message": "hello"}) == "first"
+    assert perform_summarisation(llm, {"message": "bye"}) == "second"
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+def test_expired_sqlite_rows_are_purged(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    first = LLMResponseCache(ttl=0.01, path=path)
+    first.set("a", "1")
+    first.set("b", "2")
+    time.sleep(0.02)
+
+    assert first.get("a") is None
+    assert first.purge_expired() == 1
+    first.close()
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+
+
+def test_unparseable_responses_are_not_cached(cache):
+    summary = json.dumps({"vector_summary": "user likes tea", "triplets": [["user", "likes", "tea"]]})
+    llm = FakeListChatModel(responses=["not json", summary])
+
+    assert get_vector_summary_and_triplets(llm, "hello") == {}
+    assert get_vector_summary_and_triplets(llm, "hello")["vector_summary"] == "user likes tea"
+    assert get_vector_summary_and_triplets(llm, "hello")["vector_summary"] == "user likes tea"
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
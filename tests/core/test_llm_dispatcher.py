@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from neurotrace.core.llm_dispatcher import LLMDispatcher
+
+
+class SlowEchoLLM:
+    """Echoes prompts after a delay and records how it was called."""
+
+    model_name = "echo"
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.invoked = []
+        self.batches = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.invoked.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return f" echo: {prompt} "
+
+    def batch(self, prompts, return_exceptions=False):
+        self.batches.append(list(prompts))
+        return [f"echo: {prompt}" for prompt in prompts]
+
+    async def ainvoke(self, prompt):
+        self.invoked.append(prompt)
+        await asyncio.sleep(self.delay)
+        return f"echo: {prompt}"
+
+    async def abatch(self, prompts, return_exceptions=False):
+        self.batches.append(list(prompts))
+        return [f"echo: {prompt}" for prompt in prompts]
+
+
+def test_identical_inflight_prompts_are_coalesced():
+    llm, dispatcher = SlowEchoLLM(), LLMDispatcher()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: dispatcher.invoke(llm, "same"), range(8)))
+
+    assert results == ["echo: same"] * 8
+    assert llm.invoked == ["same"]
+
+
+def test_concurrency_limit_is_enforced_per_model():
+    llm, dispatcher = SlowEchoLLM(delay=0.02), LLMDispatcher(max_concurrency=2)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: dispatcher.invoke(llm, f"p{i}"), range(8)))
+
+    assert len(llm.invoked) == 8
+    assert llm.max_active <= 2
+
+
+def test_concurrent_prompts_are_micro_batched():
+    llm, dispatcher = SlowEchoLLM(), LLMDispatcher(batch_window=0.1, max_batch_size=4)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda i: dispatcher.invoke(llm, f"p{i}"), range(4)))
+
+    assert results == [f"echo: p{i}" for i in range(4)]
+    assert [sorted(batch) for batch in llm.batches] == [["p0", "p1", "p2", "p3"]]
+
+
+def test_rate_limit_spaces_out_requests():
+    llm, dispatcher = SlowEchoLLM(delay=0), LLMDispatcher()
+    dispatcher.set_limits("echo", requests_per_second=10)
+
+    start = time.monotonic()
+    for i in range(15):
+        dispatcher.invoke(llm, f"p{i}")
+
+    # The bucket allows a one-second burst (10 calls); the other five wait ~100 ms each.
+    assert time.monotonic() - start >= 0.45
+
+
+def test_async_coalescing_and_batching():
+    async def run(dispatcher, llm, prompts):
+        return await asyncio.gather(*(dispatcher.ainvoke(llm, p) for p in prompts))
+
+    llm = SlowEchoLLM()
+    assert asyncio.run(run(LLMDispatcher(), llm, ["a", "a", "b"])) == ["echo: a", "echo: a", "echo: b"]
+    assert sorted(llm.invoked) == ["a", "b"]
+
+    llm = SlowEchoLLM()
+    assert asyncio.run(run(LLMDispatcher(batch_window=0.05), llm, ["a", "b", "c"])) == ["echo: a", "echo: b", "echo: c"]
+    assert llm.batches == [["a", "b", "c"]]
+
+
+def test_errors_reach_every_waiter():
+    class FailingLLM:
+        def invoke(self, prompt):
+            time.sleep(0.05)
+            raise RuntimeError("boom")
+
+    llm, dispatcher = FailingLLM(), LLMDispatcher()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(dispatcher.invoke, llm, "x") for _ in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result()
+
+
+def test_cancelling_the_first_caller_does_not_cancel_the_others():
+    async def run(dispatcher, llm, prompts):
+        tasks = [asyncio.ensure_future(dispatcher.ainvoke(llm, p)) for p in prompts]
+        await asyncio.sleep(0.01)
+        tasks[0].cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    llm = SlowEchoLLM()
+    first, *others = asyncio.run(run(LLMDispatcher(), llm, ["a", "a", "a"]))
+    assert isinstance(first, asyncio.CancelledError)
+    assert others == ["echo: a", "echo: a"]
+
+    llm = SlowEchoLLM()
+    first, *others = asyncio.run(run(LLMDispatcher(batch_window=0.05), llm, ["a", "b", "c"]))
+    assert isinstance(first, asyncio.CancelledError)
+    assert others == ["echo: b", "echo: c"]
+    assert llm.batches == [["a", "b", "c"]]
+
+
+def test_cancelled_async_waiter_does_not_leak_a_concurrency_slot():
+    async def run(dispatcher, llm):
+        tasks = [asyncio.ensure_future(dispatcher.ainvoke(llm, f"p{i}")) for i in range(3)]
+        await asyncio.sleep(0.01)
+        tasks[1].cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return results, await dispatcher.ainvoke(llm, "after")
+
+    llm, dispatcher = SlowEchoLLM(delay=0.02), LLMDispatcher(max_concurrency=1)
+    results, after = asyncio.run(run(dispatcher, llm))
+
+    assert results[0] == "echo: p0" and results[2] == "echo: p2"
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert after == "echo: after"
+    assert llm.invoked == ["p0", "p2", "after"]
@@ -6,6 +6,7 @@ which implements a custom memory system for LangChain integrations. Tests cover
 variable handling, context preservation, and message conversion functionality.
 """
 
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -161,3 +162,51 @@ def test_neurotrace_memory_with_ltm_and_stm(mock_llm):
     assert lc_msgs[0].content == user_msg.content
     assert isinstance(lc_msgs[1], AIMessage)
     assert lc_msgs[1].content == ai_msg.content
+
+
+def test_save_context_writes_each_turn_to_history_in_one_step(mock_llm):
+    history = MagicMock()
+    memory = NeurotraceMemory(mock_llm, history=history)
+
+    memory.save_context({"input": "hi"}, {"output": "hello"})
+
+    history.add_messages.assert_called_once()
+    assert [m.content for m in history.add_messages.call_args.args[0]] == ["hi", "hello"]
+
+
+def test_concurrent_turns_reach_history_in_stm_order(mock_llm):
+    history = InMemoryChatMessageHistory()
+    memory = NeurotraceMemory(mock_llm, max_tokens=10_000, history=history)
+
+    def worker(n):
+        for i in range(50):
+            memory.save_context({"input": f"q {n} {i}"}, {"output": f"a {n} {i}"})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [m.content for m in history.messages] == [m.content for m in memory._stm.get_messages()]
+
+
+def test_snapshot_restores_session_in_another_memory(mock_llm):
+    memory = NeurotraceMemory(mock_llm, session_id="s1")
+    memory.save_context({"input": "hi"}, {"output": "hello"})
+
+    other = NeurotraceMemory(mock_llm, session_id="s1")
+    other.restore(memory.snapshot())
+
+    assert other._stm.get_messages() == memory._stm.get_messages()
+
+
+def test_prefetcher_follows_the_turn(mock_llm):
+    prefetcher = MagicMock()
+    memory = NeurotraceMemory(mock_llm, prefetcher=prefetcher)
+
+    memory.load_memory_variables({"input": "hi"})
+    memory.save_context({"input": "hi"}, {"output": "hello"})
+
+    prefetcher.prefetch.assert_called_once_with("hi")
+    prefetcher.discard.assert_called_once_with("hi")
@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from neurotrace.core.hippocampus.memory_orchestrator import MemoryOrchestrator
+from neurotrace.core.stores.in_memory_graph import InMemoryGraphStore
+from neurotrace.core.stores.numpy_vector_store import NumpyVectorStore
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = MemoryOrchestrator(
+        FakeListChatModel(responses=["unused"]),
+        InMemoryGraphStore(),
+        NumpyVectorStore(DeterministicFakeEmbedding(size=8)),
+    )
+    orchestrator.graph_memory_adapter.add_triplets([["alice", "works at", "acme"]])
+    orchestrator.graph_memory_adapter.ask_graph = MagicMock(return_value={"result": "from the chain"})
+    return orchestrator
+
+
+def test_search_graph_memory_answers_directly_when_entities_match(orchestrator):
+    assert orchestrator.search_graph_memory("Where does Alice work?") == "alice works at acme"
+    orchestrator.graph_memory_adapter.ask_graph.assert_not_called()
+
+
+def test_search_graph_memory_falls_back_to_chain(orchestrator):
+    assert orchestrator.search_graph_memory("Where does Carol work?") == "from the chain"
+    assert orchestrator.search_graph_memory("Where does Carol work?", mode="direct") == ""
+    assert orchestrator.search_graph_memory("Where does Alice work?", mode="chain") == "from the chain"
+
+
+def test_known_entity_without_facts_falls_back_to_chain(orchestrator):
+    orchestrator.graph_memory_adapter.find_entities = MagicMock(return_value=["dave"])
+
+    assert orchestrator.search_graph_memory("Where does Dave work?") == "from the chain"
+    assert orchestrator.search_graph_memory("Where does Dave work?", mode="direct") == ""
+    orchestrator.graph_memory_adapter.ask_graph.assert_called_once_with("Where does Dave work?")
+
+
+def test_failing_fallback_returns_no_facts(orchestrator):
+    orchestrator.graph_memory_adapter.ask_graph.side_effect = ValueError("unsupported query")
+
+    assert orchestrator.search_graph_memory("Where does Carol work?") == ""
+    with pytest.raises(ValueError):
+        orchestrator.search_graph_memory("Where does Carol work?", mode="chain")
+
+
+def test_fallback_does_not_hide_connection_errors(orchestrator):
+    orchestrator.graph_memory_adapter.ask_graph.side_effect = ConnectionError("graph down")
+
+    with pytest.raises(ConnectionError):
+        orchestrator.search_graph_memory("Where does Carol work?")
@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from neurotrace.core import metrics
+from neurotrace.core.hippocampus.stm import ShortTermMemory
+from neurotrace.core.schema import Message
+
+
+@pytest.fixture
+def exporter():
+    exporter = metrics.enable_metrics(metrics.PrometheusExporter())
+    yield exporter
+    metrics.disable_metrics()
+
+
+def test_disabled_hooks_do_nothing():
+    metrics.disable_metrics()
+    assert metrics.timer("x_seconds") is metrics.timer("y_seconds")
+    metrics.inc("x_total")
+    metrics.observe("x", 1)
+
+
+def test_prometheus_render(exporter):
+    metrics.inc("jobs_total", 2, kind="a")
+    metrics.inc("jobs_total", kind="a")
+    metrics.observe("batch_size", 3)
+    with metrics.timer("work_seconds", op='say "hi"'):
+        pass
+
+    text = exporter.render()
+
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{kind="a"} 3' in text
+    assert 'batch_size_bucket{le="2"} 0' in text and 'batch_size_bucket{le="5"} 1' in text
+    assert 'batch_size_bucket{le="+Inf"} 1' in text and "batch_size_count 1" in text
+    assert 'work_seconds_count{op="say \\"hi\\""} 1' in text
+
+
+def test_prometheus_render_keeps_full_precision(exporter):
+    metrics.inc("big_total", 1234567)
+    metrics.observe("payload_bytes", 1234.5678)
+
+    text = exporter.render()
+
+    assert "big_total 1234567\n" in text
+    assert "payload_bytes_sum 1234.5678\n" in text
+
+
+def test_exporter_interface_is_abstract():
+    with pytest.raises(TypeError):
+        metrics.MetricsExporter()
+
+
+def test_timer_labels_failures(exporter):
+    with pytest.raises(ValueError):
+        with metrics.timer("work_seconds"):
+            raise ValueError()
+
+    assert exporter.histogram_count("work_seconds", error="ValueError") == 1
+
+
+def test_opentelemetry_exporter_creates_instruments_once():
+    meter = MagicMock()
+    metrics.enable_metrics(metrics.OpenTelemetryExporter(meter))
+    try:
+        metrics.inc("calls_total", model="m")
+        metrics.inc("calls_total", model="m")
+        metrics.observe("call_seconds", 0.5)
+    finally:
+        metrics.disable_metrics()
+
+    meter.create_counter.assert_called_once_with("calls_total", unit="1")
+    meter.create_counter.return_value.add.assert_called_with(1, attributes={"model": "m"})
+    meter.create_histogram.return_value.record.assert_called_once_with(0.5, attributes={})
+
+
+def test_stm_is_instrumented(exporter):
+    stm = ShortTermMemory(max_tokens=3)
+    for text in ["a b", "c d", "e"]:
+        stm.append(Message(role="human", content=text))
+
+    assert exporter.counter_value("neurotrace_stm_appends_total") == 3
+    assert exporter.counter_value("neurotrace_stm_evictions_total") == 1
+    assert exporter.histogram_count("neurotrace_stm_evict_seconds") == 3
@@ -0,0 +1,56 @@
+"""
+Test module for the MemoryPrefetcher.
+
+This module contains tests that verify prefetched retrieval is served to later
+searches for the same turn, that unrelated searches miss, and that discarded
+turns cancel searches that have not started.
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+from neurotrace.core.prefetch import MemoryPrefetcher
+from neurotrace.core.schema import Message
+
+
+def _orchestrator():
+    orchestrator = MagicMock()
+    orchestrator.search_vector_memory.return_value = [Message(role="ai", content="user likes tea")]
+    orchestrator.search_graph_memory.return_value = "user -> likes -> tea"
+    return orchestrator
+
+
+def test_prefetched_turn_is_served_without_searching_again():
+    orchestrator = _orchestrator()
+    prefetcher = MemoryPrefetcher(orchestrator)
+
+    prefetcher.prefetch("What does the user  drink?")
+    vector, graph = prefetcher.get("what does the user drink?")
+
+    assert [m.content for m in vector] == ["user likes tea"] and graph == "user -> likes -> tea"
+    orchestrator.search_vector_memory.assert_called_once_with("What does the user  drink?", 5)
+    assert prefetcher.get("something else") is None
+
+
+def test_reuse_for_turn_serves_rephrased_searches():
+    prefetcher = MemoryPrefetcher(_orchestrator(), reuse_for_turn=True)
+
+    prefetcher.prefetch("What does the user drink?")
+
+    assert prefetcher.get("user beverage preference") is not None
+
+
+def test_discard_cancels_prefetches_that_have_not_started():
+    release = threading.Event()
+    orchestrator = _orchestrator()
+    orchestrator.search_vector_memory.side_effect = lambda query, k: release.wait() and []
+    prefetcher = MemoryPrefetcher(orchestrator, max_workers=1)
+
+    prefetcher.prefetch("first turn")  # occupies the only worker
+    prefetcher.prefetch("second turn")
+    prefetcher.discard("second turn")
+    release.set()
+
+    assert prefetcher.get("first turn") is not None
+    assert prefetcher.get("second turn") is None
+    assert orchestrator.search_graph_memory.call_args_list == [(("first turn",), {"mode": "direct"})]
@@ -0,0 +1,49 @@
+"""
+Test module for query rewriting and reciprocal rank fusion.
+
+This module contains tests that verify rewrites are cached by normalised query,
+that a failed rewrite falls back to the original query, and that results of the
+variant searches are fused by rank.
+"""
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from neurotrace.core.query_rewrite import QueryRewriter, reciprocal_rank_fusion
+from neurotrace.core.schema import Message
+
+
+def test_reciprocal_rank_fusion_prefers_messages_found_by_several_queries():
+    tea, coffee, jazz = (Message(role="ai", content=c) for c in ("tea", "coffee", "jazz"))
+
+    fused = reciprocal_rank_fusion([[tea, coffee], [jazz, coffee], [coffee]], k=2)
+
+    assert [m.content for m in fused] == ["coffee", "tea"]
+
+
+def test_rewrites_are_cached_by_normalised_query():
+    rewriter = QueryRewriter(FakeListChatModel(responses=['["favourite drink", "beverage preference"]']))
+
+    first = rewriter.rewrite("What does the user drink?")
+    second = rewriter.rewrite("  what does the USER drink? ")
+
+    assert first == ["What does the user drink?", "favourite drink", "beverage preference"]
+    assert second[1:] == first[1:]
+    assert rewriter.cache.stats.hits == 1 and rewriter.cache.stats.misses == 1
+
+
+def test_unparseable_rewrite_falls_back_to_original_query():
+    rewriter = QueryRewriter(FakeListChatModel(responses=["not json"]))
+
+    assert rewriter.rewrite("tea?") == ["tea?"]
+    assert rewriter.rewrite("tea?") == ["tea?"]
+    assert rewriter.cache.stats.misses == 2
+
+
+def test_search_runs_every_variant_and_fuses_results():
+    tea, coffee = Message(role="ai", content="likes tea"), Message(role="ai", content="likes coffee")
+    results = {"drink?": [tea], "hot beverages": [coffee, tea]}
+    rewriter = QueryRewriter(FakeListChatModel(responses=['["hot beverages"]']), variants=1)
+
+    fused = rewriter.search(lambda query, k: results[query], "drink?", k=5)
+
+    assert [m.content for m in fused] == ["likes tea", "likes coffee"]
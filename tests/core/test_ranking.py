@@ -0,0 +1,71 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from neurotrace.core.ranking import MemoryRanker
+from neurotrace.core.schema import EmotionTag, Message, MessageMetadata
+from neurotrace.core.stores.numpy_vector_store import NumpyVectorStore
+from neurotrace.core.vector_memory import VectorMemoryAdapter
+
+NOW = datetime(2024, 6, 1, tzinfo=UTC)
+WEEK = 7 * 24 * 3600
+
+
+def _message(content, age_days=0.0, intensity=None):
+    emotions = EmotionTag(intensity=intensity) if intensity is not None else None
+    return Message(
+        role="human",
+        content=content,
+        timestamp=NOW - timedelta(days=age_days),
+        metadata=MessageMetadata(emotions=emotions),
+    )
+
+
+def test_recency_outranks_slightly_better_similarity():
+    stale, recent = _message("stale", age_days=70), _message("recent")
+    ranker = MemoryRanker(frequency_weight=0, half_life=WEEK)
+
+    assert ranker.rank([stale, recent], [0.9, 0.8], k=1, now=NOW.timestamp()) == [recent]
+    assert MemoryRanker(recency_weight=0).rank([stale, recent], [0.9, 0.8], k=1) == [stale]
+
+
+def test_scores_combine_every_signal():
+    messages = [_message("a", age_days=7, intensity=0.5), _message("b")]
+    ranker = MemoryRanker(similarity_weight=1, recency_weight=1, frequency_weight=1, intensity_weight=1, half_life=WEEK)
+    ranker.record_access([messages[0].id, messages[0].id])
+
+    scores = ranker.scores(messages, [0.5, 0.5], now=NOW.timestamp())
+
+    assert scores == pytest.approx([0.5 + 0.5 + 1.0 + 0.5, 0.5 + 1.0 + 0.0 + 0.0])
+
+
+def test_rank_counts_accesses_and_keeps_order_for_ties():
+    messages = [_message(str(i)) for i in range(4)]
+    ranker = MemoryRanker(recency_weight=0, frequency_weight=0)
+
+    assert ranker.rank(messages, [0.1, 0.5, 0.5, 0.9], k=3) == [messages[3], messages[1], messages[2]]
+    assert [ranker.access_count(msg.id) for msg in messages] == [0, 1, 1, 1]
+    assert ranker.rank([], [], k=3) == []
+
+
+def test_access_counts_are_bounded_to_the_most_recent_memories():
+    ranker = MemoryRanker(max_tracked=2)
+
+    ranker.record_access(["a", "b", "a"])
+    ranker.record_access(["c"])
+
+    assert [ranker.access_count(doc_id) for doc_id in "abc"] == [2, 0, 1]
+    assert len(ranker._accesses) == 2
+
+
+def test_adapter_overfetches_and_reranks():
+    store = NumpyVectorStore(DeterministicFakeEmbedding(size=16))
+    adapter = VectorMemoryAdapter(store, ranker=MemoryRanker(similarity_weight=0, frequency_weight=0), overfetch=3)
+    adapter.add_messages([_message(f"old {i}", age_days=30) for i in range(5)] + [_message("new")])
+
+    results = adapter.search("old 0", k=2)
+
+    assert len(results) == 2
+    assert results[0].content == "new"
+    assert results[1].timestamp == NOW - timedelta(days=30)
@@ -0,0 +1,126 @@
+"""
+Test module for the ReindexJob.
+
+This module contains tests that verify vector memory is copied into a store
+using a new embedding model page by page, that writes made during the
+reindex reach the new store, that an interrupted job resumes from its
+checkpoint, and that the adapter switches to the new store at the end.
+"""
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from neurotrace.core.checkpoint import JsonCheckpoint
+from neurotrace.core.reindex import ReindexJob
+from neurotrace.core.schema import Message
+from neurotrace.core.stores.numpy_vector_store import NumpyVectorStore
+from neurotrace.core.vector_memory import VectorMemoryAdapter
+
+
+def _adapter(n: int) -> VectorMemoryAdapter:
+    adapter = VectorMemoryAdapter(NumpyVectorStore(embedding=DeterministicFakeEmbedding(size=8)))
+    adapter.add_messages([Message(role="ai", content=f"memory {i}") for i in range(n)])
+    return adapter
+
+
+def test_reindex_copies_every_memory_and_switches():
+    adapter = _adapter(25)
+    target = NumpyVectorStore(embedding=DeterministicFakeEmbedding(size=16))
+
+    report = adapter.reindex(target, page_size=10, batch_size=4)
+
+    assert (report.documents, report.pages, report.switched) == (25, 3, True)
+    assert adapter.vector_store is target and len(target) == 25
+    assert target.get_vectors(slice(0, 1)).shape == (1, 16)
+    assert [m.content for m in adapter.search("memory 7", k=1)] == ["memory 7"]
+
+
+def test_writes_during_reindex_reach_the_new_store():
+    adapter = _adapter(5)
+    target = NumpyVectorStore(embedding=DeterministicFakeEmbedding(size=16))
+    job = ReindexJob(adapter, target, page_size=2, switch=False)
+    deleted = adapter.metadata_items()[0][0]
+
+    pages = adapter.iter_documents
+
+    def iter_documents(page_size, cursor=0):
+        for number, (page, next_cursor) in enumerate(pages(page_size, cursor)):
+            yield page, next_cursor
+            if number == 0:
+                adapter.add_messages([Message(role="ai", content="written during the reindex")])
+                adapter.delete([deleted])
+
+    adapter.iter_documents = iter_documents
+    report = job.run()
+
+    assert not report.switched and adapter.vector_store is not target
+    assert {doc_id for doc_id, _ in target.metadata_items()} == {doc_id for doc_id, _ in adapter.metadata_items()}
+
+
+def test_page_walk_does_not_skip_documents_when_earlier_ones_are_deleted():
+    adapter = _adapter(6)
+    seen = []
+
+    for page, _ in adapter.iter_documents(page_size=2):
+        seen += [doc.page_content for doc in page]
+        if len(seen) == 2:
+            adapter.delete([doc.id for doc in page])
+
+    assert seen == [f"memory {i}" for i in range(6)]
+    assert adapter.count() == 4
+
+
+def test_documents_rewritten_while_their_page_is_copied_are_copied_again():
+    adapter = _adapter(4)
+    target = NumpyVectorStore(embedding=DeterministicFakeEmbedding(size=16))
+    pages = adapter.iter_documents
+    rewritten = []
+
+    def iter_documents(page_size, cursor=0):
+        for number, (page, next_cursor) in enumerate(pages(page_size, cursor)):
+            if number == 0:
+                # Mirrored to the target before the job copies the page it already read.
+                rewritten.append(page[0].id)
+                adapter.add_messages([Message(id=page[0].id, role="ai", content="rewritten")])
+            yield page, next_cursor
+
+    adapter.iter_documents = iter_documents
+    report = ReindexJob(adapter, target, page_size=2).run()
+
+    assert (report.reconciled_added, report.reconciled_updated) == (0, 1)
+    assert [doc.page_content for doc in target.get_by_ids(rewritten)] == ["rewritten"]
+
+
+def test_failed_reindex_stops_mirroring_writes():
+    adapter = _adapter(3)
+    target = NumpyVectorStore(embedding=DeterministicFakeEmbedding(size=16))
+    target.add_embeddings = None  # makes _copy fail part-way
+
+    with pytest.raises(TypeError):
+        ReindexJob(adapter, target).run()
+
+    assert adapter._shadow_store is None and adapter.vector_store is not target
+
+
+def test_reindex_checks_the_target_can_be_listed_before_copying():
+    adapter = _adapter(3)
+    target = InMemoryVectorStore(embedding=DeterministicFakeEmbedding(size=16))
+
+    with pytest.raises(NotImplementedError):
+        ReindexJob(adapter, target).run()
+
+    assert len(target.store) == 0 and adapter._shadow_store is None
+
+
+def test_reindex_resumes_from_checkpoint(tmp_path):
+    adapter = _adapter(12)
+    target = NumpyVectorStore(embedding=DeterministicFakeEmbedding(size=16))
+    checkpoint = tmp_path / "reindex.json"
+    JsonCheckpoint(checkpoint).save({"cursor": 10, "documents_done": 10})
+
+    report = ReindexJob(adapter, target, checkpoint_path=str(checkpoint), page_size=5).run()
+
+    # The two remaining documents come from the walk, the ten skipped ones from the reconcile step.
+    assert (report.resumed_from, report.documents, report.reconciled_added) == (10, 2, 10)
+    assert len(target) == 12 and not checkpoint.exists()
@@ -0,0 +1,74 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from neurotrace.core.graph_memory import GraphMemoryAdapter
+from neurotrace.core.retention import CompactionJob, RetentionPolicy
+from neurotrace.core.schema import EmotionTag, Message, MessageMetadata
+from neurotrace.core.stores.in_memory_graph import InMemoryGraphStore
+from neurotrace.core.stores.numpy_vector_store import NumpyVectorStore
+from neurotrace.core.vector_memory import VectorMemoryAdapter
+
+NOW = 1_000_000.0
+
+
+def test_policy_expires_by_age_importance_and_session_cap():
+    items = [
+        ("old", {"created_at": NOW - 100}),
+        ("old-but-important", {"created_at": NOW - 100, "importance": 0.9}),
+        ("unknown-age", {}),
+        ("trivial", {"created_at": NOW, "importance": 0.1}),
+        ("s1-a", {"created_at": NOW - 3, "session_id": "s1"}),
+        ("s1-b", {"created_at": NOW - 2, "session_id": "s1"}),
+        ("s1-c", {"created_at": NOW - 1, "session_id": "s1"}),
+    ]
+    policy = RetentionPolicy(max_age=50, max_per_session=2, min_importance=0.2, keep_importance=0.8)
+
+    assert sorted(policy.expired(items, now=NOW)) == ["old", "s1-a", "trivial"]
+    assert RetentionPolicy().expired(items, now=NOW) == []
+
+
+def test_relationship_cutoff():
+    policy = RetentionPolicy(relationship_max_age=86400)
+
+    assert policy.relationship_cutoff(datetime(2024, 1, 2)) == "2024-01-01T00:00:00"
+    assert RetentionPolicy().relationship_cutoff() is None
+
+
+def test_compaction_job_reports_reclaimed_space(tmp_path):
+    store = NumpyVectorStore(DeterministicFakeEmbedding(size=8), persist_directory=str(tmp_path))
+    vector_memory = VectorMemoryAdapter(store)
+    old = datetime(2020, 1, 1).astimezone()
+    vector_memory.add_messages(
+        [Message(role="human", content=f"old {i}", timestamp=old) for i in range(3)]
+        + [
+            Message(
+                role="human",
+                content="old but important",
+                timestamp=old,
+                metadata=MessageMetadata(emotions=EmotionTag(intensity=0.95)),
+            ),
+            Message(role="human", content="fresh"),
+        ]
+    )
+    graph_memory = GraphMemoryAdapter(llm=MagicMock(), graph_database=InMemoryGraphStore())
+    graph_memory.add_triplets([["alice", "likes", "tea"]], timestamp="2020-01-01T00:00:00")
+    graph_memory.add_triplets([["bob", "likes", "coffee"]])
+
+    job = CompactionJob(
+        RetentionPolicy(max_age=86400, keep_importance=0.9, relationship_max_age=86400),
+        vector_memory_adapter=vector_memory,
+        graph_memory_adapter=graph_memory,
+        batch_size=2,
+    )
+    report = job.run_once()
+
+    assert (report.vectors_scanned, report.vectors_deleted) == (5, 3)
+    assert (report.relationships_deleted, report.entities_deleted) == (1, 2)
+    assert report.bytes_reclaimed > 0
+    assert len(store.get_vectors(slice(None))) == 2
+    assert sorted(msg.content for msg in vector_memory.search("old", k=5)) == ["fresh", "old but important"]
+    assert vector_memory.search("old but important", k=1)[0].timestamp == old
+    assert graph_memory.graph.triplets() == [("bob", "LIKES", "coffee")]
+    assert job.run_once().vectors_deleted == 0
@@ -1,9 +1,19 @@
-import pytest
-from neurotrace.core.schema import Message, MessageMetadata, EmotionTag
-from langchain_core.messages import HumanMessage, AIMessage
 from datetime import datetime
 from uuid import UUID
 
+import pytest
+from langchain_community.vectorstores.utils import filter_complex_metadata
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage
+
+from neurotrace.core.schema import (
+    EmotionTag,
+    Message,
+    MessageMetadata,
+    documents_to_messages,
+    messages_to_documents,
+)
+
 
 def test_message_creation_with_defaults():
     msg = Message(role="user", content="Hello, world!")
@@ -82,3 +92,49 @@ def test_uuid_is_unique():
     m1 = Message(role="user", content="One")
     m2 = Message(role="user", content="Two")
     assert m1.id != m2.id
+
+
+def test_messages_to_documents_matches_filtered_model_dump():
+    msgs = [
+        Message(role="human", content="Hi", metadata=MessageMetadata(tags=["x"], embedding=[0.1], token_count=2)),
+        Message(role="ai", content="Hello", metadata=MessageMetadata(emotions=EmotionTag(sentiment="positive"))),
+    ]
+
+    docs = messages_to_documents(msgs)
+
+    expected = filter_complex_metadata(
+        [
+            Document(page_content=m.content, metadata={"id": m.id, "role": m.role, **m.metadata.model_dump()})
+            for m in msgs
+        ]
+    )
+    assert [doc.metadata for doc in docs] == [doc.metadata for doc in expected]
+    assert "embedding" not in docs[0].metadata
+    assert "tags" not in docs[0].metadata
+    assert docs[0].metadata["token_count"] == 2
+
+
+def test_documents_to_messages_round_trip_without_mutation():
+    docs = messages_to_documents([Message(role="ai", content="Stored", metadata=MessageMetadata(session_id="s1"))])
+    before = dict(docs[0].metadata)
+
+    msgs = documents_to_messages(docs)
+
+    assert docs[0].metadata == before
+    assert msgs[0].role == "ai"
+    assert msgs[0].id == before["id"]
+    assert msgs[0].metadata.session_id == "s1"
+
+
+def test_from_document_with_only_role_uses_default_metadata():
+    msg = Message.from_document(Document(page_content="bare", metadata={"role": "ai"}))
+
+    assert msg.metadata == MessageMetadata()
+    assert msg.id
+
+
+def test_documents_to_messages_do_not_share_list_defaults():
+    msgs = documents_to_messages([Document(page_content="a"), Document(page_content="b")])
+    msgs[0].metadata.tags.append("only-first")
+
+    assert msgs[1].metadata.tags == []
@@ -0,0 +1,48 @@
+"""
+Test module for the binary snapshot encoding.
+
+This module contains tests that verify messages survive a round trip through
+``encode_messages``/``decode_messages`` with ids, timestamps and metadata intact,
+and that malformed snapshots are rejected.
+"""
+
+import pytest
+
+from neurotrace.core.schema import EmotionTag, Message, MessageMetadata
+from neurotrace.core.snapshot import decode_messages, encode_messages
+
+
+def test_snapshot_round_trip_preserves_messages():
+    messages = [
+        Message(
+            role="human",
+            content="I love jazz — especially Coltrane",
+            metadata=MessageMetadata(
+                embedding=[0.5, -0.25, 1.0],
+                tags=["music", "preference"],
+                emotions=EmotionTag(sentiment="positive", intensity=0.75),
+                session_id="s1",
+                related_ids=["abc"],
+            ),
+        ),
+        Message(role="ai", content="Noted!"),
+    ]
+
+    restored = decode_messages(encode_messages(messages))
+
+    assert restored == messages
+    assert [m.id for m in restored] == [m.id for m in messages]
+    assert restored[0].metadata.embedding == [0.5, -0.25, 1.0]
+    assert restored[0].metadata.emotions.intensity == 0.75
+    assert restored[1].metadata.embedding is None
+    assert restored[0].timestamp == messages[0].timestamp
+
+
+def test_snapshot_rejects_foreign_or_corrupt_data():
+    data = encode_messages([Message(role="human", content="hello")])
+
+    with pytest.raises(ValueError):
+        decode_messages(b"not a snapshot at all")
+    with pytest.raises(ValueError):
+        decode_messages(data + b"\x00")
+    assert decode_messages(encode_messages([])) == []
@@ -7,7 +7,9 @@ message append operations, retrieval functionality, and memory management featur
 token limits and time-based expiration.
 """
 
+import threading
 from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
 
 from neurotrace.core.hippocampus.stm import ShortTermMemory
 from neurotrace.core.schema import Message, MessageMetadata
@@ -134,3 +136,58 @@ def test_stm_append_overflow_all():
     msg1 = Message(role="user", content="long message", metadata=MessageMetadata(token_count=3))
     stm.append(msg1)
     assert len(stm.get_messages()) == 1
+
+
+def test_snapshot_is_not_changed_by_later_writes():
+    stm = ShortTermMemory(max_tokens=100)
+    stm.append(Message(role="user", content="first"))
+    snapshot = stm.get_messages()
+
+    stm.append(Message(role="ai", content="second"))
+
+    assert [m.content for m in snapshot] == ["first"]
+    assert len(stm) == 2
+
+
+def test_concurrent_extends_keep_pairs_and_token_total(monkeypatch):
+    # Thousands of log records would outlive the test's captured stderr.
+    monkeypatch.setattr("neurotrace.core.hippocampus.stm.MemoryLogger", MagicMock())
+    stm = ShortTermMemory(max_tokens=400)
+
+    def worker(n):
+        for i in range(200):
+            stm.extend([Message(role="human", content=f"q {n} {i}"), Message(role="ai", content=f"a {n} {i}")])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    messages = stm.get_messages()
+    assert stm.total_tokens() == sum(m.estimated_token_length() for m in messages) <= 400
+    # Eviction is per message, so the oldest one may be an answer whose question is gone.
+    if messages[0].role == "ai":
+        messages = messages[1:]
+    for question, answer in zip(messages[::2], messages[1::2]):
+        assert question.content.split()[1:] == answer.content.split()[1:]
+
+
+def test_stm_restore_from_snapshot_applies_token_limit():
+    source = ShortTermMemory(max_tokens=100)
+    source.extend([Message(role="user", content="one two three"), Message(role="ai", content="four five")])
+
+    target = ShortTermMemory(max_tokens=2)
+    target.restore(source.snapshot())
+
+    assert [m.id for m in target.get_messages()] == [source.get_messages()[1].id]
+    assert target.total_tokens() == 2
+
+
+def test_assigning_messages_applies_token_limit():
+    stm = ShortTermMemory(max_tokens=2)
+
+    stm.messages = [Message(role="user", content="one two"), Message(role="ai", content="three")]
+
+    assert [m.content for m in stm.messages] == ["three"]
+    assert stm.total_tokens() == 1
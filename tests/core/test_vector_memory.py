@@ -64,3 +64,15 @@ def test_delete_raises_if_not_supported(mock_vector_store, mock_embedding_model)
 
     with pytest.raises(NotImplementedError):
         adapter.delete(["msg1"])
+
+
+def test_search_with_query_rewriter_searches_each_variant(mock_vector_store):
+    rewriter = MagicMock()
+    rewriter.search.side_effect = lambda search, query, k: search("rewritten " + query, k)
+    adapter = VectorMemoryAdapter(vector_store=mock_vector_store, query_rewriter=rewriter)
+    mock_vector_store.similarity_search.return_value = [Document(page_content="tea", metadata={"role": "ai"})]
+
+    results = adapter.search("drink", k=3)
+
+    mock_vector_store.similarity_search.assert_called_once_with(query="rewritten drink", k=3)
+    assert [m.content for m in results] == ["tea"]
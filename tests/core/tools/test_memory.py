@@ -0,0 +1,79 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from neurotrace.core.schema import Message
+from neurotrace.core.tools.memory import (
+    MEMORY_CONTEXT_FOOTER,
+    MEMORY_CONTEXT_HEADER,
+    NO_MEMORY_FOUND,
+    memory_search_tool,
+    stream_memory_search,
+)
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = MagicMock()
+    orchestrator.llm = FakeListChatModel(responses=["User likes tea."])
+    orchestrator.search_vector_memory.return_value = [Message(role="ai", content="user likes tea")]
+    orchestrator.search_graph_memory.return_value = "user -> likes -> tea"
+    return orchestrator
+
+
+def test_stream_memory_search_yields_chunks(orchestrator):
+    chunks = list(stream_memory_search(orchestrator, "what does the user drink?", token_budget=None))
+
+    assert chunks[0] == MEMORY_CONTEXT_HEADER and chunks[-1] == MEMORY_CONTEXT_FOOTER
+    assert len(chunks) > 3
+    assert "".join(chunks[1:-1]) == "User likes tea."
+
+
+def test_search_tool_sync_and_async_agree(orchestrator):
+    tool = memory_search_tool(orchestrator, tool_description="search", summary_token_budget=None)
+
+    sync_result = tool.invoke("what does the user drink?")
+    async_result = asyncio.run(tool.ainvoke("what does the user drink?"))
+
+    assert sync_result == async_result == f"{MEMORY_CONTEXT_HEADER}User likes tea.{MEMORY_CONTEXT_FOOTER}"
+
+
+def test_small_results_skip_summarisation(orchestrator):
+    orchestrator.llm = MagicMock()
+    tool = memory_search_tool(orchestrator, tool_description="search")
+
+    result = tool.invoke("what does the user drink?")
+
+    orchestrator.llm.invoke.assert_not_called()
+    assert "- user likes tea" in result and "user -> likes -> tea" in result
+
+
+def test_empty_results_skip_summarisation(orchestrator):
+    orchestrator.llm = MagicMock()
+    orchestrator.search_vector_memory.return_value = []
+    orchestrator.search_graph_memory.return_value = ""
+    tool = memory_search_tool(orchestrator, tool_description="search")
+
+    assert tool.invoke("anything") == f"{MEMORY_CONTEXT_HEADER}{NO_MEMORY_FOUND}{MEMORY_CONTEXT_FOOTER}"
+    orchestrator.llm.invoke.assert_not_called()
+
+
+def test_large_results_are_summarised(orchestrator):
+    orchestrator.search_vector_memory.return_value = [Message(role="ai", content="tea " * 50)]
+    tool = memory_search_tool(orchestrator, tool_description="search", summary_token_budget=20)
+
+    assert "User likes tea." in tool.invoke("what does the user drink?")
+
+
+def test_search_tool_uses_prefetched_results(orchestrator):
+    prefetcher = MagicMock()
+    prefetcher.get.return_value = ([Message(role="ai", content="user likes coffee")], "")
+    tool = memory_search_tool(orchestrator, tool_description="search", prefetcher=prefetcher)
+
+    result = tool.invoke("what does the user drink?")
+
+    assert "- user likes coffee" in result
+    orchestrator.search_vector_memory.assert_not_called()
+    orchestrator.search_graph_memory.assert_not_called()
@@ -0,0 +1,65 @@
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+from unittest.mock import patch
+
+from neurotrace.core.schema import Message
+from neurotrace.neurotrace_logging.handlers import BatchedJsonHandler, LazyQueueHandler
+from neurotrace.neurotrace_logging.memory_logger import MemoryLogger, logger
+
+
+def test_json_handler_writes_in_batches(tmp_path):
+    path = tmp_path / "log.jsonl"
+    handler = BatchedJsonHandler(path, batch_size=3, flush_interval=60)
+    test_logger = logging.getLogger("neurotrace.test.json")
+    test_logger.addHandler(handler)
+    test_logger.setLevel(logging.INFO)
+
+    test_logger.info("one %d", 1, extra={"event": "x"})
+    test_logger.info("two")
+    assert not path.exists()
+
+    test_logger.info("three")
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["message"] for e in entries] == ["one 1", "two", "three"]
+    assert entries[0]["event"] == "x" and entries[0]["logger"] == "neurotrace.test.json"
+
+    test_logger.info("four")
+    handler.close()
+    test_logger.removeHandler(handler)
+    assert len(path.read_text().splitlines()) == 4
+
+
+def test_queue_handler_formats_on_listener_thread():
+    records = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            records.append(self.format(record))
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, Collect())
+    listener.start()
+    test_logger = logging.getLogger("neurotrace.test.queue")
+    test_logger.addHandler(LazyQueueHandler(log_queue))
+
+    args = ["before"]
+    test_logger.warning("value=%s", args)
+    args[0] = "after"
+    listener.stop()
+
+    assert records == ["value=['before']"]
+
+
+def test_memory_logger_skips_work_when_disabled():
+    message = Message(role="human", content="hello world")
+    with (
+        patch.object(logger, "isEnabledFor", return_value=False),
+        patch.object(Message, "estimated_token_length") as estimate,
+        patch.object(logger, "info") as info,
+    ):
+        MemoryLogger.log_add(message, destination="stm")
+
+    estimate.assert_not_called()
+    info.assert_not_called()